@@ -2,18 +2,18 @@
 from __future__ import annotations
 import streamlit as st
 
-from src.evidence import find_skill_evidence
-from src.ats import ats_checks
-from src.skills import extract_skills, categorize_missing
-from src.suggestions import generate_suggestions
-from src.reporting import build_report
 import json
+from contextlib import nullcontext
 from src.parsing import extract_text_from_pdf, read_text_input
-from src.chunking import split_into_sections, bulletize, chunk_job_description
-from src.embeddings import Embedder
-from src.scoring import compute_section_score, weighted_overall, match_jd_to_resume
+from src.embeddings import DEFAULT_MODEL_NAME, get_embedder, warm_up
+from src.compare import compare_jds, parse_jd_collection, read_jd_file
+from src.embedding_cache import CachedEmbedder, default_cache
+from src.incremental import AnalysisSession
+from src.instrumentation import capture, configure_from_env
+from src.layout import DocumentLayout
 
 st.set_page_config(page_title="Resume–JD Analyzer", layout="wide")
+configure_from_env()
 
 st.title("Resume–Job Description Analyzer (AI)")
 st.caption("Upload or paste a resume and job description. Get match score, best-aligned bullets, and missing skills.")
@@ -21,11 +21,16 @@ st.caption("Upload or paste a resume and job description. Get match score, best-
 # Sidebar options
 with st.sidebar:
     st.header("Settings")
-    model_name = st.text_input("Embedding model", value="all-MiniLM-L6-v2")
+    model_name = st.text_input("Embedding model", value=DEFAULT_MODEL_NAME)
+    compare_mode = st.radio("Mode", ["Single job description", "Compare job descriptions"]) != "Single job description"
     show_debug = st.checkbox("Show debug chunks", value=False)
     st.markdown("---")
     st.write("Tip: Start with pasted text for speed. Add PDF later.")
 
+# Load the default model once per process so the first Analyze click doesn't pay for it
+with st.spinner("Loading embedding model..."):
+    warm_up([DEFAULT_MODEL_NAME])
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -34,65 +39,119 @@ with col1:
     resume_text = st.text_area("Or paste resume text", height=260)
 
 with col2:
-    st.subheader("Job Description")
-    jd_text = st.text_area("Paste job description", height=350)
-
-analyze = st.button("Analyze", type="primary")
-
-if analyze:
-    # Parse resume
-    if resume_pdf is not None:
-        resume_raw = extract_text_from_pdf(resume_pdf.read())
+    if compare_mode:
+        st.subheader("Job Descriptions")
+        jd_files = st.file_uploader("Upload postings (PDF, text or JSONL)", type=["pdf", "txt", "md", "jsonl"],
+                                    accept_multiple_files=True)
+        jd_text = st.text_area("Or paste postings, separated by a line of ---", height=260)
     else:
-        resume_raw = read_text_input(resume_text)
-
-    jd_raw = read_text_input(jd_text)
-
-    if len(resume_raw) < 200 or len(jd_raw) < 200:
-        st.error("Please provide more complete resume and job description text (at least ~200 characters each).")
-        st.stop()
-
-    # Chunking
-    sections = split_into_sections(resume_raw)
-    jd_chunks = chunk_job_description(jd_raw)
+        st.subheader("Job Description")
+        jd_text = st.text_area("Paste job description", height=350)
 
-    # Pick chunks for main sections (heuristic mapping)
-    skills_text = sections.get("skills", "") or sections.get("technical skills", "")
-    exp_text = sections.get("experience", "") or sections.get("work experience", "")
-    proj_text = sections.get("projects", "") or sections.get("project experience", "")
+analyze = st.button("Compare" if compare_mode else "Analyze", type="primary")
 
-    skills_chunks = bulletize(skills_text) if skills_text else []
-    exp_chunks = bulletize(exp_text) if exp_text else []
-    proj_chunks = bulletize(proj_text) if proj_text else []
+def read_resume():
+    # PDFs are read in layout mode: columns come out in reading order and the
+    # ATS checks get measured columns/tables/fonts instead of text guesses
+    if resume_pdf is not None:
+        layout = DocumentLayout()
+        return extract_text_from_pdf(resume_pdf.read(), layout=layout), layout
+    return read_text_input(resume_text), None
 
-    # If section chunks missing, fall back to full resume bullets
-    full_chunks = bulletize(sections.get("full", resume_raw))
+def show_weakest(jd_to_best, n=8):
+    for jd_req, best_bullet, score in jd_to_best[:n]:
+        with st.expander(f"Score {score*100:.1f}/100 — {jd_req[:90]}{'...' if len(jd_req)>90 else ''}"):
+            st.write("**JD requirement:**")
+            st.write(jd_req)
+            st.write("**Closest resume bullet:**")
+            st.write(best_bullet if best_bullet else "_No match found_")
 
-    if not skills_chunks:
-        skills_chunks = full_chunks
-    if not exp_chunks:
-        exp_chunks = full_chunks
-    if not proj_chunks:
-        proj_chunks = full_chunks
+def show_missing(grouped):
+    c1, c2, c3 = st.columns(3)
+    c1.write("**Core**")
+    c1.write(grouped["core"] if grouped["core"] else ["None detected ✅"])
+    c2.write("**Tools/Platforms**")
+    c2.write(grouped["tools"] if grouped["tools"] else ["None detected ✅"])
+    c3.write("**Nice-to-have**")
+    c3.write(grouped["nice_to_have"] if grouped["nice_to_have"] else ["None detected ✅"])
 
-    # Embeddings
-    embedder = Embedder(model_name)
-    jd_emb = embedder.embed(jd_chunks)
+if analyze and compare_mode:
+    resume_raw, _ = read_resume()
+    try:
+        postings = parse_jd_collection(jd_text)
+        for f in jd_files or []:
+            try:
+                postings.extend(read_jd_file(f.name, f.getvalue()))
+            except ValueError as e:
+                raise ValueError(f"{f.name}: {e}") from None
+    except ValueError as e:
+        st.error(f"Could not read the job descriptions. {e}")
+        st.stop()
+    if len(resume_raw) < 200 or not postings:
+        st.error("Please provide a complete resume (at least ~200 characters) and at least one job description.")
+        st.stop()
 
-    skills_emb = embedder.embed(skills_chunks)
-    exp_emb = embedder.embed(exp_chunks)
-    proj_emb = embedder.embed(proj_chunks)
+    # The resume is chunked and embedded once for all postings
+    with capture() if show_debug else nullcontext() as perf:
+        embedder = CachedEmbedder(get_embedder(model_name), default_cache())
+        st.session_state["comparison"] = compare_jds(resume_raw, postings, embedder)
+    st.session_state["comparison_perf"] = perf.summary() if perf is not None else None
+
+# Kept in the session so picking a posting to drill into doesn't re-score
+comparison = st.session_state.get("comparison") if compare_mode else None
+if comparison:
+    st.markdown(f"## Ranked job descriptions ({len(comparison)})")
+    st.dataframe([r.row() for r in comparison], use_container_width=True, hide_index=True)
+
+    pick = st.selectbox("Drill into", range(len(comparison)),
+                        format_func=lambda i: f"#{i + 1} {comparison[i].posting.title} ({comparison[i].overall_100}/100)")
+    chosen = comparison[pick]
+    section_scores = chosen.analysis.section_scores
+    top = st.columns(4)
+    top[0].metric("Overall Match", f"{chosen.overall_100}/100")
+    top[1].metric("Skills Score", f"{section_scores['skills']*100:.1f}/100")
+    top[2].metric("Experience Score", f"{section_scores['experience']*100:.1f}/100")
+    top[3].metric("Projects Score", f"{section_scores['projects']*100:.1f}/100")
 
-    # Scores
-    section_scores = {
-        "skills": compute_section_score(jd_emb, skills_emb),
-        "experience": compute_section_score(jd_emb, exp_emb),
-        "projects": compute_section_score(jd_emb, proj_emb),
-    }
-    overall = weighted_overall(section_scores)
+    st.markdown("### Weakest-covered JD requirements (fix these first)")
+    show_weakest(chosen.analysis.jd_to_best)
+    st.markdown("### Missing Skills (based on keyword detection)")
+    show_missing(chosen.missing)
 
-    # Scale to 0-100
-    overall_100 = round(overall * 100, 1)
+    st.download_button(
+        label="Download JSON reports (all postings)",
+        data=json.dumps([r.report() for r in comparison], indent=2),
+        file_name="resume_jd_comparison.json",
+        mime="application/json",
+    )
+    if show_debug and st.session_state.get("comparison_perf") is not None:
+        with st.sidebar:
+            st.markdown("---")
+            st.subheader("Performance (debug)")
+            st.dataframe(st.session_state["comparison_perf"], use_container_width=True)
+
+if analyze and not compare_mode:
+    # Collect per-stage timings for this session when debugging
+    with capture() if show_debug else nullcontext() as perf:
+        resume_raw, resume_layout = read_resume()
+        jd_raw = read_text_input(jd_text)
+
+        if len(resume_raw) < 200 or len(jd_raw) < 200:
+            st.error("Please provide more complete resume and job description text (at least ~200 characters each).")
+            st.stop()
+
+        # One session per browser tab and model: re-analysis after an edit only
+        # embeds and scores the chunks that changed
+        session = st.session_state.get("analysis_session")
+        if session is None or st.session_state.get("analysis_model") != model_name:
+            session = AnalysisSession(CachedEmbedder(get_embedder(model_name), default_cache()))
+            st.session_state["analysis_session"] = session
+            st.session_state["analysis_model"] = model_name
+        result = session.run(resume_raw, jd_raw, layout=resume_layout)
+    analysis = result.analysis
+    jd_chunks = analysis.jd_chunks
+    section_scores = analysis.section_scores
+    overall_100 = analysis.overall_100
 
     st.markdown("## Results")
     top = st.columns(4)
@@ -102,22 +161,16 @@ if analyze:
     top[3].metric("Projects Score", f"{section_scores['projects']*100:.1f}/100")
 
     # Best matches (use full resume chunks for matching view)
-    resume_chunks_for_match = full_chunks
-    resume_emb_for_match = embedder.embed(resume_chunks_for_match)
-    jd_to_best = match_jd_to_resume(jd_chunks, jd_emb, resume_chunks_for_match, resume_emb_for_match)
+    resume_chunks_for_match = analysis.resume_chunks["full"]
+    jd_to_best = analysis.jd_to_best
 
     st.markdown("### Weakest-covered JD requirements (fix these first)")
     # Show the 8 lowest matches
-    for jd_req, best_bullet, score in jd_to_best[:8]:
-        with st.expander(f"Score {score*100:.1f}/100 — {jd_req[:90]}{'...' if len(jd_req)>90 else ''}"):
-            st.write("**JD requirement:**")
-            st.write(jd_req)
-            st.write("**Closest resume bullet:**")
-            st.write(best_bullet if best_bullet else "_No match found_")
-    
+    show_weakest(jd_to_best)
+
 
     st.markdown("### Suggested bullet rewrites (fill in real metrics)")
-    suggestions = generate_suggestions(jd_to_best, n=6)
+    suggestions = result.suggestions
 
     for s in suggestions:
         with st.expander(f"Score {s['score']} — Suggested rewrite"):
@@ -133,10 +186,9 @@ if analyze:
                 st.caption(s["terms_debug"])
 
     # Missing skills
-    jd_skills = extract_skills(jd_raw)
-    resume_skills = extract_skills(resume_raw)
-    missing = jd_skills - resume_skills
-    grouped = categorize_missing(missing)
+    jd_skills = result.jd_skills
+    resume_skills = result.resume_skills
+    grouped = result.missing
 
     st.markdown("### Skill Evidence (where skills appear in your resume)")
     present_skills = sorted(list(resume_skills))
@@ -151,7 +203,7 @@ if analyze:
         if not jd_skill_list:
             st.info("No JD skills detected by the keyword list.")
         else:
-            ev = find_skill_evidence(resume_raw, jd_skill_list, max_hits_per_skill=3)
+            ev = result.evidence
             for sk in jd_skill_list:
                 with st.expander(sk):
                     if sk in ev:
@@ -162,16 +214,15 @@ if analyze:
 
 
     st.markdown("### Missing Skills (based on keyword detection)")
-    c1, c2, c3 = st.columns(3)
-    c1.write("**Core**")
-    c1.write(grouped["core"] if grouped["core"] else ["None detected ✅"])
-    c2.write("**Tools/Platforms**")
-    c2.write(grouped["tools"] if grouped["tools"] else ["None detected ✅"])
-    c3.write("**Nice-to-have**")
-    c3.write(grouped["nice_to_have"] if grouped["nice_to_have"] else ["None detected ✅"])
+    show_missing(grouped)
 
     st.markdown("### ATS checks")
-    ats = ats_checks(resume_raw)
+    ats = result.ats
+    if resume_layout is not None:
+        st.caption(
+            f"PDF layout: {resume_layout.pages} page(s), {resume_layout.columns} column(s), "
+            f"{resume_layout.tables} table(s), {resume_layout.images} image(s), {len(resume_layout.fonts)} font(s)"
+        )
 
     if ats["warnings"]:
         st.warning("Potential ATS issues:")
@@ -186,7 +237,7 @@ if analyze:
             st.write(f"- {tip}")
 
     st.markdown("### Export report")
-    report = build_report(overall_100, section_scores, jd_to_best, grouped)
+    report = result.report
     report_json = json.dumps(report, indent=2)
 
     st.download_button(
@@ -203,3 +254,15 @@ if analyze:
         st.markdown("## Debug")
         st.write("JD chunks:", jd_chunks[:10])
         st.write("Resume chunks:", resume_chunks_for_match[:10])
+
+    if perf is not None:
+        with st.sidebar:
+            st.markdown("---")
+            st.subheader("Performance (debug)")
+            st.dataframe(perf.summary(), use_container_width=True)
+            stats = session.stats
+            st.caption(
+                f"Incremental: embedded {stats.embedded_chunks} new chunks "
+                f"(reused {stats.reused_chunks}), computed {stats.computed_pairs}/{stats.total_pairs} "
+                f"similarities, re-ran: {', '.join(stats.recomputed) or 'nothing'}"
+            )
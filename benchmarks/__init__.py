@@ -0,0 +1 @@
+# Benchmark suite for the analysis pipeline (run with `python -m benchmarks`)
@@ -0,0 +1,50 @@
+# benchmarks/__main__.py
+"""
+    python -m benchmarks --resumes 200 --jds 5 --out results.json
+    python -m benchmarks --baseline benchmarks/baseline.json   # exit 1 on regressions
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+
+from benchmarks.compare import compare
+from benchmarks.run import run_benchmark
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description="Per-stage pipeline benchmark.")
+    p.add_argument("--resumes", type=int, default=100)
+    p.add_argument("--jds", type=int, default=5)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--model", default=None, help="Use a real embedding model instead of the offline stub")
+    p.add_argument("--out", default=None, help="Write results JSON here (default: stdout)")
+    p.add_argument("--baseline", default=None, help="Baseline results JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown per stage (0.25 = 25%%)")
+    args = p.parse_args(argv)
+
+    embedder = None
+    if args.model:
+        from src.embeddings import get_embedder
+        embedder = get_embedder(args.model)
+
+    results = run_benchmark(args.resumes, args.jds, seed=args.seed, repeat=args.repeat, embedder=embedder)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']}: {r['baseline_ms']:.4f} -> {r['current_ms']:.4f} ms/item "
+                  f"(x{r['ratio']})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
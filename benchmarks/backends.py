@@ -0,0 +1,67 @@
+# benchmarks/backends.py
+"""
+Throughput and parity of the embedding backends against the torch path.
+
+    python -m benchmarks.backends --model all-MiniLM-L6-v2 --resumes 50
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+from src.embeddings import BACKENDS, DEFAULT_MODEL_NAME, Embedder
+from src.pipeline import resume_section_chunks
+
+def backend_report(model_name: str = DEFAULT_MODEL_NAME, backends: Sequence[str] = BACKENDS,
+                   n_resumes: int = 50, seed: int = 0, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Chunks/second per backend (best of `repeat` encodes of the corpus chunks) and the
+    max absolute / min cosine difference of each backend's vectors against torch.
+    Backends that fail to load (e.g. onnxruntime not installed) are reported as skipped.
+    """
+    resumes, _ = generate_corpus(n_resumes, 1, seed)
+    chunks = list(dict.fromkeys(c for r in resumes for c in resume_section_chunks(r)["full"]))
+    report: Dict[str, Any] = {"meta": {"model": model_name, "chunks": len(chunks), "repeat": repeat}}
+    reference: Optional[np.ndarray] = None
+    for backend in backends:
+        try:
+            embedder = Embedder(model_name, backend=backend)
+        except ImportError as e:
+            report[backend] = {"skipped": str(e)}
+            continue
+        embedder.embed(chunks[:8])  # warm-up
+        best, emb = float("inf"), None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            emb = embedder.embed(chunks)
+            best = min(best, time.perf_counter() - t0)
+        row: Dict[str, Any] = {"seconds": round(best, 4), "chunks_per_s": round(len(chunks) / best, 1)}
+        if backend == "torch":
+            reference = emb
+        elif reference is not None:
+            row["max_abs_diff"] = float(np.abs(emb - reference).max())
+            row["min_cosine"] = float((emb * reference).sum(axis=1).min())
+            row["speedup"] = round(report["torch"]["seconds"] / best, 2)
+        report[backend] = row
+    return report
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.backends", description="Embedding backend throughput.")
+    p.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    p.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    p.add_argument("--resumes", type=int, default=50)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv)
+
+    report = backend_report(args.model, args.backends, n_resumes=args.resumes, seed=args.seed, repeat=args.repeat)
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
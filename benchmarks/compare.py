@@ -0,0 +1,26 @@
+# benchmarks/compare.py
+from __future__ import annotations
+from typing import Any, Dict, List
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25,
+            min_seconds: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Stages whose per-item time grew by more than `tolerance` (0.25 = 25%) over the baseline.
+    Stages faster than `min_seconds` in both runs are ignored as timer noise.
+    """
+    regressions = []
+    for name, cur in results.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or cur.get("skipped") or base.get("skipped"):
+            continue
+        if max(cur["seconds"], base["seconds"]) < min_seconds or base["per_item_ms"] <= 0:
+            continue
+        ratio = cur["per_item_ms"] / base["per_item_ms"]
+        if ratio > 1.0 + tolerance:
+            regressions.append({
+                "stage": name,
+                "baseline_ms": base["per_item_ms"],
+                "current_ms": cur["per_item_ms"],
+                "ratio": round(ratio, 3),
+            })
+    return regressions
@@ -0,0 +1,58 @@
+# benchmarks/corpus.py
+from __future__ import annotations
+import random
+from typing import List, Tuple
+
+from src.taxonomy import DEFAULT_RECORDS
+
+SKILLS = [r[0] for r in DEFAULT_RECORDS]
+VERBS = ["Built", "Designed", "Implemented", "Optimized", "Automated", "Deployed", "Led", "Migrated", "Refactored"]
+OBJECTS = [
+    "a data pipeline", "REST services", "an internal dashboard", "the billing platform", "a recommendation model",
+    "CI/CD workflows", "a search backend", "monitoring and alerting", "the onboarding flow", "batch ETL jobs",
+]
+RESULTS = [
+    "reducing latency by {n}%", "cutting cloud cost by ${n}k per year", "serving {n}k requests per day",
+    "improving accuracy to {n}%", "saving {n} hours per week", "for {n} internal teams",
+]
+JD_LINES = [
+    "Design, build and maintain {obj} using {a} and {b}.",
+    "Strong experience with {a}, {b} and modern engineering practices.",
+    "Collaborate with product and data teams to ship {obj} at scale.",
+    "Experience operating {a} in production environments is required.",
+    "Familiarity with {a} or {b} is a plus.",
+    "You will own {obj} end to end, from design through on-call support.",
+]
+
+def _bullet(rng: random.Random) -> str:
+    a, b = rng.sample(SKILLS, 2)
+    return (f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {a} and {b}, "
+            f"{rng.choice(RESULTS).format(n=rng.randint(5, 95))}")
+
+def make_resume(rng: random.Random, n_bullets: int = 12) -> str:
+    start = rng.randint(2012, 2021)
+    exp = "\n".join(_bullet(rng) for _ in range(n_bullets))
+    proj = "\n".join(_bullet(rng) for _ in range(max(2, n_bullets // 4)))
+    skills = ", ".join(rng.sample(SKILLS, 10))
+    return (
+        f"Candidate {rng.randint(1000, 9999)}\n"
+        f"candidate{rng.randint(1, 999)}@example.com | (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}\n\n"
+        f"Experience\nSoftware Engineer, {start} - {start + rng.randint(1, 4)}\n{exp}\n\n"
+        f"Projects\n{proj}\n\n"
+        f"Skills\n{skills}\n\n"
+        f"Education\nB.S. Computer Science, {start - 4}\n"
+    )
+
+def make_jd(rng: random.Random, n_lines: int = 10) -> str:
+    lines = []
+    for _ in range(n_lines):
+        a, b = rng.sample(SKILLS, 2)
+        lines.append(rng.choice(JD_LINES).format(a=a, b=b, obj=rng.choice(OBJECTS)))
+    return "Senior Software Engineer\n\nResponsibilities\n" + "\n".join(lines) + "\n"
+
+def generate_corpus(n_resumes: int = 100, n_jds: int = 5, seed: int = 0) -> Tuple[List[str], List[str]]:
+    """Deterministic synthetic (resumes, job descriptions) for a given seed."""
+    rng = random.Random(seed)
+    resumes = [make_resume(rng, n_bullets=rng.randint(6, 18)) for _ in range(n_resumes)]
+    jds = [make_jd(rng, n_lines=rng.randint(6, 14)) for _ in range(n_jds)]
+    return resumes, jds
@@ -0,0 +1,57 @@
+# benchmarks/lexical.py
+"""
+Recall of lexical pre-filtering: for each top-N, the share of the dense-only top-k
+that survives when only the BM25 top-N resumes are embedded (ranked by the dense
+score alone and by the hybrid blend), averaged over JDs.
+
+    python -m benchmarks.lexical --resumes 1000 --jds 5 --top-n 50 100 200
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub import StubEmbedder
+from src.lexical import DEFAULT_ALPHA, recall_vs_dense
+
+def lexical_report(n_resumes: int = 500, n_jds: int = 5, top_ns: Sequence[int] = (25, 50, 100), k: int = 10,
+                   alpha: float = DEFAULT_ALPHA, seed: int = 0, embedder=None) -> Dict[str, Any]:
+    embedder = embedder or StubEmbedder()
+    resumes, jds = generate_corpus(n_resumes, n_jds, seed)
+    docs = {str(i): r for i, r in enumerate(resumes)}
+    report: Dict[str, Any] = {
+        "meta": {"n_resumes": n_resumes, "n_jds": n_jds, "k": k, "alpha": alpha, "seed": seed,
+                 "embedder": getattr(embedder, "model_name", type(embedder).__name__)},
+    }
+    for n in top_ns:
+        runs = [recall_vs_dense(jd, docs, embedder, top_n=n, k=k, alpha=alpha) for jd in jds]
+        report[f"top_{n}"] = {key: round(float(np.mean([r[key] for r in runs])), 4) for key in runs[0]}
+    return report
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.lexical",
+                                description="Recall of BM25 pre-filtering against dense-only ranking.")
+    p.add_argument("--resumes", type=int, default=500)
+    p.add_argument("--jds", type=int, default=5)
+    p.add_argument("--top-n", type=int, nargs="+", default=[25, 50, 100])
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Dense weight in the hybrid blend")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--model", default=None, help="Use a real embedding model instead of the offline stub")
+    args = p.parse_args(argv)
+
+    embedder = None
+    if args.model:
+        from src.embeddings import get_embedder
+        embedder = get_embedder(args.model)
+    report = lexical_report(args.resumes, args.jds, args.top_n, k=args.k, alpha=args.alpha,
+                            seed=args.seed, embedder=embedder)
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# benchmarks/quantization.py
+"""
+Accuracy report for compact embedding storage: scores every (JD, resume) pair with
+float32, float16 and int8 resume embeddings and compares against float32.
+
+    python -m benchmarks.quantization --resumes 200 --jds 5
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub import StubEmbedder
+from src.pipeline import embed_groups, resume_section_chunks, score_resume
+from src.chunking import chunk_job_description
+from src.quantization import DTYPES, quantize
+
+def _top_k_overlap(a: np.ndarray, b: np.ndarray, k: int) -> float:
+    k = min(k, len(a))
+    if k == 0:
+        return 1.0
+    return len(set(np.argsort(-a, kind="stable")[:k]) & set(np.argsort(-b, kind="stable")[:k])) / k
+
+def quantization_report(n_resumes: int = 100, n_jds: int = 5, seed: int = 0, top_k: int = 10,
+                        embedder=None) -> Dict[str, Any]:
+    """
+    Per dtype: max/mean absolute error of section and overall scores (0-1 scale),
+    the share of JD chunks whose best resume bullet is unchanged, the top-k overlap
+    of the resume ranking per JD, and resume embedding bytes.
+    """
+    embedder = embedder or StubEmbedder()
+    resumes, jds = generate_corpus(n_resumes, n_jds, seed)
+    resume_chunks = [resume_section_chunks(r) for r in resumes]
+    resume_embs = [embed_groups(embedder, rc) for rc in resume_chunks]
+    jd_chunks = [chunk_job_description(j) for j in jds]
+    jd_embs = [embedder.embed(jc) for jc in jd_chunks]
+
+    def score_all(embs: List[Dict[str, Any]]):
+        return [[score_resume(jc, je, rc, re_) for rc, re_ in zip(resume_chunks, embs)]
+                for jc, je in zip(jd_chunks, jd_embs)]
+
+    reference = score_all(resume_embs)
+    ref_bytes = sum(e.nbytes for re_ in resume_embs for e in re_.values())
+    report: Dict[str, Any] = {
+        "meta": {"n_resumes": n_resumes, "n_jds": n_jds, "seed": seed, "top_k": top_k,
+                 "embedder": getattr(embedder, "model_name", type(embedder).__name__)},
+        "float32": {"bytes": ref_bytes},
+    }
+    for dtype in DTYPES:
+        embs = [{k: quantize(v, dtype) for k, v in re_.items()} for re_ in resume_embs]
+        results = score_all(embs)
+        section_err, overall_err, same_best, best_total, overlaps = [], [], 0, 0, []
+        for ref_row, row in zip(reference, results):
+            for ref, res in zip(ref_row, row):
+                section_err += [abs(ref.section_scores[k] - res.section_scores[k]) for k in ref.section_scores]
+                overall_err.append(abs(ref.overall_100 - res.overall_100) / 100.0)
+                same_best += sum(a[1] == b[1] for a, b in zip(ref.jd_to_best, res.jd_to_best))
+                best_total += len(ref.jd_to_best)
+            overlaps.append(_top_k_overlap(np.array([r.overall_100 for r in ref_row]),
+                                           np.array([r.overall_100 for r in row]), top_k))
+        report[dtype] = {
+            "bytes": sum(e.nbytes for re_ in embs for e in re_.values()),
+            "max_section_error": round(float(max(section_err, default=0.0)), 6),
+            "mean_section_error": round(float(np.mean(section_err)) if section_err else 0.0, 6),
+            "max_overall_error": round(float(max(overall_err, default=0.0)), 6),
+            "best_match_agreement": round(same_best / best_total, 4) if best_total else 1.0,
+            "top_k_overlap": round(float(np.mean(overlaps)) if overlaps else 1.0, 4),
+        }
+    return report
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.quantization",
+                                description="Score drift of float16/int8 embedding storage vs float32.")
+    p.add_argument("--resumes", type=int, default=100)
+    p.add_argument("--jds", type=int, default=5)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--top-k", type=int, default=10)
+    p.add_argument("--model", default=None, help="Use a real embedding model instead of the offline stub")
+    args = p.parse_args(argv)
+
+    embedder = None
+    if args.model:
+        from src.embeddings import get_embedder
+        embedder = get_embedder(args.model)
+    report = quantization_report(args.resumes, args.jds, seed=args.seed, top_k=args.top_k, embedder=embedder)
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# benchmarks/run.py
+from __future__ import annotations
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub import StubEmbedder
+from src.ats import ats_checks, scan_many
+from src.chunking import split_into_sections, bulletize, chunk_job_description
+from src.evidence import find_skill_evidence
+from src.layout import DocumentLayout
+from src.parsing import clean_text, extract_text_from_pdf
+from src.pipeline import resume_section_chunks
+from src.scoring import compute_section_score, match_jd_to_resume, weighted_overall
+from src.skills import extract_skills
+
+STAGES = [
+    "parse", "parse_layout", "clean_text", "split_into_sections", "bulletize", "chunk_job_description",
+    "embed", "scoring", "skills", "evidence", "ats", "ats_batch",
+]
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def _make_pdfs(texts: List[str]) -> Optional[List[bytes]]:
+    try:
+        import fitz
+    except ImportError:
+        return None
+    out = []
+    for t in texts:
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), t, fontsize=8)
+        out.append(doc.tobytes())
+        doc.close()
+    return out
+
+def run_benchmark(n_resumes: int = 100, n_jds: int = 5, seed: int = 0, repeat: int = 3,
+                  embedder=None) -> Dict[str, Any]:
+    """
+    Time each pipeline stage over a synthetic corpus; best of `repeat` runs per stage.
+    Uses the offline StubEmbedder unless an embedder is passed in.
+    """
+    embedder = embedder or StubEmbedder()
+    resumes, jds = generate_corpus(n_resumes, n_jds, seed)
+    # Raw inputs carry the noise clean_text exists to remove
+    raw = [t.replace(" with ", "\xa0with\t ").replace("\n\n", "\n\n\n\n") for t in resumes + jds]
+
+    sections = [split_into_sections(r) for r in resumes]
+    section_texts = [body for s in sections for body in s.values()]
+    resume_chunks = [resume_section_chunks(r) for r in resumes]
+    jd_chunks = [chunk_job_description(j) for j in jds]
+    all_chunks = [c for rc in resume_chunks for c in rc["full"]] + [c for jc in jd_chunks for c in jc]
+    resume_embs = [{k: embedder.embed(v) for k, v in rc.items()} for rc in resume_chunks]
+    jd_embs = [embedder.embed(jc) for jc in jd_chunks]
+    jd_skills = [sorted(extract_skills(j)) for j in jds]
+
+    def scoring():
+        for jc, je in zip(jd_chunks, jd_embs):
+            for rc, re_ in zip(resume_chunks, resume_embs):
+                scores = {k: compute_section_score(je, re_[k]) for k in ("skills", "experience", "projects")}
+                weighted_overall(scores)
+                match_jd_to_resume(jc, je, rc["full"], re_["full"])
+
+    pdfs = _make_pdfs(resumes)
+    work: Dict[str, Any] = {
+        "parse": (len(resumes), (lambda: [extract_text_from_pdf(p) for p in pdfs]) if pdfs else None),
+        "parse_layout": (len(resumes), (lambda: [extract_text_from_pdf(p, layout=DocumentLayout()) for p in pdfs])
+                         if pdfs else None),
+        "clean_text": (len(raw), lambda: [clean_text(t) for t in raw]),
+        "split_into_sections": (len(resumes), lambda: [split_into_sections(r) for r in resumes]),
+        "bulletize": (len(section_texts), lambda: [bulletize(t) for t in section_texts]),
+        "chunk_job_description": (len(jds), lambda: [chunk_job_description(j) for j in jds]),
+        "embed": (len(all_chunks), lambda: embedder.embed(all_chunks)),
+        "scoring": (len(jds) * len(resumes), scoring),
+        "skills": (len(resumes) + len(jds), lambda: [extract_skills(t) for t in resumes + jds]),
+        "evidence": (len(jds) * len(resumes),
+                     lambda: [find_skill_evidence(r, s) for s in jd_skills for r in resumes]),
+        "ats": (len(resumes), lambda: [ats_checks(r) for r in resumes]),
+        # Structured scan over the whole corpus in a process pool (one worker per CPU)
+        "ats_batch": (len(resumes), lambda: list(scan_many(resumes, max_workers=None, chunksize=32))),
+    }
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    for name in STAGES:
+        items, fn = work[name]
+        if fn is None:
+            stages[name] = {"skipped": True}
+            continue
+        seconds = _best_of(repeat, fn)
+        stages[name] = {
+            "seconds": round(seconds, 6),
+            "items": items,
+            "per_item_ms": round(1000 * seconds / max(items, 1), 6),
+        }
+
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "n_resumes": n_resumes,
+            "n_jds": n_jds,
+            "seed": seed,
+            "repeat": repeat,
+            "embedder": getattr(embedder, "model_name", type(embedder).__name__),
+        },
+        "stages": stages,
+    }
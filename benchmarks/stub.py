@@ -0,0 +1,26 @@
+# benchmarks/stub.py
+from __future__ import annotations
+import re
+import zlib
+import numpy as np
+
+class StubEmbedder:
+    """
+    Offline stand-in for Embedder: hashes word unigrams and bigrams into a fixed
+    number of dimensions and L2-normalizes, so similar texts get similar vectors
+    without loading a model. Deterministic across runs and processes.
+    """
+    def __init__(self, dim: int = 384, model_name: str = "stub-hashing"):
+        self.dim = dim
+        self.model_name = model_name
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            words = re.findall(r"\w+", t.lower())
+            for tok in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(tok.encode("utf-8"))
+                out[i, h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
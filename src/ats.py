@@ -1,44 +1,219 @@
 # src/ats.py
+"""
+ATS heuristics as a small rule engine.
+
+scan() splits a document into lines once and derives every metric the rules need
+from that (line-length distribution, section headers) plus a few C-level scans of
+the whole text (contact details, years, bullets); each rule is then just a
+predicate over those metrics. Findings are structured
+(rule id, severity, message, tip, measured value) so batch tools can filter and
+aggregate them; ats_checks() keeps the original {"warnings", "tips"} shape for the app.
+"""
 from __future__ import annotations
+import argparse
+import json
+import os
 import re
-from typing import Dict, List
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.chunking import RESUME_SECTION_HEADERS
+from src.instrumentation import instrumented
+from src.layout import DocumentLayout
+
+_EMAIL = re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b")
+_PHONE = re.compile(r"\b(\+?\d[\d\-\s\(\)]{8,}\d)\b")
+_YEAR = re.compile(r"\b(20\d{2}|19\d{2})\b")
+
+SHORT_LINE = 25     # chars; lines this short suggest columns
+LONG_LINE = 160     # chars; lines this long are paragraphs rather than bullets
+_HEADERS = frozenset(RESUME_SECTION_HEADERS)
+_HEADER_MAX = max(len(h) for h in RESUME_SECTION_HEADERS)
+
+# Sections a screener expects, each satisfied by any of its headers
+EXPECTED_SECTIONS = {
+    "Experience": ("experience", "work experience"),
+    "Education": ("education",),
+    "Skills": ("skills", "technical skills"),
+}
+
+@dataclass
+class Finding:
+    rule: str                       # stable id, e.g. "no_email"
+    severity: str                   # "warning" or "tip"
+    message: str
+    tip: str = ""                   # suggested fix, if any
+    value: Optional[float] = None   # the measurement that triggered the rule
+
+@dataclass
+class AtsReport:
+    findings: List[Finding]
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"findings": [asdict(f) for f in self.findings], "metrics": self.metrics}
+
+    def legacy(self) -> Dict[str, List[str]]:
+        """The {"warnings", "tips"} lists ats_checks() returns."""
+        return {
+            "warnings": [f.message for f in self.findings if f.severity == "warning"],
+            "tips": [f.tip for f in self.findings if f.tip],
+        }
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    severity: str
+    message: str
+    tip: str
+    fires: Callable[[Dict[str, Any]], bool]
+    value: Optional[Callable[[Dict[str, Any]], float]] = None
+
+def _layout(m: Dict[str, Any], key: str) -> Any:
+    return m["layout"][key] if m["layout"] else 0
 
-def ats_checks(resume_text: str) -> Dict[str, List[str]]:
+# Evaluated in this order (it is also the order of warnings and tips in ats_checks).
+# With a PDF layout, columns and tables are measured; without one they are guessed
+# from '|' characters and short lines.
+RULES: Tuple[Rule, ...] = (
+    Rule("table_pipes", "warning",
+         "Detected '|' characters which may indicate tables/columns; ATS can struggle with multi-column resumes.",
+         "Prefer a single-column resume; avoid tables.",
+         lambda m: not m["layout"] and m["pipes"] > 0, lambda m: m["pipes"]),
+    Rule("short_lines", "warning",
+         "Many very short lines detected; may indicate multi-column layout or heavy formatting.",
+         "Use standard section headers and longer bullet lines.",
+         lambda m: not m["layout"] and m["short_line_ratio"] > 0.55, lambda m: m["short_line_ratio"]),
+    Rule("multi_column", "warning",
+         "Detected a multi-column layout; ATS often reads columns out of order.",
+         "Prefer a single-column resume; avoid tables.",
+         lambda m: _layout(m, "columns") > 1, lambda m: _layout(m, "columns")),
+    Rule("tables", "warning",
+         "Detected table-like rows; ATS can struggle with tables.",
+         "List details as plain lines instead of table cells.",
+         lambda m: _layout(m, "tables") > 0, lambda m: _layout(m, "tables")),
+    Rule("no_email", "warning", "No email detected.",
+         "Add a professional email near the top.",
+         lambda m: not m["has_email"]),
+    Rule("no_phone", "warning", "No phone number detected.",
+         "Add a phone number near the top (optional but common in US resumes).",
+         lambda m: not m["has_phone"]),
+    Rule("no_years", "warning",
+         "No years detected (e.g., 2024). Recruiters often expect dates for roles/projects.",
+         "Add dates for roles/projects (Month YYYY – Month YYYY).",
+         lambda m: not m["has_year"]),
+    Rule("no_bullets", "tip", "Few or no bullet markers found.",
+         "Consider using bullets for experience/project impact statements.",
+         lambda m: m["bullets"] == 0 and m["dashes"] < 3),
+    Rule("missing_sections", "warning",
+         "Missing standard section headers; ATS may not find your experience, education or skills.",
+         "Add plain headers such as Experience, Education and Skills on their own lines.",
+         lambda m: bool(m["missing_sections"]), lambda m: len(m["missing_sections"])),
+    Rule("long_lines", "tip", "Many lines read as long paragraphs.",
+         "Break long paragraphs into one- or two-line bullets.",
+         lambda m: m["long_line_ratio"] > 0.2, lambda m: m["long_line_ratio"]),
+    Rule("images", "tip", "Images or graphics detected; ATS ignores them.",
+         "Keep your name, contact details and skills as text, not images.",
+         lambda m: _layout(m, "images") > 0, lambda m: _layout(m, "images")),
+    Rule("many_fonts", "tip", "Many different fonts used.",
+         "Stick to one or two fonts.",
+         lambda m: len(_layout(m, "fonts") or ()) > 3, lambda m: len(_layout(m, "fonts") or ())),
+    Rule("small_font", "tip", "Very small text detected.",
+         "Use at least 9–10 pt for body text.",
+         lambda m: 0 < _layout(m, "min_font_size") < 8, lambda m: _layout(m, "min_font_size")),
+)
+
+def _percentile(sorted_values: List[int], q: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def _metrics(text: str, layout: Optional[DocumentLayout] = None) -> Dict[str, Any]:
+    lines = [ln for ln in map(str.strip, text.splitlines()) if ln]
+    lengths = sorted(map(len, lines))
+    short = bisect_right(lengths, SHORT_LINE)
+    long_ = len(lengths) - bisect_right(lengths, LONG_LINE)
+    # Header candidates are short; normalize like chunking._normalize, without the regex
+    headers = _HEADERS.intersection([" ".join(ln.lower().split()) for ln in lines if len(ln) <= _HEADER_MAX])
+    # C-level scans of the whole text for the rest; searches stop at the first
+    # hit, which is usually in the contact block at the top
+    has_email = "@" in text and _EMAIL.search(text) is not None
+    has_phone = _PHONE.search(text) is not None
+    has_year = _YEAR.search(text) is not None
+    pipes = text.count("|")
+    bullets = text.count("•")
+    dashes = text.count("-")
+    n = len(lengths)
+    return {
+        "lines": n,
+        "short_line_ratio": round(short / n, 4) if n else 0.0,
+        "long_line_ratio": round(long_ / n, 4) if n else 0.0,
+        "median_line_length": _percentile(lengths, 0.5),
+        "p90_line_length": _percentile(lengths, 0.9),
+        "pipes": pipes,
+        "bullets": bullets,
+        "dashes": dashes,
+        "has_email": has_email,
+        "has_phone": has_phone,
+        "has_year": has_year,
+        "sections": sorted(headers),
+        "missing_sections": [name for name, hs in EXPECTED_SECTIONS.items() if not headers.intersection(hs)],
+        "layout": layout.to_dict() if layout is not None else None,
+    }
+
+def scan(resume_text: str, layout: Optional[DocumentLayout] = None) -> AtsReport:
+    """Evaluate every rule against one document (and its PDF layout, when extracted with one)."""
+    m = _metrics(resume_text or "", layout)
+    findings = [
+        Finding(r.id, r.severity, r.message, r.tip, r.value(m) if r.value else None)
+        for r in RULES if r.fires(m)
+    ]
+    return AtsReport(findings, m)
+
+def scan_many(texts: Iterable[str], max_workers: Optional[int] = 0, chunksize: int = 16) -> Iterator[AtsReport]:
+    """
+    scan() over many documents, in input order.
+    `max_workers=0` runs in-process; otherwise documents are shipped to a process
+    pool `chunksize` at a time (None = one process per CPU).
+    """
+    if max_workers == 0:
+        for t in texts:
+            yield scan(t)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+        yield from pool.map(scan, texts, chunksize=chunksize)
+
+@instrumented("ats_checks", lambda out, *a, **k: {"warnings": len(out["warnings"])})
+def ats_checks(resume_text: str, layout: Optional[DocumentLayout] = None) -> Dict[str, List[str]]:
     """
     Lightweight ATS heuristics. Not perfect, but useful signals.
     """
-    warnings: List[str] = []
-    tips: List[str] = []
-
-    t = resume_text or ""
-
-    # Tables/pipes often indicate columns
-    if "|" in t:
-        warnings.append("Detected '|' characters which may indicate tables/columns; ATS can struggle with multi-column resumes.")
-        tips.append("Prefer a single-column resume; avoid tables.")
-
-    # Too many short lines can indicate column layout
-    lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
-    short_lines = sum(1 for ln in lines if len(ln) <= 25)
-    if lines and (short_lines / len(lines)) > 0.55:
-        warnings.append("Many very short lines detected; may indicate multi-column layout or heavy formatting.")
-        tips.append("Use standard section headers and longer bullet lines.")
-
-    # Contact info presence
-    if not re.search(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", t):
-        warnings.append("No email detected.")
-        tips.append("Add a professional email near the top.")
-    if not re.search(r"\b(\+?\d[\d\-\s\(\)]{8,}\d)\b", t):
-        warnings.append("No phone number detected.")
-        tips.append("Add a phone number near the top (optional but common in US resumes).")
-
-    # Date formatting (very rough)
-    if not re.search(r"\b(20\d{2}|19\d{2})\b", t):
-        warnings.append("No years detected (e.g., 2024). Recruiters often expect dates for roles/projects.")
-        tips.append("Add dates for roles/projects (Month YYYY – Month YYYY).")
-
-    # Excessive symbols
-    if t.count("•") == 0 and t.count("-") < 3:
-        tips.append("Consider using bullets for experience/project impact statements.")
-
-    return {"warnings": warnings, "tips": tips}
+    return scan(resume_text, layout).legacy()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.batch import iter_resumes
+
+    p = argparse.ArgumentParser(prog="python -m src.ats", description="Structured ATS findings for many resumes.")
+    p.add_argument("--resumes", required=True, help="Directory of resumes or a JSONL file")
+    p.add_argument("--out", default="-", help="Output JSONL path (default: stdout)")
+    p.add_argument("--workers", type=int, default=None, help="Scan processes (0 = in-process; default: one per CPU)")
+    p.add_argument("--chunksize", type=int, default=16, help="Documents sent to a worker at a time")
+    args = p.parse_args(argv)
+
+    docs = [d for d in iter_resumes(args.resumes, workers=args.workers) if d.error is None]
+    reports = scan_many((d.text for d in docs), max_workers=args.workers, chunksize=args.chunksize)
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        for d, report in zip(docs, reports):
+            out.write(json.dumps({"id": d.doc_id, **report.to_dict()}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scanned {len(docs)} resumes.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
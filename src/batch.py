@@ -0,0 +1,261 @@
+# src/batch.py
+"""
+Headless ranking of many resumes against one job description.
+
+    python -m src.batch --jd jd.txt --resumes resumes/ --out ranked.jsonl
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Container, Dict, Iterable, Iterator, List, Optional
+
+from src.ats import scan
+from src.ingest import IngestLimits, ingest_pdfs
+from src.parsing import extract_text_from_pdf, read_text_input
+from src.pipeline import embed_groups, score_resume
+from src.reporting import REPORT_MATCHES, build_report
+from src.result_store import ResultStore, default_store, result_payload
+from src.skills import extract_skills, categorize_missing
+from src.streaming import iter_clean_lines, iter_jd_chunks, stream_resume_chunks
+
+RESUME_EXTENSIONS = (".txt", ".md", ".pdf")
+
+@dataclass
+class ResumeDoc:
+    doc_id: str
+    text: str
+    error: Optional[str] = None
+
+def read_document(path: str) -> str:
+    """Read a .pdf or plain-text file into cleaned text."""
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return extract_text_from_pdf(f.read())
+    with open(path, encoding="utf-8", errors="replace", newline="") as f:
+        # Streams the file instead of reading it whole; same result as read_text_input
+        return "\n".join(iter_clean_lines(f))
+
+def _load(doc_id: str, path: str) -> ResumeDoc:
+    try:
+        return ResumeDoc(doc_id, read_document(path))
+    except Exception as e:  # one bad file shouldn't stop the batch
+        return ResumeDoc(doc_id, "", error=f"{type(e).__name__}: {e}")
+
+def iter_resumes(source: str, workers: Optional[int] = 0, limits: IngestLimits = IngestLimits(),
+                 only: Optional[Container[str]] = None) -> Iterator[ResumeDoc]:
+    """
+    Yield resumes lazily from a directory of .txt/.md/.pdf files or from a JSONL file
+    whose lines look like {"id": ..., "text": ...} or {"id": ..., "path": ...}.
+
+    PDFs (in a directory or named by JSONL "path" records) go through the ingestion pool
+    (see src.ingest) under `limits` with `workers` processes (0 = in-process, None = one
+    per CPU); they arrive after the other documents, in completion order. With `only`,
+    documents whose id is not in it are skipped without being read.
+    """
+    if os.path.isdir(source):
+        pdfs = []
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if not (os.path.isfile(path) and name.lower().endswith(RESUME_EXTENSIONS)):
+                continue
+            if only is not None and name not in only:
+                continue
+            if name.lower().endswith(".pdf"):
+                pdfs.append(path)
+            else:
+                yield _load(name, path)
+        for res in ingest_pdfs(pdfs, max_workers=workers, limits=limits):
+            yield ResumeDoc(os.path.basename(res.path), res.text, error=res.error)
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    pdf_ids: Dict[str, List[str]] = {}   # PDF path -> ids of the records naming it
+    with open(source, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            doc_id = str(rec.get("id", line_no))
+            if only is not None and doc_id not in only:
+                continue
+            if "text" in rec:
+                yield ResumeDoc(doc_id, read_text_input(rec["text"]))
+            elif "path" in rec:
+                path = os.path.join(base, rec["path"])
+                if path.lower().endswith(".pdf"):
+                    pdf_ids.setdefault(path, []).append(doc_id)
+                else:
+                    yield _load(doc_id, path)
+            else:
+                yield ResumeDoc(doc_id, "", error="record has neither 'text' nor 'path'")
+    # PDFs get the same limits and pool as a directory's
+    for res in ingest_pdfs(list(pdf_ids), max_workers=workers, limits=limits):
+        for doc_id in pdf_ids[res.path]:
+            yield ResumeDoc(doc_id, res.text, error=res.error)
+
+def _batches(items: Iterable[ResumeDoc], size: int) -> Iterator[List[ResumeDoc]]:
+    batch: List[ResumeDoc] = []
+    for it in items:
+        batch.append(it)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def prefilter_resumes(jd_text: str, source: str, n: int, workers: Optional[int] = 0,
+                      limits: IngestLimits = IngestLimits()) -> Iterator[ResumeDoc]:
+    """
+    The `n` resumes from `source` (as iter_resumes) with the best lexical (BM25) match
+    to the JD, followed by failed documents so they are still reported; embeds none.
+
+    Reads `source` twice: the first pass keeps only each resume's JD-term postings
+    (see src.lexical, which needs scipy), the second re-reads just the survivors.
+    """
+    try:
+        from src.lexical import SectionIndex, top_positions
+    except ImportError as e:
+        raise ImportError(f"lexical pre-filtering needs scipy (pip install scipy): {e}") from e
+    index = SectionIndex(list(iter_jd_chunks(iter_clean_lines(jd_text))))
+    failed: List[ResumeDoc] = []
+    for d in iter_resumes(source, workers=workers, limits=limits):
+        if d.error is None:
+            index.add(d.doc_id, stream_resume_chunks(d.text))
+        else:
+            failed.append(d)
+    ids = index.ids
+    keep = {ids[i] for i in top_positions(index.scores(), n)}
+    return itertools.chain(iter_resumes(source, workers=workers, limits=limits, only=keep), failed)
+
+def score_resumes(jd_text: str, resumes: Iterable[ResumeDoc], embedder,
+                  batch_size: int = 32, store: Optional[ResultStore] = None,
+                  model_name: Optional[str] = None, ats: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream one report record per resume, in input order.
+
+    The JD is chunked and embedded once; resume chunks are embedded `batch_size`
+    documents at a time in a single embed call, so memory stays bounded by the batch.
+    With a result store, previously scored pairs are served from it and skip embedding;
+    entries are keyed by `model_name` (default: the embedder's model_name).
+    With `ats`, each record also carries structured ATS findings (see src.ats.scan).
+    """
+    # Texts are already cleaned; the streaming chunkers give the same chunks as
+    # chunk_job_description/resume_section_chunks without whole-document split copies
+    jd_chunks = list(iter_jd_chunks(iter_clean_lines(jd_text)))
+    jd_emb = embedder.embed(jd_chunks)
+    jd_skills = extract_skills(jd_text)
+    model_name = model_name if model_name is not None else getattr(embedder, "model_name", "")
+
+    for batch in _batches(resumes, batch_size):
+        stored = {}
+        if store is not None:
+            for i, d in enumerate(batch):
+                hit = store.get(d.text, jd_text, model_name) if d.error is None else None
+                if hit is not None:
+                    stored[i] = hit
+        chunks = {i: stream_resume_chunks(d.text) for i, d in enumerate(batch)
+                  if d.error is None and i not in stored}
+        groups = {(i, name): c for i, sections in chunks.items() for name, c in sections.items()}
+        embs = embed_groups(embedder, groups) if groups else {}
+
+        for i, d in enumerate(batch):
+            if d.error is not None:
+                yield {"id": d.doc_id, "error": d.error}
+                continue
+            rec: Dict[str, Any] = {"id": d.doc_id}
+            if ats:
+                rec["ats"] = scan(d.text).to_dict()
+            if i in stored:
+                yield {**rec, "report": stored[i]["report"]}
+                continue
+            resume_embs = {name: embs[(i, name)] for name in chunks[i]}
+            result = score_resume(jd_chunks, jd_emb, chunks[i], resume_embs, match_limit=REPORT_MATCHES)
+            missing = categorize_missing(jd_skills - extract_skills(d.text))
+            if store is not None:
+                payload = result_payload(result, d.text, missing)
+                store.put(d.text, jd_text, model_name, payload)
+                report = payload["report"]
+            else:
+                report = build_report(result.overall_100, result.section_scores, result.jd_to_best, missing)
+            yield {**rec, "report": report}
+
+def rank_resumes(jd_text: str, resumes: Iterable[ResumeDoc], embedder, out,
+                 batch_size: int = 32, top: Optional[int] = None, store: Optional[ResultStore] = None,
+                 ats: bool = False) -> int:
+    """
+    Score resumes and write ranked JSONL records to the file object `out`.
+
+    Records are spooled to a temporary file as they are produced; only
+    (score, offset) pairs are kept in memory for the final ordering.
+    Failed documents are written after the ranked ones. Returns the number ranked.
+    """
+    ranked = []
+    failed = []
+    with tempfile.TemporaryFile("w+b") as spool:
+        for rec in score_resumes(jd_text, resumes, embedder, batch_size=batch_size, store=store, ats=ats):
+            if "error" in rec:
+                failed.append(rec)
+                continue
+            offset = spool.tell()
+            spool.write(json.dumps(rec).encode("utf-8") + b"\n")
+            ranked.append((-rec["report"]["overall_match_score"], offset))
+
+        ranked.sort()
+        if top is not None:
+            ranked = ranked[:top]
+        for rank, (_, offset) in enumerate(ranked, start=1):
+            spool.seek(offset)
+            rec = json.loads(spool.readline())
+            out.write(json.dumps({"rank": rank, **rec}) + "\n")
+
+    for rec in failed:
+        out.write(json.dumps(rec) + "\n")
+    return len(ranked)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.embeddings import BACKENDS, DEFAULT_MODEL_NAME, get_embedder
+    from src.embedding_cache import CachedEmbedder, default_cache
+
+    p = argparse.ArgumentParser(prog="python -m src.batch", description="Rank resumes against one job description.")
+    p.add_argument("--jd", required=True, help="Job description file (.txt/.md/.pdf)")
+    p.add_argument("--resumes", required=True, help="Directory of resumes or a JSONL file")
+    p.add_argument("--out", default="-", help="Output JSONL path (default: stdout)")
+    p.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Embedding model name")
+    p.add_argument("--device", default=None, help="Torch device, e.g. cpu or cuda")
+    p.add_argument("--backend", default=None, choices=BACKENDS,
+                   help="Inference backend (default: $RESUME_ANALYZER_EMBED_BACKEND or torch)")
+    p.add_argument("--batch-size", type=int, default=32, help="Resumes embedded per encode call")
+    p.add_argument("--top", type=int, default=None, help="Only write the top N resumes")
+    p.add_argument("--workers", type=int, default=None, help="PDF extraction processes (0 = in-process; default: one per CPU)")
+    p.add_argument("--ats", action="store_true", help="Add structured ATS findings to each record")
+    p.add_argument("--prefilter", type=int, default=None,
+                   help="Only embed the N resumes with the best lexical (BM25) match")
+    args = p.parse_args(argv)
+
+    jd_text = read_document(args.jd)
+    embedder = CachedEmbedder(get_embedder(args.model, device=args.device, backend=args.backend), default_cache())
+    if args.prefilter is None:
+        resumes = iter_resumes(args.resumes, workers=args.workers)
+    else:
+        try:
+            resumes = prefilter_resumes(jd_text, args.resumes, args.prefilter, workers=args.workers)
+        except ImportError as e:
+            p.error(str(e))
+
+    if args.out == "-":
+        n = rank_resumes(jd_text, resumes, embedder, sys.stdout, batch_size=args.batch_size, top=args.top,
+                         store=default_store(), ats=args.ats)
+    else:
+        with open(args.out, "w", encoding="utf-8") as out:
+            n = rank_resumes(jd_text, resumes, embedder, out, batch_size=args.batch_size, top=args.top,
+                             store=default_store(), ats=args.ats)
+    print(f"Ranked {n} resumes.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ from __future__ import annotations
 import re
 from typing import Dict, List
 
+from src.instrumentation import instrumented
+
 RESUME_SECTION_HEADERS = [
     "experience", "work experience",
     "projects", "project experience",
@@ -13,6 +15,7 @@ RESUME_SECTION_HEADERS = [
 def _normalize(s: str) -> str:
     return re.sub(r"\s+", " ", s.strip().lower())
 
+@instrumented("split_into_sections", lambda out, *a, **k: {"sections": len(out)})
 def split_into_sections(resume_text: str) -> Dict[str, str]:
     """
     Heuristic section splitter: finds common headers and splits resume text.
@@ -37,6 +40,7 @@ def split_into_sections(resume_text: str) -> Dict[str, str]:
         sections[header] = body
     return sections
 
+@instrumented("bulletize", lambda out, *a, **k: {"chunks": len(out)})
 def bulletize(text: str) -> List[str]:
     """
     Split into bullet-like chunks. Works for '-' '•' '*' and also sentences if needed.
@@ -57,6 +61,7 @@ def bulletize(text: str) -> List[str]:
 
     return chunks
 
+@instrumented("chunk_job_description", lambda out, *a, **k: {"chunks": len(out)})
 def chunk_job_description(jd_text: str) -> List[str]:
     """
     Break JD into requirement/responsibility-like chunks.
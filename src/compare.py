@@ -0,0 +1,140 @@
+# src/compare.py
+"""
+One resume against many job descriptions.
+
+The resume is chunked and skill-scanned once, and its chunks are embedded together
+with every posting's chunks in a single embed call (shared chunks are encoded once),
+so the cost grows with the total JD text rather than with JD count x resume cost.
+Each posting is then scored against the shared resume vectors on a thread pool.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.chunking import chunk_job_description
+from src.instrumentation import instrumented
+from src.parsing import extract_text_from_pdf, read_text_input
+from src.pipeline import Analysis, embed_groups, resume_section_chunks, score_resume
+from src.reporting import REPORT_MATCHES, build_report
+from src.skills import categorize_missing, extract_skills
+
+# A line of three or more '-' or '=' separates postings in pasted text
+_SEPARATOR = re.compile(r"^\s*(?:-{3,}|={3,})\s*$", re.MULTILINE)
+TITLE_CHARS = 80
+
+@dataclass
+class JobPosting:
+    jd_id: str
+    title: str
+    text: str
+
+@dataclass
+class JdComparison:
+    posting: JobPosting
+    analysis: Analysis
+    jd_skills: set
+    missing: Dict[str, List[str]]   # categorize_missing(jd_skills - resume_skills)
+
+    @property
+    def overall_100(self) -> float:
+        return self.analysis.overall_100
+
+    def row(self) -> Dict[str, Any]:
+        """One line of the ranked table."""
+        s = self.analysis.section_scores
+        return {
+            "id": self.posting.jd_id,
+            "title": self.posting.title,
+            "overall": self.overall_100,
+            "skills": round(s["skills"] * 100, 1),
+            "experience": round(s["experience"] * 100, 1),
+            "projects": round(s["projects"] * 100, 1),
+            "missing_skills": sum(len(v) for v in self.missing.values()),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        a = self.analysis
+        return {"id": self.posting.jd_id, "title": self.posting.title,
+                **build_report(a.overall_100, a.section_scores, a.jd_to_best, self.missing)}
+
+def _title(text: str) -> str:
+    first = next((ln.strip() for ln in text.splitlines() if ln.strip()), "")
+    return first[:TITLE_CHARS]
+
+def _posting(jd_id: str, text: str, title: Optional[str] = None) -> JobPosting:
+    text = read_text_input(text)
+    return JobPosting(jd_id, title or _title(text), text)
+
+def parse_jd_collection(text: str) -> List[JobPosting]:
+    """
+    Postings from pasted text: JSONL (one {"id", "title", "text"} record per line;
+    id and title optional) or plain postings separated by a '---' line.
+    Raises ValueError naming the first malformed JSONL record.
+    """
+    lines = [ln for ln in (text or "").splitlines() if ln.strip()]
+    if lines and all(ln.lstrip().startswith("{") for ln in lines):
+        out = []
+        for n, line in enumerate(lines, start=1):
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"JSONL record {n} is not valid JSON: {e}") from None
+            if not isinstance(rec, dict):
+                raise ValueError(f"JSONL record {n} is not a JSON object")
+            for field in ("text", "title"):
+                if rec.get(field) is not None and not isinstance(rec[field], str):
+                    raise ValueError(f"JSONL record {n}: '{field}' must be a string")
+            out.append(_posting(str(rec.get("id", n)), rec.get("text", ""), rec.get("title")))
+        return [p for p in out if p.text]
+    parts = (read_text_input(p) for p in _SEPARATOR.split(text or ""))
+    return [_posting(str(n), p) for n, p in enumerate((p for p in parts if p), start=1)]
+
+def read_jd_file(name: str, data: bytes) -> List[JobPosting]:
+    """Postings from an uploaded file: a .pdf or .txt/.md posting, or a .jsonl/'---'-separated collection."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if name.lower().endswith(".pdf"):
+        posting = _posting(stem, extract_text_from_pdf(data))
+        return [posting] if posting.text else []
+    postings = parse_jd_collection(data.decode("utf-8", errors="replace"))
+    if len(postings) == 1 and not name.lower().endswith(".jsonl"):
+        postings[0].jd_id = stem
+    else:
+        for p in postings:
+            p.jd_id = f"{stem}:{p.jd_id}"
+    return postings
+
+@instrumented("compare_jds", lambda out, *a, **k: {"jds": len(out)})
+def compare_jds(resume_text: str, postings: List[JobPosting], embedder,
+                max_workers: Optional[int] = None, match_limit: Optional[int] = REPORT_MATCHES) -> List[JdComparison]:
+    """
+    Score one resume against every posting; best match first (ties keep input order).
+    `max_workers=0` scores in-process; otherwise on a thread pool (None = one thread per CPU).
+    """
+    if not postings:
+        return []
+    resume_chunks = resume_section_chunks(resume_text)
+    resume_skills = extract_skills(resume_text)
+    jd_chunks = [chunk_job_description(p.text) for p in postings]
+
+    groups: Dict[Any, List[str]] = {("resume", name): c for name, c in resume_chunks.items()}
+    groups.update({("jd", i): c for i, c in enumerate(jd_chunks)})
+    embs = embed_groups(embedder, groups)
+    resume_embs = {name: embs[("resume", name)] for name in resume_chunks}
+
+    def one(i: int) -> JdComparison:
+        analysis = score_resume(jd_chunks[i], embs[("jd", i)], resume_chunks, resume_embs,
+                                match_limit=match_limit)
+        jd_skills = extract_skills(postings[i].text)
+        return JdComparison(postings[i], analysis, jd_skills, categorize_missing(jd_skills - resume_skills))
+
+    if max_workers == 0 or len(postings) == 1:
+        results = [one(i) for i in range(len(postings))]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                                thread_name_prefix="compare") as pool:
+            results = list(pool.map(one, range(len(postings))))
+    return sorted(results, key=lambda r: -r.overall_100)
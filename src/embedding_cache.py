@@ -0,0 +1,204 @@
+# src/embedding_cache.py
+from __future__ import annotations
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+from src.instrumentation import stage
+
+# Set to a file path to persist cached vectors across restarts. A path ending in
+# ".vec" uses the mmap'd store that many worker processes can share (see src.shared_vectors).
+CACHE_PATH_ENV = "RESUME_ANALYZER_EMBEDDING_CACHE"
+
+def normalize_chunk(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip())
+
+def chunk_key(model_name: str, text: str) -> str:
+    """
+    Content address for a chunk: hash of the model name and the normalized text.
+    """
+    h = hashlib.sha1()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_chunk(text).encode("utf-8"))
+    return h.hexdigest()
+
+class SqliteVectorStore:
+    """
+    Persistent tier: float32 vectors stored as blobs in a single SQLite table.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, data BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        out: Dict[str, np.ndarray] = {}
+        if not keys:
+            return out
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, data FROM vectors WHERE key IN ({marks})", part
+                ).fetchall()
+                for key, dim, data in rows:
+                    out[key] = np.frombuffer(data, dtype=np.float32, count=dim)
+        return out
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        rows = [
+            (k, int(v.shape[0]), np.ascontiguousarray(v, dtype=np.float32).tobytes())
+            for k, v in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO vectors (key, dim, data) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class EmbeddingCache:
+    """
+    Two-tier vector cache: an in-memory LRU in front of an optional persistent store
+    (SqliteVectorStore, or MmapVectorStore whose hits are zero-copy views).
+    """
+    def __init__(self, max_items: int = 50_000, store=None):
+        self.max_items = max_items
+        self.store = store
+        self.stats = CacheStats()
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for k in keys:
+                v = self._mem.get(k)
+                if v is None:
+                    missing.append(k)
+                else:
+                    self._mem.move_to_end(k)
+                    found[k] = v
+            self.stats.memory_hits += len(found)
+
+        if missing and self.store is not None:
+            from_disk = self.store.get_many(missing)
+            if from_disk:
+                self._remember(from_disk)
+                found.update(from_disk)
+                with self._lock:
+                    self.stats.disk_hits += len(from_disk)
+
+        with self._lock:
+            self.stats.hits += len(found)
+            self.stats.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        self._remember(items)
+        if self.store is not None:
+            self.store.put_many(items)
+
+    def _remember(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for k, v in items.items():
+                self._mem[k] = v
+                self._mem.move_to_end(k)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._mem)
+
+class CachedEmbedder:
+    """
+    Drop-in wrapper around Embedder.embed: returns cached vectors and only
+    sends chunks never seen before (for this model) to the underlying model.
+    """
+    def __init__(self, embedder, cache: Optional[EmbeddingCache] = None, model_name: Optional[str] = None):
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.model_name = model_name or getattr(embedder, "model_name", "")
+        backend = getattr(embedder, "backend", "torch")
+        if not model_name and backend != "torch":
+            # Backends agree only within tolerance, so each gets its own vectors
+            self.model_name += f"@{backend}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return self.embedder.embed([])
+        with stage("embed_cache", chunks=len(texts)) as st:
+            keys = [chunk_key(self.model_name, t) for t in texts]
+            found = self.cache.get_many(keys)
+
+            # Encode each missing chunk once, even if it repeats within the call
+            todo: Dict[str, str] = {}
+            for k, t in zip(keys, texts):
+                if k not in found and k not in todo:
+                    todo[k] = normalize_chunk(t)
+            if st:
+                st.add(hits=len(found), misses=len(todo))
+            if todo:
+                emb = self.embedder.embed(list(todo.values()))
+                fresh = {k: np.asarray(emb[i], dtype=np.float32) for i, k in enumerate(todo)}
+                self.cache.put_many(fresh)
+                found.update(fresh)
+
+            return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
+
+_DEFAULT_CACHE: Optional[EmbeddingCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+def default_cache() -> EmbeddingCache:
+    """
+    Process-wide cache; persistent when RESUME_ANALYZER_EMBEDDING_CACHE points at a file.
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None:
+            path = os.environ.get(CACHE_PATH_ENV)
+            store = None
+            if path and path.endswith(".vec"):
+                from src.shared_vectors import MmapVectorStore
+                store = MmapVectorStore(path)
+            elif path:
+                store = SqliteVectorStore(path)
+            _DEFAULT_CACHE = EmbeddingCache(store=store)
+        return _DEFAULT_CACHE
@@ -1,16 +1,219 @@
 # src/embeddings.py
 from __future__ import annotations
-from sentence_transformers import SentenceTransformer
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
 import numpy as np
 
+from src.instrumentation import stage
+
 DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
 
+# How many distinct (model_name, device, backend) combinations stay loaded at once.
+MAX_LOADED_MODELS = 2
+
+# Inference backend: "torch" (SentenceTransformer), "onnx" or "onnx-int8" (onnxruntime, CPU).
+BACKEND_ENV = "RESUME_ANALYZER_EMBED_BACKEND"
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Padded tokens (batch size x longest chunk) per encode call, and a hard cap on texts per call.
+TOKEN_BUDGET = 8192
+MAX_BATCH = 256
+
+@dataclass
+class EmbedStats:
+    texts: int = 0
+    batches: int = 0
+    tokens: int = 0         # real tokens
+    padded_tokens: int = 0  # tokens the model actually computed, padding included
+
+    @property
+    def padding_efficiency(self) -> float:
+        return self.tokens / self.padded_tokens if self.padded_tokens else 1.0
+
+def plan_batches(lengths: List[int], token_budget: int = TOKEN_BUDGET,
+                 max_batch: int = MAX_BATCH) -> List[List[int]]:
+    """
+    Group text indices into encode batches of similar length: indices are sorted by
+    token length and cut whenever len(batch) * longest would exceed token_budget
+    (a single over-budget text still gets a batch of its own).
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for i in order:
+        # Sorted ascending, so the newcomer is the longest in the batch
+        if current and ((len(current) + 1) * lengths[i] > token_budget or len(current) >= max_batch):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    backend = backend or os.environ.get(BACKEND_ENV) or "torch"
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+    return backend
+
+def _sentence_transformer():
+    # sentence-transformers pulls in torch; import it when the first model loads.
+    # Cached as the global `SentenceTransformer` so tests can monkeypatch it.
+    if "SentenceTransformer" not in globals():
+        from sentence_transformers import SentenceTransformer
+        globals()["SentenceTransformer"] = SentenceTransformer
+    return globals()["SentenceTransformer"]
+
+def __getattr__(name: str):
+    if name == "SentenceTransformer":
+        return _sentence_transformer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class Embedder:
-    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None,
+                 backend: Optional[str] = None):
+        self.model_name = model_name
+        self.device = device
+        self.backend = resolve_backend(backend)
+        if self.backend != "torch":
+            if device not in (None, "cpu"):
+                raise ValueError(f"the {self.backend} backend runs on CPU only (got device={device!r})")
+            from src.onnx_backend import load_onnx_encoder
+            self.model = load_onnx_encoder(model_name, quantized=self.backend == "onnx-int8")
+        elif device is None:
+            self.model = _sentence_transformer()(model_name)
+        else:
+            self.model = _sentence_transformer()(model_name, device=device)
+        self.token_budget = TOKEN_BUDGET
+        self.stats = EmbedStats()
+        self._dim: Optional[int] = None
+
+    @property
+    def dim(self) -> int:
+        """Width of this model's vectors (OnnxEncoder.dim or the SentenceTransformer's)."""
+        if self._dim is None:
+            dim = getattr(self.model, "dim", None)
+            if dim is None and hasattr(self.model, "get_sentence_embedding_dimension"):
+                dim = self.model.get_sentence_embedding_dimension()
+            if dim is None:  # not reported by the model: encode one text to find out
+                dim = np.asarray(self.model.encode([""], normalize_embeddings=True)).shape[1]
+            self._dim = int(dim)
+        return self._dim
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """
+        Tokens per text including special tokens, capped at the model's max length.
+        Uses the model's tokenizer when it has one, else a whitespace estimate.
+        """
+        max_len = getattr(self.model, "max_seq_length", None) or 512
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if callable(tokenizer):
+            ids = tokenizer(list(texts), truncation=True, max_length=max_len)["input_ids"]
+            return [len(x) for x in ids]
+        return [min(len(t.split()) + 2, max_len) for t in texts]
 
     def embed(self, texts: list[str]) -> np.ndarray:
         if not texts:
-            return np.zeros((0, 384), dtype=np.float32)
-        emb = self.model.encode(texts, normalize_embeddings=True)
-        return np.asarray(emb, dtype=np.float32)
+            return np.zeros((0, self.dim), dtype=np.float32)
+        with stage("embed", batch=len(texts)) as st:
+            lengths = self.token_lengths(texts)
+            batches = plan_batches(lengths, self.token_budget)
+            padded = sum(len(b) * max(lengths[i] for i in b) for b in batches)
+            if len(batches) == 1:
+                # batch_size keeps the model from re-splitting the planned batch
+                emb = np.asarray(self.model.encode(texts, normalize_embeddings=True, batch_size=len(texts)),
+                                 dtype=np.float32)
+            else:
+                emb = None
+                for b in batches:
+                    part = self.model.encode([texts[i] for i in b], normalize_embeddings=True, batch_size=len(b))
+                    part = np.asarray(part, dtype=np.float32)
+                    if emb is None:
+                        emb = np.empty((len(texts), part.shape[1]), dtype=np.float32)
+                    # Scatter back so results come out in the caller's order
+                    emb[b] = part
+            self.stats.texts += len(texts)
+            self.stats.batches += len(batches)
+            self.stats.tokens += sum(lengths)
+            self.stats.padded_tokens += padded
+            if st:
+                st.add(tokens=sum(lengths), padded_tokens=padded, encode_calls=len(batches))
+            return emb
+
+class EmbedderRegistry:
+    """
+    Process-wide cache of loaded Embedders keyed by (model_name, device, backend).
+    Models load lazily on first use, at most once even under concurrent callers,
+    and the least recently used one is dropped when more than `max_models` are loaded.
+    """
+    def __init__(self, max_models: int = MAX_LOADED_MODELS):
+        if max_models < 1:
+            raise ValueError("max_models must be >= 1")
+        self.max_models = max_models
+        self._models: "OrderedDict[Tuple[str, Optional[str], str], Embedder]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, Optional[str], str], threading.Lock] = {}
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None,
+            backend: Optional[str] = None) -> Embedder:
+        key = (model_name, device, resolve_backend(backend))
+        with self._lock:
+            emb = self._models.get(key)
+            if emb is not None:
+                self._models.move_to_end(key)
+                return emb
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so a slow load doesn't block cached models.
+        with load_lock:
+            with self._lock:
+                emb = self._models.get(key)
+                if emb is not None:
+                    self._models.move_to_end(key)
+                    return emb
+            with stage("load_model"):
+                emb = Embedder(model_name, device=device, backend=key[2])
+            with self._lock:
+                self._models[key] = emb
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_models:
+                    old_key, _ = self._models.popitem(last=False)
+                    self._load_locks.pop(old_key, None)
+            return emb
+
+    def warm_up(self, model_names: Iterable[str] = (DEFAULT_MODEL_NAME,), device: Optional[str] = None,
+                backend: Optional[str] = None) -> None:
+        for name in model_names:
+            self.get(name, device=device, backend=backend)
+
+    def loaded(self) -> list[Tuple[str, Optional[str], str]]:
+        with self._lock:
+            return list(self._models.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._load_locks.clear()
+
+_REGISTRY = EmbedderRegistry()
+
+def get_registry() -> EmbedderRegistry:
+    return _REGISTRY
+
+def get_embedder(model_name: str = DEFAULT_MODEL_NAME, device: Optional[str] = None,
+                 backend: Optional[str] = None) -> Embedder:
+    """
+    Return the shared Embedder for (model_name, device, backend), loading it on first use.
+    The backend defaults to $RESUME_ANALYZER_EMBED_BACKEND, else "torch".
+    """
+    return _REGISTRY.get(model_name, device=device, backend=backend)
+
+def warm_up(model_names: Iterable[str] = (DEFAULT_MODEL_NAME,), device: Optional[str] = None,
+            backend: Optional[str] = None) -> None:
+    """
+    Load models ahead of the first request (call at process startup).
+    """
+    _REGISTRY.warm_up(model_names, device=device, backend=backend)
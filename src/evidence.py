@@ -1,25 +1,29 @@
 # src/evidence.py
 from __future__ import annotations
-import re
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from src.instrumentation import instrumented
+from src.skill_matcher import get_matcher, skill_key
+from src.taxonomy import Taxonomy, get_taxonomy
 
 def _lines(text: str) -> List[str]:
     return [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
 
-def find_skill_evidence(text: str, skills: List[str], max_hits_per_skill: int = 3) -> Dict[str, List[str]]:
+@instrumented("find_skill_evidence", lambda out, *a, **k: {"skills_with_evidence": len(out)})
+def find_skill_evidence(text: str, skills: List[str], max_hits_per_skill: int = 3,
+                        taxonomy: Optional[Taxonomy] = None) -> Dict[str, List[str]]:
     """
     Returns {skill: [matching_lines...]} using case-insensitive whole-word-ish matching.
+    A line mentioning any alias of a skill (per the taxonomy) counts as evidence for it.
     """
+    tax = taxonomy or get_taxonomy()
     lines = _lines(text)
+    terms = {skill: tax.terms_for(skill) for skill in skills}
+    # One pass over all lines for every skill and alias at once
+    found = get_matcher(sorted({t for ts in terms.values() for t in ts})).find_lines(lines)
     evidence: Dict[str, List[str]] = {}
     for skill in skills:
-        pat = re.compile(r"\b" + re.escape(skill) + r"\b", re.IGNORECASE)
-        hits = []
-        for ln in lines:
-            if pat.search(ln):
-                hits.append(ln)
-                if len(hits) >= max_hits_per_skill:
-                    break
-        if hits:
-            evidence[skill] = hits
+        idx = sorted({i for t in terms[skill] for i in found.get(skill_key(t), [])})
+        if idx:
+            evidence[skill] = [lines[i] for i in idx[:max_hits_per_skill]]
     return evidence
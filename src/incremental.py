@@ -0,0 +1,155 @@
+# src/incremental.py
+"""
+Incremental re-analysis for one editing session (e.g. one Streamlit user).
+
+AnalysisSession keeps the previous run's chunk vectors and its JD x resume
+similarity matrix. On the next run it diffs the new chunk lists against the old
+ones, embeds only chunks it has not seen, computes only the matrix rows/columns
+for those chunks, and re-runs the text-derived outputs (skills, evidence, ATS,
+suggestions) only when their inputs changed. Results equal a fresh analyze().
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from src.ats import ats_checks
+from src.chunking import chunk_job_description
+from src.evidence import find_skill_evidence
+from src.instrumentation import stage
+from src.layout import DocumentLayout
+from src.pipeline import SECTION_HEADERS, Analysis, resume_section_chunks
+from src.reporting import build_report
+from src.scoring import _score_matrix, best_matches_from_sim, section_score_from_sim, weighted_overall
+from src.skills import categorize_missing, extract_skills
+from src.suggestions import generate_suggestions
+
+@dataclass
+class SessionResult:
+    analysis: Analysis
+    resume_skills: set
+    jd_skills: set
+    missing: Dict[str, List[str]]           # categorize_missing(jd_skills - resume_skills)
+    evidence: Dict[str, List[str]]          # JD skill -> resume lines mentioning it
+    ats: Dict[str, List[str]]
+    suggestions: List[Dict[str, str]]
+    report: Dict[str, Any]
+
+@dataclass
+class SessionStats:
+    embedded_chunks: int = 0    # chunks sent to the embedder this run
+    reused_chunks: int = 0
+    computed_pairs: int = 0     # similarity entries computed this run
+    total_pairs: int = 0
+    recomputed: List[str] = field(default_factory=list)  # derived outputs re-run
+
+class AnalysisSession:
+    def __init__(self, embedder, suggestions: int = 6, evidence_hits: int = 3):
+        self.embedder = embedder
+        self.n_suggestions = suggestions
+        self.evidence_hits = evidence_hits
+        self.stats = SessionStats()
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._rows: List[str] = []              # JD chunks (matrix rows)
+        self._cols: List[str] = []              # unique resume chunks across sections (matrix columns)
+        self._sim = np.zeros((0, 0), dtype=np.float32)
+        self._memo: Dict[str, Tuple[Any, Any]] = {}
+
+    def _derived(self, name: str, key: Any, fn: Callable[[], Any]) -> Any:
+        hit = self._memo.get(name)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        self.stats.recomputed.append(name)
+        value = fn()
+        self._memo[name] = (key, value)
+        return value
+
+    def _embed_new(self, chunks: List[str]) -> None:
+        new = [c for c in dict.fromkeys(chunks) if c not in self._vectors]
+        self.stats.embedded_chunks = len(new)
+        self.stats.reused_chunks = len(set(chunks)) - len(new)
+        if new:
+            emb = self.embedder.embed(new)
+            self._vectors.update(zip(new, emb))
+        # Keep only vectors the current texts use
+        keep = set(chunks)
+        self._vectors = {c: v for c, v in self._vectors.items() if c in keep}
+
+    def _vecs(self, chunks: List[str]) -> np.ndarray:
+        if not chunks:
+            if self._vectors:
+                return np.zeros((0, next(iter(self._vectors.values())).shape[0]), dtype=np.float32)
+            return np.asarray(self.embedder.embed([]), dtype=np.float32)
+        return np.stack([self._vectors[c] for c in chunks])
+
+    def _update_sim(self, rows: List[str], cols: List[str]) -> np.ndarray:
+        old_r = {c: i for i, c in enumerate(self._rows)}
+        old_c = {c: j for j, c in enumerate(self._cols)}
+        ri = np.array([old_r.get(c, -1) for c in rows], dtype=np.intp)
+        ci = np.array([old_c.get(c, -1) for c in cols], dtype=np.intp)
+        kept_r, new_r = np.flatnonzero(ri >= 0), np.flatnonzero(ri < 0)
+        kept_c, new_c = np.flatnonzero(ci >= 0), np.flatnonzero(ci < 0)
+
+        sim = np.zeros((len(rows), len(cols)), dtype=np.float32)
+        if kept_r.size and kept_c.size:
+            sim[np.ix_(kept_r, kept_c)] = self._sim[np.ix_(ri[kept_r], ci[kept_c])]
+        computed = 0
+        if new_r.size and cols:
+            sim[new_r] = _score_matrix(self._vecs([rows[i] for i in new_r]), self._vecs(cols))
+            computed += new_r.size * len(cols)
+        if kept_r.size and new_c.size:
+            sim[np.ix_(kept_r, new_c)] = _score_matrix(self._vecs([rows[i] for i in kept_r]),
+                                                       self._vecs([cols[j] for j in new_c]))
+            computed += kept_r.size * new_c.size
+        self.stats.computed_pairs = computed
+        self.stats.total_pairs = sim.size
+        self._rows, self._cols, self._sim = list(rows), list(cols), sim
+        return sim
+
+    def run(self, resume_text: str, jd_text: str, layout: Optional[DocumentLayout] = None) -> SessionResult:
+        """
+        Analyze (resume, jd), reusing everything unchanged since the previous run.
+        `layout` is the resume PDF's layout, if extracted with one (used by the ATS checks).
+        """
+        self.stats = SessionStats()
+        with stage("incremental_analyze") as st:
+            jd_chunks = chunk_job_description(jd_text)
+            resume_chunks = resume_section_chunks(resume_text)
+            cols = list(dict.fromkeys(c for chunks in resume_chunks.values() for c in chunks))
+            self._embed_new(jd_chunks + cols)
+            sim = self._update_sim(jd_chunks, cols)
+
+            col_of = {c: j for j, c in enumerate(cols)}
+            def section_sim(name: str) -> np.ndarray:
+                return sim[:, [col_of[c] for c in resume_chunks[name]]]
+
+            section_scores = {name: section_score_from_sim(section_sim(name)) for name in SECTION_HEADERS}
+            jd_to_best = best_matches_from_sim(jd_chunks, resume_chunks["full"], section_sim("full"))
+            analysis = Analysis(
+                jd_chunks=jd_chunks,
+                resume_chunks=resume_chunks,
+                section_scores=section_scores,
+                overall_100=round(weighted_overall(section_scores) * 100, 1),
+                jd_to_best=jd_to_best,
+            )
+
+            resume_skills = self._derived("resume_skills", resume_text, lambda: extract_skills(resume_text))
+            jd_skills = self._derived("jd_skills", jd_text, lambda: extract_skills(jd_text))
+            missing_set = frozenset(jd_skills - resume_skills)
+            missing = self._derived("missing", missing_set, lambda: categorize_missing(set(missing_set)))
+            jd_skill_list = sorted(jd_skills)
+            evidence = self._derived(
+                "evidence", (resume_text, tuple(jd_skill_list)),
+                lambda: find_skill_evidence(resume_text, jd_skill_list, max_hits_per_skill=self.evidence_hits),
+            )
+            ats = self._derived("ats", (resume_text, layout), lambda: ats_checks(resume_text, layout))
+            suggestions = self._derived(
+                "suggestions", tuple(jd_to_best[:self.n_suggestions]),
+                lambda: generate_suggestions(jd_to_best, n=self.n_suggestions),
+            )
+            report = build_report(analysis.overall_100, section_scores, jd_to_best, missing)
+            if st:
+                st.add(embedded=self.stats.embedded_chunks, computed_pairs=self.stats.computed_pairs,
+                       total_pairs=self.stats.total_pairs)
+
+        return SessionResult(analysis, resume_skills, jd_skills, missing, evidence, ats, suggestions, report)
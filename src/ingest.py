@@ -0,0 +1,162 @@
+# src/ingest.py
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.parsing import clean_text, iter_pdf_pages
+
+
+@dataclass(frozen=True)
+class IngestLimits:
+    """Per-document guards so one huge or malformed PDF can't stall a bulk upload."""
+    max_pages: int = 30
+    max_bytes: int = 10 * 1024 * 1024
+    timeout_s: float = 20.0
+
+
+@dataclass
+class IngestResult:
+    path: str
+    text: str = ""
+    pages: int = 0
+    truncated: bool = False  # stopped at max_pages
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class IngestTimeout(Exception):
+    pass
+
+
+# How often the pool loop checks worker deadlines
+POLL_S = 0.25
+
+
+def _on_alarm(signum, frame):
+    raise IngestTimeout()
+
+
+def extract_pdf_file(path: str, limits: IngestLimits = IngestLimits()) -> IngestResult:
+    """Extract and clean one PDF under the given limits; never raises.
+
+    Pages are pulled one at a time and the deadline is checked between pages.
+    In a worker's main thread a SIGALRM timer also interrupts a single page that hangs.
+    """
+    try:
+        size = os.path.getsize(path)
+        if size > limits.max_bytes:
+            return IngestResult(path, error=f"file is {size} bytes (limit {limits.max_bytes})")
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return IngestResult(path, error=f"{type(e).__name__}: {e}")
+
+    use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, limits.timeout_s)
+
+    deadline = time.monotonic() + limits.timeout_s
+    pages: List[str] = []
+    truncated = False
+    try:
+        # Ask for one extra page to learn whether the document was cut off
+        for page_text in iter_pdf_pages(data, max_pages=limits.max_pages + 1):
+            if len(pages) >= limits.max_pages:
+                truncated = True
+                break
+            pages.append(page_text)
+            if time.monotonic() > deadline:
+                raise IngestTimeout()
+    except IngestTimeout:
+        return IngestResult(path, pages=len(pages), error=f"timed out after {limits.timeout_s:g}s")
+    except Exception as e:  # malformed PDFs raise all sorts of errors from PyMuPDF
+        return IngestResult(path, pages=len(pages), error=f"{type(e).__name__}: {e}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    return IngestResult(path, text=clean_text("\n".join(pages)), pages=len(pages), truncated=truncated)
+
+
+def _terminate(pool: ProcessPoolExecutor) -> None:
+    # A page stuck inside MuPDF's C code ignores SIGALRM, so the only way out is to
+    # kill the worker; ProcessPoolExecutor has no public way to do that (before 3.14)
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def ingest_pdfs(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    limits: IngestLimits = IngestLimits(),
+) -> Iterator[IngestResult]:
+    """Extract many PDFs in a process pool, yielding results as each file finishes.
+
+    At most `4 * max_workers` files are in flight, so memory stays flat for large batches.
+    Failures come back as results with `error` set instead of aborting the batch.
+    A file still running well past `limits.timeout_s` (stuck where the worker's own
+    timer can't interrupt it) is reported as timed out and the pool is replaced;
+    the other files that were in flight are resubmitted.
+    `max_workers=0` runs everything in-process (useful for tests and small jobs).
+    """
+    if max_workers == 0:
+        for p in paths:
+            yield extract_pdf_file(p, limits)
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    window = 4 * workers
+    # A future counts as running once it is queued for a worker, so allow for one job ahead of it
+    hard_limit = 2 * limits.timeout_s + 1.0
+    it = iter(paths)
+    retry: List[str] = []
+    pending: Dict[Future, str] = {}
+    started: Dict[Future, float] = {}
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(pending) < window:
+                p = retry.pop(0) if retry else next(it, None)
+                if p is None:
+                    break
+                pending[pool.submit(extract_pdf_file, p, limits)] = p
+            if not pending:
+                return
+            done, _ = wait(pending, timeout=POLL_S, return_when=FIRST_COMPLETED)
+            for fut in done:
+                path = pending.pop(fut)
+                started.pop(fut, None)
+                try:
+                    yield fut.result()
+                except Exception as e:  # e.g. a worker killed by the OS
+                    yield IngestResult(path, error=f"{type(e).__name__}: {e}")
+
+            now = time.monotonic()
+            expired = []
+            for fut in pending:
+                if fut.running():
+                    started.setdefault(fut, now)
+                if now - started.get(fut, now) > hard_limit:
+                    expired.append(fut)
+            if expired:
+                _terminate(pool)
+                for fut in expired:
+                    yield IngestResult(pending.pop(fut), error=f"timed out after {limits.timeout_s:g}s (worker killed)")
+                retry.extend(pending.values())
+                pending.clear()
+                started.clear()
+                pool = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        pool.shutdown(wait=not pending, cancel_futures=True)
@@ -0,0 +1,271 @@
+# src/instrumentation.py
+"""
+Per-stage timing/size instrumentation for the analysis pipeline.
+
+Pipeline functions report through `stage(...)` or the `@instrumented(...)` decorator.
+Nothing is measured unless a sink is registered, either process-wide
+(add_sink / configure_from_env) or for the current thread/context only (capture()),
+so the disabled cost is one function call and two emptiness checks.
+"""
+from __future__ import annotations
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+JSON_LOG_ENV = "RESUME_ANALYZER_METRICS_JSON"
+PROMETHEUS_ENV = "RESUME_ANALYZER_METRICS_PROM"
+
+@dataclass
+class StageRecord:
+    stage: str
+    wall_ms: float
+    counts: Dict[str, float] = field(default_factory=dict)
+    peak_rss_delta_kb: Optional[int] = None
+    timestamp: float = 0.0
+
+_GLOBAL_SINKS: List[Any] = []
+_SCOPED: ContextVar[Tuple[Any, ...]] = ContextVar("resume_analyzer_sinks", default=())
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def enabled() -> bool:
+    return bool(_GLOBAL_SINKS or _SCOPED.get())
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self) -> bool:
+        return False
+
+    def add(self, **counts) -> None:
+        pass
+
+_NOOP = _NoopStage()
+
+class _Stage:
+    __slots__ = ("name", "counts", "_t0", "_rss0")
+
+    def __init__(self, name: str, counts: Dict[str, float]):
+        self.name = name
+        self.counts = counts
+
+    def __enter__(self):
+        self._rss0 = _peak_rss_kb()
+        self._t0 = time.perf_counter()
+        return self
+
+    def add(self, **counts) -> None:
+        """Accumulate counts known only after the work (chunks produced, cache hits, ...)."""
+        for k, v in counts.items():
+            self.counts[k] = self.counts.get(k, 0) + v
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_ms = (time.perf_counter() - self._t0) * 1000.0
+        rss1 = _peak_rss_kb()
+        rec = StageRecord(
+            stage=self.name,
+            wall_ms=wall_ms,
+            counts=self.counts,
+            peak_rss_delta_kb=None if rss1 is None or self._rss0 is None else rss1 - self._rss0,
+            timestamp=time.time(),
+        )
+        if exc_type is not None:
+            rec.counts["errors"] = rec.counts.get("errors", 0) + 1
+        for sink in (*_GLOBAL_SINKS, *_SCOPED.get()):
+            try:
+                sink.record(rec)
+            except Exception:  # a broken sink must never break an analysis
+                pass
+        return False
+
+def stage(name: str, **counts):
+    """
+    Context manager timing one pipeline stage. The returned object is falsy when
+    instrumentation is off, so expensive counts can be guarded with `if st:`.
+    """
+    if not _GLOBAL_SINKS and not _SCOPED.get():
+        return _NOOP
+    return _Stage(name, counts)
+
+def instrumented(name: str, counts: Optional[Callable[..., Dict[str, float]]] = None):
+    """
+    Decorator form of stage(). `counts(result, *args, **kwargs)` is only called when
+    enabled, and a failing `counts` is ignored like a failing sink.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _GLOBAL_SINKS and not _SCOPED.get():
+                return fn(*args, **kwargs)
+            with _Stage(name, {}) as st:
+                out = fn(*args, **kwargs)
+                if counts is not None:
+                    try:
+                        st.add(**counts(out, *args, **kwargs))
+                    except Exception:  # metrics must never change what the call does
+                        pass
+                return out
+        return wrapper
+    return deco
+
+# ---- sinks --------------------------------------------------------------------
+
+class MemorySink:
+    def __init__(self):
+        self.records: List[StageRecord] = []
+
+    def record(self, rec: StageRecord) -> None:
+        self.records.append(rec)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per stage: calls, total/max wall time, summed counts, max RSS delta."""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for r in self.records:
+            row = rows.setdefault(r.stage, {"stage": r.stage, "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                            "peak_rss_delta_kb": 0})
+            row["calls"] += 1
+            row["total_ms"] += r.wall_ms
+            row["max_ms"] = max(row["max_ms"], r.wall_ms)
+            row["peak_rss_delta_kb"] = max(row["peak_rss_delta_kb"], r.peak_rss_delta_kb or 0)
+            for k, v in r.counts.items():
+                row[k] = row.get(k, 0) + v
+        return list(rows.values())
+
+class JsonLogSink:
+    """Appends one JSON object per stage record (JSON Lines)."""
+    def __init__(self, path_or_stream):
+        self._lock = threading.Lock()
+        if isinstance(path_or_stream, str):
+            self._stream = open(path_or_stream, "a", encoding="utf-8")
+        else:
+            self._stream = path_or_stream
+
+    def record(self, rec: StageRecord) -> None:
+        line = json.dumps(asdict(rec))
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+class PrometheusTextSink:
+    """
+    Aggregates records into counters and rewrites a Prometheus text-exposition file
+    (e.g. for node_exporter's textfile collector) at most every `interval_s` seconds.
+    """
+    def __init__(self, path: str, prefix: str = "resume_analyzer", interval_s: float = 5.0):
+        self.path = path
+        self.prefix = prefix
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+        self._counts: Dict[Tuple[str, str], float] = {}
+        self._rss: Dict[str, int] = {}
+        self._last_write = 0.0
+
+    def record(self, rec: StageRecord) -> None:
+        with self._lock:
+            self._calls[rec.stage] = self._calls.get(rec.stage, 0) + 1
+            self._seconds[rec.stage] = self._seconds.get(rec.stage, 0.0) + rec.wall_ms / 1000.0
+            for k, v in rec.counts.items():
+                self._counts[(rec.stage, k)] = self._counts.get((rec.stage, k), 0) + v
+            if rec.peak_rss_delta_kb is not None:
+                self._rss[rec.stage] = max(self._rss.get(rec.stage, 0), rec.peak_rss_delta_kb)
+            due = time.monotonic() - self._last_write >= self.interval_s
+        if due:
+            self.flush()
+
+    def render(self) -> str:
+        p = self.prefix
+        with self._lock:
+            lines = [
+                f"# HELP {p}_stage_calls_total Pipeline stage invocations.",
+                f"# TYPE {p}_stage_calls_total counter",
+            ]
+            lines += [f'{p}_stage_calls_total{{stage="{s}"}} {n}' for s, n in sorted(self._calls.items())]
+            lines += [
+                f"# HELP {p}_stage_seconds_total Wall time spent in each pipeline stage.",
+                f"# TYPE {p}_stage_seconds_total counter",
+            ]
+            lines += [f'{p}_stage_seconds_total{{stage="{s}"}} {v:.6f}' for s, v in sorted(self._seconds.items())]
+            lines += [
+                f"# HELP {p}_stage_items_total Items processed per stage (chunks, tokens, batch sizes, ...).",
+                f"# TYPE {p}_stage_items_total counter",
+            ]
+            lines += [f'{p}_stage_items_total{{stage="{s}",kind="{k}"}} {v:g}'
+                      for (s, k), v in sorted(self._counts.items())]
+            lines += [
+                f"# HELP {p}_stage_peak_rss_delta_kb Largest peak-RSS growth observed during a stage.",
+                f"# TYPE {p}_stage_peak_rss_delta_kb gauge",
+            ]
+            lines += [f'{p}_stage_peak_rss_delta_kb{{stage="{s}"}} {v}' for s, v in sorted(self._rss.items())]
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        text = self.render()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+        with self._lock:
+            self._last_write = time.monotonic()
+
+# ---- registration ------------------------------------------------------------
+
+def add_sink(sink) -> None:
+    if sink not in _GLOBAL_SINKS:
+        _GLOBAL_SINKS.append(sink)
+
+def remove_sink(sink) -> None:
+    if sink in _GLOBAL_SINKS:
+        _GLOBAL_SINKS.remove(sink)
+
+def clear_sinks() -> None:
+    del _GLOBAL_SINKS[:]
+
+@contextmanager
+def capture() -> Iterator[MemorySink]:
+    """Collect records from the current thread/context only (e.g. one Streamlit session)."""
+    sink = MemorySink()
+    token = _SCOPED.set(_SCOPED.get() + (sink,))
+    try:
+        yield sink
+    finally:
+        _SCOPED.reset(token)
+
+_CONFIGURED = False
+
+def configure_from_env() -> None:
+    """Register JSON-log / Prometheus sinks from environment variables (once per process)."""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
+    json_path = os.environ.get(JSON_LOG_ENV)
+    if json_path:
+        add_sink(JsonLogSink(json_path))
+    prom_path = os.environ.get(PROMETHEUS_ENV)
+    if prom_path:
+        add_sink(PrometheusTextSink(prom_path))
@@ -0,0 +1,166 @@
+# src/layout.py
+"""
+Layout analysis for PDF pages, from PyMuPDF's page.get_text("dict") output.
+
+One get_text("dict") call per page gives every text line with its bounding box and
+font spans, plus image blocks. From that, in one pass over the lines, we find text
+columns (x-clusters of lines that are too narrow to span the page), rebuild reading
+order for multi-column pages (spanning lines such as a name header split the page
+into bands; within a band, columns are read left to right), and collect layout
+metadata (columns, table-like rows, images, fonts) for the ATS checks.
+
+Single-column pages keep PyMuPDF's own line order, so their text matches
+get_text("text").
+"""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
+
+SPANNING = 0.55       # lines wider than this share of the page span all columns
+MIN_COLUMN = 0.2      # narrower x-clusters may be annotations (e.g. right-aligned dates)
+MIN_COLUMN_LINES = 3
+ROW_TOLERANCE = 2.0   # points; lines whose vertical centres are this close share a row
+TABLE_CELLS = 3       # a table row has at least this many separate cells
+ALIGN_TOLERANCE = 3.0
+
+@dataclass
+class DocumentLayout:
+    pages: int = 0
+    columns: int = 1              # most text columns found on any page
+    multi_column_pages: int = 0
+    tables: int = 0               # runs of aligned multi-cell rows
+    images: int = 0
+    fonts: Dict[str, int] = field(default_factory=dict)   # font name -> characters set in it
+    min_font_size: float = 0.0    # smallest size used for real text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+# (x0, y0, x1, y1, text)
+_Line = Tuple[float, float, float, float, str]
+
+def _text_lines(page: Dict[str, Any], layout: DocumentLayout) -> List[_Line]:
+    lines: List[_Line] = []
+    for block in page.get("blocks", ()):
+        if block.get("type", 0) == 1:
+            layout.images += 1
+            continue
+        for line in block.get("lines", ()):
+            spans = line.get("spans", ())
+            text = "".join(s.get("text", "") for s in spans)
+            if not text.strip():
+                continue
+            for s in spans:
+                n = len(s.get("text", "").strip())
+                if not n:
+                    continue
+                font = s.get("font", "")
+                layout.fonts[font] = layout.fonts.get(font, 0) + n
+                size = round(float(s.get("size", 0.0)), 1)
+                if size and (not layout.min_font_size or size < layout.min_font_size):
+                    layout.min_font_size = size
+            x0, y0, x1, y1 = line["bbox"]
+            lines.append((x0, y0, x1, y1, text))
+    return lines
+
+def _mid(line: _Line) -> float:
+    return (line[1] + line[3]) / 2
+
+def _row(line: _Line) -> int:
+    return round(_mid(line) / ROW_TOLERANCE)
+
+def _is_annotation(c: List[Any], page_rows: List[int], width: float) -> bool:
+    """
+    A narrow x-cluster whose lines each sit on a row with other text, with other
+    rows between them: dates or locations beside job titles, not a column of their
+    own (a real column's lines follow one another).
+    """
+    if c[1] - c[0] >= MIN_COLUMN * width:
+        return False
+
+    def count(lo: int, hi: int) -> int:   # page lines on rows lo..hi
+        return bisect_right(page_rows, hi) - bisect_left(page_rows, lo)
+
+    own = sorted(_row(l) for l in c[2])
+    if any(count(r - 1, r + 1) < 2 for r in own):
+        return False
+    gaps = [count(a + 2, b - 2) for a, b in zip(own, own[1:])]
+    return sum(g > 0 for g in gaps) * 2 >= len(gaps)
+
+def _clusters(lines: List[_Line], all_lines: List[_Line], width: float) -> List[Tuple[float, float]]:
+    """x-ranges of the text columns formed by `lines` (the non-spanning lines of the page)."""
+    merged: List[List[Any]] = []   # [x0, x1, lines]
+    for ln in sorted(lines):
+        if merged and ln[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], ln[2])
+            merged[-1][2].append(ln)
+        else:
+            merged.append([ln[0], ln[2], [ln]])
+    page_rows = sorted(_row(l) for l in all_lines)
+    out: List[List[Any]] = []
+    for c in merged:
+        if out and (_is_annotation(c, page_rows, width) or _is_annotation(out[-1], page_rows, width)):
+            out[-1] = [out[-1][0], max(out[-1][1], c[1]), out[-1][2] + c[2]]
+        else:
+            out.append(c)
+    columns = [(c[0], c[1]) for c in out if len(c[2]) >= MIN_COLUMN_LINES]
+    return columns or [(c[0], c[1]) for c in out[:1]]
+
+def _count_tables(lines: List[_Line]) -> int:
+    rows: List[List[_Line]] = []
+    for ln in sorted(lines, key=lambda l: ((l[1] + l[3]) / 2, l[0])):
+        mid = (ln[1] + ln[3]) / 2
+        if rows and abs((rows[-1][0][1] + rows[-1][0][3]) / 2 - mid) <= ROW_TOLERANCE:
+            rows[-1].append(ln)
+        else:
+            rows.append([ln])
+    tables = 0
+    prev: List[float] = []
+    in_table = False
+    for row in rows:
+        starts = sorted(l[0] for l in row) if len(row) >= TABLE_CELLS else []
+        aligned = bool(starts) and len(starts) == len(prev) and all(
+            abs(a - b) <= ALIGN_TOLERANCE for a, b in zip(starts, prev))
+        if aligned and not in_table:
+            tables += 1
+        in_table = aligned
+        prev = starts
+    return tables
+
+def page_text_lines(page: Dict[str, Any], layout: DocumentLayout) -> List[str]:
+    """Text lines of one page in reading order; adds the page to `layout`."""
+    layout.pages += 1
+    lines = _text_lines(page, layout)
+    width = float(page.get("width") or 0) or max((l[2] for l in lines), default=1.0)
+    spanning = [l[2] - l[0] > SPANNING * width for l in lines]
+    columns = _clusters([l for l, s in zip(lines, spanning) if not s], lines, width)
+    layout.tables += _count_tables(lines)
+    if len(columns) <= 1:
+        return [l[4] for l in lines]
+
+    layout.columns = max(layout.columns, len(columns))
+    layout.multi_column_pages += 1
+
+    def column_of(line: _Line) -> int:
+        # The column containing the line's centre, else the nearest one
+        centre = (line[0] + line[2]) / 2
+        return min(range(len(columns)),
+                   key=lambda i: max(columns[i][0] - centre, centre - columns[i][1], 0.0))
+
+    out: List[str] = []
+    band: List[List[_Line]] = [[] for _ in columns]
+
+    def flush():
+        for col in band:
+            out.extend(l[4] for l in sorted(col, key=lambda l: (round(l[1] / ROW_TOLERANCE), l[0])))
+            col.clear()
+
+    for line, spans in sorted(zip(lines, spanning), key=lambda p: (p[0][1], p[0][0])):
+        if spans:
+            flush()
+            out.append(line[4])
+        else:
+            band[column_of(line)].append(line)
+    flush()
+    return out
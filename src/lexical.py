@@ -0,0 +1,224 @@
+# src/lexical.py
+"""
+Sparse lexical scoring (BM25 over resume bullets) to pre-filter before embedding.
+
+LexicalIndex tokenizes the same bullet chunks the dense path embeds and keeps them
+as a scipy.sparse term-by-bullet matrix of BM25 weights, i.e. an inverted index:
+scoring a JD is one sparse product of its chunk-term matrix with that index. A
+resume's lexical score mirrors the dense one: per scored section, the best bullet's
+BM25 score for each JD chunk averaged over JD chunks (as compute_section_score),
+then blended with SECTION_WEIGHTS.
+
+screen() sends only the lexical top-N resumes to the embedder and ranks them by a
+blend of the dense overall score and the (max-normalized) lexical score;
+recall_vs_dense() measures how much of the dense-only top-k that keeps.
+"""
+from __future__ import annotations
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from src.chunking import chunk_job_description
+from src.instrumentation import instrumented
+from src.pipeline import embed_groups, resume_section_chunks, score_resume
+from src.scoring import SECTION_WEIGHTS
+
+# Keeps tech spellings whole: c++, c#, node.js, ci/cd splits into ci and cd
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our over the "
+    "their this to was we were will with you your".split()
+)
+DEFAULT_ALPHA = 0.8   # weight of the dense score in the hybrid blend
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+def top_positions(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the n highest scores, best first; ties go to the lower position."""
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.zeros(0, dtype=np.intp)
+    cand = np.argpartition(-scores, n - 1)[:n] if n < len(scores) else np.arange(len(scores))
+    return cand[np.lexsort((cand, -scores[cand]))]
+
+class LexicalIndex:
+    """
+    BM25 index over resume bullets. add() resumes, then score JD chunks with scores()
+    or top_n(); the sparse matrices are rebuilt lazily after adds. With a fixed
+    `vocabulary` (a JD's terms) only those terms are stored; bullet lengths still count
+    every token, so scores for queries drawn from that vocabulary are unchanged.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75, vocabulary: Optional[Iterable[str]] = None):
+        self.k1 = k1
+        self.b = b
+        self._fixed = vocabulary is not None
+        self._ids: List[str] = []
+        self._vocab: Dict[str, int] = {t: i for i, t in enumerate(sorted(set(vocabulary or ())))}
+        self._terms: List[int] = []         # term ids of every bullet, concatenated
+        self._indptr: List[int] = [0]       # bullet boundaries in _terms
+        self._lengths: List[int] = []       # tokens per bullet
+        self._owner: List[int] = []         # resume of each bullet
+        self._postings: Optional[sparse.csr_matrix] = None   # (terms, bullets) BM25 weights
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    def add(self, resume_id: str, bullets: List[str]) -> None:
+        slot = len(self._ids)
+        self._ids.append(resume_id)
+        for bullet in bullets:
+            tokens = tokenize(bullet)
+            if self._fixed:
+                self._terms.extend(self._vocab[t] for t in tokens if t in self._vocab)
+            else:
+                self._terms.extend(self._vocab.setdefault(t, len(self._vocab)) for t in tokens)
+            self._indptr.append(len(self._terms))
+            self._lengths.append(len(tokens))
+            self._owner.append(slot)
+        self._postings = None
+
+    def _build(self) -> sparse.csr_matrix:
+        if self._postings is None:
+            n, v = len(self._owner), len(self._vocab)
+            tf = sparse.csr_matrix(
+                (np.ones(len(self._terms), dtype=np.float32), np.array(self._terms, dtype=np.int64),
+                 np.array(self._indptr, dtype=np.int64)), shape=(n, v))
+            tf.sum_duplicates()   # one entry per (bullet, term) holding the term count
+            lengths = np.array(self._lengths, dtype=np.float32)
+            avg = float(lengths.mean()) if n else 1.0
+            df = np.bincount(tf.indices, minlength=v).astype(np.float32)
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths / max(avg, 1e-9))
+            rows = np.repeat(np.arange(n), np.diff(tf.indptr))
+            tf.data = idf[tf.indices] * tf.data * (self.k1 + 1) / (tf.data + norm[rows])
+            self._postings = tf.T.tocsr()
+        return self._postings
+
+    def _query(self, jd_chunks: List[str]) -> sparse.csr_matrix:
+        rows, cols = [], []
+        for i, chunk in enumerate(jd_chunks):
+            terms = {self._vocab[t] for t in tokenize(chunk) if t in self._vocab}
+            rows.extend([i] * len(terms))
+            cols.extend(terms)
+        return sparse.csr_matrix((np.ones(len(cols), dtype=np.float32), (rows, cols)),
+                                 shape=(len(jd_chunks), len(self._vocab)))
+
+    def scores(self, jd_chunks: List[str]) -> np.ndarray:
+        """Lexical score of every resume (in add order) for the JD chunks."""
+        n_res = len(self._ids)
+        if not jd_chunks or not n_res:
+            return np.zeros(n_res, dtype=np.float32)
+        sim = (self._query(jd_chunks) @ self._build()).tocoo()   # (JD chunks, bullets)
+        best = np.zeros(len(jd_chunks) * n_res, dtype=np.float32)
+        owner = np.asarray(self._owner, dtype=np.int64)
+        np.maximum.at(best, sim.row.astype(np.int64) * n_res + owner[sim.col], sim.data)
+        return best.reshape(len(jd_chunks), n_res).mean(axis=0)
+
+    def top_n(self, jd_chunks: List[str], n: int) -> List[Tuple[str, float]]:
+        """The n best (resume_id, score) pairs, best first; ties go to the earlier resume."""
+        s = self.scores(jd_chunks)
+        return [(self._ids[i], float(s[i])) for i in top_positions(s, n)]
+
+class SectionIndex:
+    """
+    Lexical counterpart of the overall match, built one resume at a time: one
+    LexicalIndex per scored section, restricted to the JD's terms so that memory grows
+    with the matched postings rather than with the resume text, blended with SECTION_WEIGHTS.
+    """
+    def __init__(self, jd_chunks: List[str]):
+        self.jd_chunks = jd_chunks
+        terms = {t for chunk in jd_chunks for t in tokenize(chunk)}
+        self._indexes = {name: LexicalIndex(vocabulary=terms) for name in SECTION_WEIGHTS}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def ids(self) -> List[str]:
+        return next(iter(self._indexes.values())).ids
+
+    def add(self, resume_id: str, sections: Mapping[str, List[str]]) -> None:
+        """Add one resume given as resume_section_chunks() output."""
+        for name, index in self._indexes.items():
+            index.add(resume_id, sections[name])
+
+    def scores(self) -> np.ndarray:
+        """Lexical score of every resume, in add order."""
+        total = np.zeros(len(self), dtype=np.float32)
+        for name, index in self._indexes.items():
+            total += SECTION_WEIGHTS[name] * index.scores(self.jd_chunks)
+        return total
+
+def section_scores(jd_chunks: List[str], chunks: Mapping[str, Dict[str, List[str]]]) -> np.ndarray:
+    """SectionIndex scores for resumes given as id -> resume_section_chunks() output (in mapping order)."""
+    index = SectionIndex(jd_chunks)
+    for rid, sections in chunks.items():
+        index.add(rid, sections)
+    return index.scores()
+
+@dataclass
+class ScreenHit:
+    resume_id: str
+    score: float        # hybrid: DEFAULT_ALPHA * dense + (1 - alpha) * lexical
+    dense: float        # overall match, 0-1
+    lexical: float      # BM25 score / best BM25 score for this JD
+
+@instrumented("screen", lambda out, *a, **k: {"embedded": len(out)})
+def screen(jd_text: str, resumes: Mapping[str, str], embedder, top_n: int = 100,
+           alpha: float = DEFAULT_ALPHA) -> List[ScreenHit]:
+    """
+    Rank resumes (id -> text) for a JD, embedding only the lexical top `top_n`.
+    alpha=1.0 ranks the survivors by the dense score alone.
+    """
+    jd_chunks = chunk_job_description(jd_text)
+    chunks = {rid: resume_section_chunks(text) for rid, text in resumes.items()}
+    ids = list(chunks)
+    lexical = section_scores(jd_chunks, chunks)
+    candidates = [(ids[i], float(lexical[i])) for i in top_positions(lexical, top_n)]
+    if not candidates:
+        return []
+    best = candidates[0][1] or 1.0
+
+    groups = {("resume", rid, name): c for rid, _ in candidates for name, c in chunks[rid].items()}
+    embs = embed_groups(embedder, {"jd": jd_chunks, **groups})
+    hits = []
+    for rid, lex in candidates:
+        resume_embs = {name: embs[("resume", rid, name)] for name in chunks[rid]}
+        dense = score_resume(jd_chunks, embs["jd"], chunks[rid], resume_embs, match_limit=0).overall_100 / 100
+        hits.append(ScreenHit(rid, alpha * dense + (1 - alpha) * lex / best, dense, lex / best))
+    hits.sort(key=lambda h: -h.score)
+    return hits
+
+def recall_vs_dense(jd_text: str, resumes: Mapping[str, str], embedder, top_n: int = 100, k: int = 10,
+                    alpha: float = DEFAULT_ALPHA) -> Dict[str, float]:
+    """
+    Recall@k of the pre-filtered rankings (dense-only and hybrid) against dense
+    scoring of every resume, the share of resumes embedded, and the time of each path in ms.
+    """
+    t0 = time.perf_counter()
+    exact = screen(jd_text, resumes, embedder, top_n=len(resumes), alpha=1.0)
+    t1 = time.perf_counter()
+    dense = screen(jd_text, resumes, embedder, top_n=top_n, alpha=1.0)
+    t2 = time.perf_counter()
+    hybrid = screen(jd_text, resumes, embedder, top_n=top_n, alpha=alpha)
+    truth = {h.resume_id for h in exact[:k]}
+
+    def recall(hits: List[ScreenHit]) -> float:
+        return len(truth & {h.resume_id for h in hits[:k]}) / len(truth) if truth else 1.0
+
+    return {
+        "recall_at_k": recall(dense),
+        "hybrid_recall_at_k": recall(hybrid),
+        "embedded_share": len(dense) / len(resumes) if resumes else 0.0,
+        "prefilter_ms": (t2 - t1) * 1000,
+        "dense_only_ms": (t1 - t0) * 1000,
+    }
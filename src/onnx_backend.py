@@ -0,0 +1,156 @@
+# src/onnx_backend.py
+"""
+ONNX Runtime inference for sentence-transformers models on CPU.
+
+    python -m src.onnx_backend export all-MiniLM-L6-v2 models/minilm --quantize
+
+Export writes the transformer as model.onnx (plus a dynamically quantized
+model_int8.onnx with --quantize), the tokenizer files and a small meta.json.
+OnnxEncoder reproduces the model's mean pooling and L2 normalization, so its
+output matches SentenceTransformer.encode within float tolerance.
+Needs onnxruntime (optional dependency); export also needs torch and onnx.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+import numpy as np
+
+# Where exported models are kept (default ~/.cache/resume_analyzer/onnx)
+ONNX_DIR_ENV = "RESUME_ANALYZER_ONNX_DIR"
+# intra-op threads per ONNX session (default: onnxruntime picks one per core)
+ONNX_THREADS_ENV = "RESUME_ANALYZER_ONNX_THREADS"
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+META_FILE = "meta.json"
+
+def default_export_dir(model_name: str) -> str:
+    root = os.environ.get(ONNX_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "resume_analyzer", "onnx")
+    return os.path.join(root, model_name.replace("/", "__"))
+
+def quantize_onnx(model_dir: str) -> str:
+    """Write model_int8.onnx next to model.onnx (dynamic int8 weights, float activations)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    out = os.path.join(model_dir, QUANTIZED_MODEL_FILE)
+    quantize_dynamic(os.path.join(model_dir, MODEL_FILE), out, weight_type=QuantType.QInt8)
+    return out
+
+def export_onnx(model_name: str, out_dir: str, quantize: bool = False, opset: int = 18) -> str:
+    """
+    Export a mean-pooling sentence-transformers model (e.g. all-MiniLM-L6-v2) to out_dir.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer, pooling = st_model[0], st_model[1]
+    # sentence-transformers 3.x flags the mode per attribute; newer releases keep one string
+    mean = getattr(pooling, "pooling_mode_mean_tokens", None) or getattr(pooling, "pooling_mode", None) == "mean"
+    if not mean:
+        raise ValueError(f"{model_name}: only mean-pooling models can be exported")
+    hf_model = getattr(transformer, "auto_model", None) or transformer.model
+    hf_model.eval()
+    tokenizer = transformer.tokenizer
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer.save_pretrained(out_dir)
+    sample = tokenizer(["an export sample", "a second, longer export sample"], padding=True, return_tensors="pt")
+    names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+
+    class _LastHidden(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids=None):
+            kwargs = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if token_type_ids is not None:
+                kwargs["token_type_ids"] = token_type_ids
+            return self.model(**kwargs).last_hidden_state
+
+    axes = {n: {0: "batch", 1: "sequence"} for n in names + ["last_hidden_state"]}
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHidden(hf_model), tuple(sample[n] for n in names), os.path.join(out_dir, MODEL_FILE),
+            input_names=names, output_names=["last_hidden_state"], dynamic_axes=axes, opset_version=opset,
+        )
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "model_name": model_name,
+            "max_seq_length": int(st_model.max_seq_length),
+            "dim": int(hf_model.config.hidden_size),  # mean pooling keeps the hidden size
+        }, f)
+    if quantize:
+        quantize_onnx(out_dir)
+    return out_dir
+
+class OnnxEncoder:
+    """
+    Drop-in for SentenceTransformer.encode backed by an onnxruntime session.
+    """
+    def __init__(self, model_dir: str, quantized: bool = False, threads: Optional[int] = None,
+                 batch_size: int = 32):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.max_seq_length = meta["max_seq_length"]
+        self.dim = meta["dim"]
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        path = os.path.join(model_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self._inputs = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = True,
+               batch_size: Optional[int] = None) -> np.ndarray:
+        batch_size = batch_size or self.batch_size
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            enc = self.tokenizer(list(texts[start:start + batch_size]), padding=True, truncation=True,
+                                 max_length=self.max_seq_length, return_tensors="np")
+            hidden = self.session.run(None, {n: enc[n].astype(np.int64) for n in self._inputs})[0]
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            emb = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            if normalize_embeddings:
+                emb /= np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+            out[start:start + len(emb)] = emb
+        return out
+
+def load_onnx_encoder(model_name: str, quantized: bool = False, model_dir: Optional[str] = None) -> OnnxEncoder:
+    """
+    Load the exported model for model_name, exporting (and quantizing) it on first use.
+    """
+    model_dir = model_dir or default_export_dir(model_name)
+    if not os.path.exists(os.path.join(model_dir, MODEL_FILE)):
+        export_onnx(model_name, model_dir)
+    if quantized and not os.path.exists(os.path.join(model_dir, QUANTIZED_MODEL_FILE)):
+        quantize_onnx(model_dir)
+    threads = os.environ.get(ONNX_THREADS_ENV)
+    return OnnxEncoder(model_dir, quantized=quantized, threads=int(threads) if threads else None)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m src.onnx_backend", description="Export embedding models to ONNX.")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export", help="Export a sentence-transformers model")
+    exp.add_argument("model")
+    exp.add_argument("out_dir", nargs="?", default=None, help="Default: the cache dir the onnx backend reads")
+    exp.add_argument("--quantize", action="store_true", help="Also write a dynamically quantized int8 model")
+    args = p.parse_args(argv)
+
+    out = export_onnx(args.model, args.out_dir or default_export_dir(args.model), quantize=args.quantize)
+    print(out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+from typing import Iterator, Optional
 
-import fitz  # PyMuPDF
+from src.instrumentation import instrumented, stage
+from src.layout import DocumentLayout, page_text_lines
+from src.streaming import iter_clean_lines
 
 
+def _fitz():
+    """Return PyMuPDF, importing it on first use (it is slow to import and only PDFs need it).
+
+    The module is cached as the global `fitz`, so `src.parsing.fitz` can still be monkeypatched.
+    """
+    if "fitz" not in globals():
+        import fitz as module
+        globals()["fitz"] = module
+    return globals()["fitz"]
+
+
+def __getattr__(name: str):
+    if name == "fitz":
+        return _fitz()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@instrumented("clean_text", lambda out, *a, **k: {"chars": len(out)})
 def clean_text(text: str) -> str:
     """Normalize text for analysis:
 
@@ -47,12 +67,48 @@ def read_text_input(value: Optional[str]) -> str:
     return clean_text(value)
 
 
-def extract_text_from_pdf(stream: bytes) -> str:
+def iter_pdf_pages(stream: bytes, max_pages: Optional[int] = None,
+                   layout: Optional[DocumentLayout] = None) -> Iterator[str]:
+    """Yield the raw text of each PDF page as it is extracted, stopping after `max_pages`.
+
+    With a `layout`, pages are read with get_text("dict") instead: reading order is
+    rebuilt for multi-column pages and each page's layout is added to `layout`.
+    """
+    doc = _fitz().open(stream=stream, filetype="pdf")
+    try:
+        for i, page in enumerate(doc):
+            if max_pages is not None and i >= max_pages:
+                break
+            if layout is None:
+                yield page.get_text("text")
+            else:
+                yield "\n".join(page_text_lines(page.get_text("dict"), layout))
+    finally:
+        close = getattr(doc, "close", None)
+        if close is not None:
+            close()
+
+
+def extract_text_from_pdf(stream: bytes, layout: Optional[DocumentLayout] = None) -> str:
     """Extract text from a PDF byte stream and clean it.
 
     Uses `fitz.open(stream=..., filetype='pdf')` so tests can monkeypatch `fitz.open`.
+    Pass an empty DocumentLayout to use layout mode (see iter_pdf_pages); it is
+    filled in with the document's columns, tables, images and fonts.
     """
-    doc = fitz.open(stream=stream, filetype="pdf")
-    pages = [page.get_text("text") for page in doc]
-    combined = "\n".join(pages)
-    return clean_text(combined)
+    with stage("parse_pdf", bytes=len(stream)) as st:
+        pages = 0
+
+        def pieces():
+            nonlocal pages
+            for i, page in enumerate(iter_pdf_pages(stream, layout=layout)):
+                pages += 1
+                if i:
+                    yield "\n"
+                yield page
+
+        # Same result as clean_text("\n".join(pages)), one line at a time
+        text = "\n".join(iter_clean_lines(pieces()))
+        if st:
+            st.add(pages=pages)
+        return text
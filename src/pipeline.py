@@ -0,0 +1,103 @@
+# src/pipeline.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from src.chunking import split_into_sections, bulletize
+from src.instrumentation import instrumented, stage
+from src.scoring import compute_section_score, weighted_overall, match_jd_to_resume
+from src.streaming import iter_clean_lines, iter_jd_chunks, stream_resume_chunks
+
+# Bump when chunking or scoring changes in a way that alters results (invalidates stored results)
+PIPELINE_VERSION = "2"
+
+# Scored resume sections and the headers that feed each of them
+SECTION_HEADERS = {
+    "skills": ("skills", "technical skills"),
+    "experience": ("experience", "work experience"),
+    "projects": ("projects", "project experience"),
+}
+
+@dataclass
+class Analysis:
+    jd_chunks: List[str]
+    resume_chunks: Dict[str, List[str]]   # skills/experience/projects/full
+    section_scores: Dict[str, float]
+    overall_100: float
+    jd_to_best: List[Tuple[str, str, float]]
+
+def resume_section_chunks(resume_text: str) -> Dict[str, List[str]]:
+    """
+    Bullet chunks per scored section, falling back to the full resume bullets
+    for any section that is missing. Always includes a 'full' entry.
+    """
+    sections = split_into_sections(resume_text)
+    full_chunks = bulletize(sections.get("full", resume_text))
+
+    out: Dict[str, List[str]] = {}
+    for name, headers in SECTION_HEADERS.items():
+        text = ""
+        for h in headers:
+            text = text or sections.get(h, "")
+        chunks = bulletize(text) if text else []
+        out[name] = chunks or full_chunks
+    out["full"] = full_chunks
+    return out
+
+@instrumented("embed_groups", lambda out, *a, **k: {"chunks": sum(len(e) for e in out.values())})
+def embed_groups(embedder, groups: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+    """
+    Embed several chunk lists with a single embed call.
+    Identical chunks (e.g. sections that fell back to the full resume) are encoded once
+    and the resulting matrix is sliced back into one array per group.
+    """
+    unique = list(dict.fromkeys(c for chunks in groups.values() for c in chunks))
+    emb = embedder.embed(unique)
+    index = {c: i for i, c in enumerate(unique)}
+    return {
+        name: emb[np.array([index[c] for c in chunks], dtype=np.intp)]
+        for name, chunks in groups.items()
+    }
+
+def score_resume(jd_chunks: List[str], jd_emb: np.ndarray,
+                 resume_chunks: Dict[str, List[str]], resume_embs: Dict[str, np.ndarray],
+                 match_limit: Optional[int] = None) -> Analysis:
+    """
+    Score already-embedded resume sections against already-embedded JD chunks.
+    With `match_limit`, jd_to_best holds only that many weakest JD chunks.
+    """
+    section_scores = {
+        name: compute_section_score(jd_emb, resume_embs[name]) for name in SECTION_HEADERS
+    }
+    overall = weighted_overall(section_scores)
+
+    # Best matches use the full resume chunks
+    jd_to_best = match_jd_to_resume(jd_chunks, jd_emb, resume_chunks["full"], resume_embs["full"],
+                                    limit=match_limit)
+
+    return Analysis(
+        jd_chunks=jd_chunks,
+        resume_chunks=resume_chunks,
+        section_scores=section_scores,
+        overall_100=round(overall * 100, 1),
+        jd_to_best=jd_to_best,
+    )
+
+@instrumented("analyze")
+def analyze(resume_text: str, jd_text: str, embedder) -> Analysis:
+    """
+    Chunk, embed (one batched pass) and score a resume against a job description.
+    Both texts are cleaned (clean_text) as they are chunked, line by line.
+    """
+    with stage("chunk_job_description") as st:
+        jd_chunks = list(iter_jd_chunks(iter_clean_lines(jd_text)))
+        if st:
+            st.add(chunks=len(jd_chunks))
+    with stage("resume_section_chunks") as st:
+        resume_chunks = stream_resume_chunks(resume_text)
+        if st:
+            st.add(chunks=len(resume_chunks["full"]))
+
+    embs = embed_groups(embedder, {"jd": jd_chunks, **resume_chunks})
+    return score_resume(jd_chunks, embs["jd"], resume_chunks, embs)
@@ -0,0 +1,63 @@
+# src/quantization.py
+"""
+Compact storage for embedding matrices.
+
+float16 halves memory (768 B per 384-d vector); int8 with one float32 scale per
+vector quarters it (388 B). Scoring on these matrices lives in src/scoring.py.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+
+DTYPES = ("float16", "int8")
+
+@dataclass
+class QuantizedMatrix:
+    codes: np.ndarray                     # (n, d) float16 or int8
+    scales: Optional[np.ndarray] = None   # (n,) float32, int8 only: row = codes * scale
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def size(self) -> int:
+        return self.codes.size
+
+    @property
+    def dtype(self) -> str:
+        return self.codes.dtype.name
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def rows(self, start: int, stop: int) -> "QuantizedMatrix":
+        return QuantizedMatrix(self.codes[start:stop], None if self.scales is None else self.scales[start:stop])
+
+    def dequantize(self) -> np.ndarray:
+        x = self.codes.astype(np.float32)
+        if self.scales is not None:
+            x *= self.scales[:, None]
+        return x
+
+def quantize(emb: np.ndarray, dtype: str = "int8") -> QuantizedMatrix:
+    """
+    Quantize a float matrix row-wise. int8 uses a symmetric per-vector scale
+    (max |x| maps to 127), so each row keeps its own dynamic range.
+    """
+    emb = np.asarray(emb, dtype=np.float32)
+    if emb.ndim != 2:
+        raise ValueError("expected a 2-D embedding matrix")
+    if dtype == "float16":
+        return QuantizedMatrix(emb.astype(np.float16))
+    if dtype == "int8":
+        peak = np.abs(emb).max(axis=1) if emb.shape[0] else np.zeros(0, dtype=np.float32)
+        scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(emb / scales[:, None]), -127, 127).astype(np.int8)
+        return QuantizedMatrix(codes, scales)
+    raise ValueError(f"unknown dtype {dtype!r}; expected one of {DTYPES}")
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import asdict
 from typing import Any, Dict, List, Tuple
 
+# Weakest JD items shown in a report; scoring only needs to rank this many
+REPORT_MATCHES = 12
+
 def build_report(
     overall_100: float,
     section_scores: Dict[str, float],
@@ -14,7 +17,7 @@ def build_report(
         "section_scores_0_1": section_scores,
         "weakest_jd_items": [
             {"jd_requirement": jd, "closest_resume_bullet": rb, "score_0_1": s}
-            for jd, rb, s in jd_to_best[:12]
+            for jd, rb, s in jd_to_best[:REPORT_MATCHES]
         ],
         "missing_skills": missing_skills,
     }
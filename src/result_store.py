@@ -0,0 +1,163 @@
+# src/result_store.py
+"""
+Persistent store of finished analyses, so re-opened or re-uploaded resume/JD pairs
+come back without running the pipeline.
+
+Entries are keyed by (resume text hash, JD text hash, model name, config fingerprint).
+The fingerprint covers PIPELINE_VERSION, the scoring weights and the taxonomy version,
+so changing any of them makes older entries unreachable; they are purged on open and
+otherwise age out through the size-bounded LRU eviction.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.ats import ats_checks
+from src.pipeline import PIPELINE_VERSION, Analysis, analyze
+from src.reporting import build_report
+from src.scoring import SECTION_WEIGHTS
+from src.skills import categorize_missing, extract_skills
+from src.suggestions import generate_suggestions
+from src.taxonomy import Taxonomy, get_taxonomy
+
+# Set to a file path to enable the store (batch CLI and HTTP service)
+RESULT_STORE_ENV = "RESUME_ANALYZER_RESULT_STORE"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+def config_fingerprint(taxonomy: Optional[Taxonomy] = None) -> str:
+    """Hash of everything besides the inputs and model that changes a result."""
+    tax = taxonomy or get_taxonomy()
+    config = {"pipeline": PIPELINE_VERSION, "weights": SECTION_WEIGHTS, "taxonomy": tax.version}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def result_payload(analysis: Analysis, resume_text: str, missing: Dict[str, Any],
+                   n_suggestions: int = 6) -> Dict[str, Any]:
+    """What the store keeps for one pair: the report, suggestions and ATS checks."""
+    return {
+        "report": build_report(analysis.overall_100, analysis.section_scores, analysis.jd_to_best, missing),
+        "suggestions": generate_suggestions(analysis.jd_to_best, n=n_suggestions),
+        "ats": ats_checks(resume_text),
+    }
+
+@dataclass
+class StoreStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+class ResultStore:
+    """
+    SQLite-backed result store holding at most `max_bytes` of JSON payloads;
+    the least recently read entries are evicted first.
+    """
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = StoreStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " resume_hash TEXT NOT NULL, jd_hash TEXT NOT NULL, model TEXT NOT NULL, fingerprint TEXT NOT NULL,"
+            " payload TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL,"
+            " PRIMARY KEY (resume_hash, jd_hash, model, fingerprint))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_access)")
+        self._conn.commit()
+        self.purge_stale()
+
+    def get(self, resume_text: str, jd_text: str, model_name: str) -> Optional[Dict[str, Any]]:
+        key = (text_hash(resume_text), text_hash(jd_text), model_name, config_fingerprint())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results WHERE resume_hash=? AND jd_hash=? AND model=? AND fingerprint=?", key
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE results SET last_access=? WHERE resume_hash=? AND jd_hash=? AND model=? AND fingerprint=?",
+                (time.time(), *key),
+            )
+            self._conn.commit()
+            self.stats.hits += 1
+        return json.loads(row[0])
+
+    def put(self, resume_text: str, jd_text: str, model_name: str, result: Dict[str, Any]) -> None:
+        payload = json.dumps(result)
+        key = (text_hash(resume_text), text_hash(jd_text), model_name, config_fingerprint())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, payload, len(payload), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT rowid, size FROM results ORDER BY last_access").fetchall()
+        doomed = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE rowid=?", doomed)
+        self.stats.evictions += len(doomed)
+
+    def purge_stale(self) -> int:
+        """Drop entries written under a different config fingerprint; returns how many."""
+        with self._lock:
+            n = self._conn.execute("DELETE FROM results WHERE fingerprint != ?", (config_fingerprint(),)).rowcount
+            self._conn.commit()
+        return n
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def cached_result(store: Optional[ResultStore], resume_text: str, jd_text: str, embedder,
+                  model_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Stored result for the pair, or run the pipeline and store it.
+    """
+    model_name = model_name if model_name is not None else getattr(embedder, "model_name", "")
+    if store is not None:
+        hit = store.get(resume_text, jd_text, model_name)
+        if hit is not None:
+            return hit
+    analysis = analyze(resume_text, jd_text, embedder)
+    missing = categorize_missing(extract_skills(jd_text) - extract_skills(resume_text))
+    result = result_payload(analysis, resume_text, missing)
+    if store is not None:
+        store.put(resume_text, jd_text, model_name, result)
+    return result
+
+_DEFAULT_STORE: Optional[ResultStore] = None
+_DEFAULT_LOCK = threading.Lock()
+
+def default_store() -> Optional[ResultStore]:
+    """Process-wide store at $RESUME_ANALYZER_RESULT_STORE, or None when unset."""
+    global _DEFAULT_STORE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_STORE is None:
+            path = os.environ.get(RESULT_STORE_ENV)
+            if path:
+                _DEFAULT_STORE = ResultStore(path)
+        return _DEFAULT_STORE
@@ -0,0 +1,326 @@
+# src/resume_index.py
+"""
+Approximate nearest-neighbour index over resume bullet embeddings.
+
+IVF (inverted file) layout in plain numpy: bullets are bucketed under the nearest
+of `n_lists` spherical k-means centroids. A query probes the `nprobe` closest
+buckets for each JD chunk, scores candidate resumes by max-sim per chunk, and
+reranks the best `k * rerank_factor` of them exactly with compute_section_score.
+"""
+from __future__ import annotations
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from src.scoring import compute_section_score, score_many, stack_embeddings
+from src.shared_vectors import SharedMatrix
+
+@dataclass
+class SearchHit:
+    resume_id: str
+    score: float
+
+def _kmeans(x: np.ndarray, k: int, n_iter: int = 10, seed: int = 0) -> np.ndarray:
+    # Spherical k-means: centroids stay unit length so assignment is a dot product
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(x.shape[0], size=k, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = _nearest(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Re-seed empty clusters with random points
+        sums[empty] = x[rng.choice(x.shape[0], size=int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+def _nearest(x: np.ndarray, centroids: np.ndarray, block: int = 8192) -> np.ndarray:
+    out = np.empty(x.shape[0], dtype=np.int64)
+    for i in range(0, x.shape[0], block):
+        out[i:i + block] = (x[i:i + block] @ centroids.T).argmax(axis=1)
+    return out
+
+class ResumeIndex:
+    def __init__(self, dim: int = 384, n_lists: int = 64, nprobe: int = 8, rerank_factor: int = 4):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.rerank_factor = rerank_factor
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._owner = np.zeros(0, dtype=np.int64)    # slot of the resume owning each row
+        self._alive = np.zeros(0, dtype=bool)
+        self._assign = np.zeros(0, dtype=np.int64)   # IVF list of each row (-1 until trained)
+        self._centroids: Optional[np.ndarray] = None
+        self._pending: List[np.ndarray] = []
+        self._n_flushed = 0                          # slots whose rows are in _vectors
+
+        self._ids: List[str] = []                    # slot -> resume id
+        self._slots: Dict[str, int] = {}             # live resume id -> slot
+        self._ranges: List[Tuple[int, int]] = []     # slot -> row range
+        self._lists: Optional[List[np.ndarray]] = None
+        self._shared: Optional[SharedMatrix] = None  # set by share()
+
+    # ---- building -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._slots
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, resume_id: str, emb: np.ndarray) -> None:
+        """Add (or replace) a resume's bullet embeddings, shape (n_bullets, dim), L2-normalized."""
+        if resume_id in self._slots:
+            self.delete(resume_id)
+        emb = np.asarray(emb, dtype=np.float32).reshape(-1, self.dim)
+        # Rows stay pending until the next read, so building the index is linear
+        start = self._vectors.shape[0] + sum(p.shape[0] for p in self._pending)
+        slot = len(self._ids)
+        self._ids.append(resume_id)
+        self._slots[resume_id] = slot
+        self._ranges.append((start, start + emb.shape[0]))
+        self._pending.append(emb)
+
+    def delete(self, resume_id: str) -> bool:
+        slot = self._slots.pop(resume_id, None)
+        if slot is None:
+            return False
+        self._flush()
+        a, b = self._ranges[slot]
+        self._alive[a:b] = False
+        self._lists = None
+        return True
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        new = np.concatenate(self._pending)
+        self._pending = []
+        owners = []
+        for slot in range(self._n_flushed, len(self._ids)):
+            a, b = self._ranges[slot]
+            owners.append(np.full(b - a, slot, dtype=np.int64))
+        self._vectors = np.concatenate([self._vectors, new])
+        self._unshare()
+        self._owner = np.concatenate([self._owner, *owners])
+        self._n_flushed = len(self._ids)
+        self._alive = np.concatenate([self._alive, np.ones(new.shape[0], dtype=bool)])
+        assign = _nearest(new, self._centroids) if self.trained else np.full(new.shape[0], -1, dtype=np.int64)
+        self._assign = np.concatenate([self._assign, assign])
+        self._lists = None
+
+    def train(self, n_iter: int = 10, sample_size: int = 50_000, seed: int = 0) -> None:
+        """Fit the IVF centroids on (a sample of) the live bullets and bucket every row."""
+        self._flush()
+        live = np.flatnonzero(self._alive)
+        if live.size == 0:
+            return
+        rng = np.random.default_rng(seed)
+        if live.size > sample_size:
+            live = rng.choice(live, size=sample_size, replace=False)
+        k = min(self.n_lists, live.size)
+        self._centroids = _kmeans(self._vectors[live], k, n_iter=n_iter, seed=seed)
+        self._assign = _nearest(self._vectors, self._centroids)
+        self._lists = None
+
+    def compact(self) -> None:
+        """Drop deleted rows for good (deletes are tombstones until then)."""
+        self._flush()
+        live = sorted(self._slots.values())
+        ids = [self._ids[s] for s in live]
+        lengths = np.array([b - a for a, b in (self._ranges[s] for s in live)], dtype=np.int64)
+        rows = np.concatenate([np.arange(*self._ranges[s]) for s in live]) if live else np.zeros(0, dtype=np.int64)
+        vectors, assign, centroids = self._vectors[rows], self._assign[rows], self._centroids
+        self._unshare()
+        self.__init__(self.dim, self.n_lists, self.nprobe, self.rerank_factor)
+        ends = np.cumsum(lengths)
+        self._vectors = vectors
+        self._owner = np.repeat(np.arange(len(ids), dtype=np.int64), lengths)
+        self._alive = np.ones(len(rows), dtype=bool)
+        self._assign = assign
+        self._centroids = centroids
+        self._ids = ids
+        self._slots = {rid: slot for slot, rid in enumerate(ids)}
+        self._ranges = [(int(e - n), int(e)) for e, n in zip(ends, lengths)]
+        self._n_flushed = len(ids)
+
+    def embeddings(self, resume_id: str) -> np.ndarray:
+        self._flush()
+        a, b = self._ranges[self._slots[resume_id]]
+        return self._vectors[a:b]
+
+    # ---- sharing with worker processes -----------------------------------
+
+    def share(self) -> None:
+        """
+        Move the bullet vectors into shared memory. Pickled copies of the index (e.g.
+        sent to pool workers) then attach to that block instead of carrying the matrix,
+        and searches in every process read it in place. This process owns the block:
+        adding resumes afterwards goes back to a private matrix (call share() again),
+        and close() frees it.
+        """
+        self._flush()
+        if self._shared is None:
+            self._shared = SharedMatrix.publish(self._vectors)
+            self._vectors = self._shared.array
+
+    def _unshare(self) -> None:
+        if self._shared is not None:
+            if self._vectors is self._shared.array:
+                self._vectors = np.array(self._vectors)
+            if self._shared.owner:
+                self._shared.unlink()
+            self._shared = None
+
+    def close(self) -> None:
+        """Release shared memory held by (or attached to) this index."""
+        if self._shared is not None:
+            shared, self._shared = self._shared, None
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            if shared.owner:
+                shared.unlink()
+            else:
+                shared.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._shared is not None:
+            state["_vectors"] = None   # the SharedMatrix pickles as a handle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._shared is not None:
+            self._vectors = self._shared.array
+
+    # ---- querying -------------------------------------------------------
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            live = np.flatnonzero(self._alive)
+            order = live[np.argsort(self._assign[live], kind="stable")]
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        return self._lists
+
+    def _candidate_rows(self, jd_emb: np.ndarray, nprobe: int) -> np.ndarray:
+        if not self.trained:
+            return np.flatnonzero(self._alive)
+        lists = self._inverted_lists()
+        nprobe = min(nprobe, len(lists))
+        probes = np.argpartition(-(jd_emb @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        probed = np.unique(probes)
+        if probed.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([lists[i] for i in probed])
+
+    def search(self, jd_emb: np.ndarray, k: int = 10, nprobe: Optional[int] = None,
+               rerank_factor: Optional[int] = None) -> List[SearchHit]:
+        """
+        Top-k resumes for the JD chunk embeddings, best first.
+        Higher nprobe / rerank_factor trade latency for recall.
+        """
+        self._flush()
+        jd_emb = np.asarray(jd_emb, dtype=np.float32)
+        if jd_emb.shape[0] == 0 or not self._slots:
+            return []
+        rows = self._candidate_rows(jd_emb, nprobe or self.nprobe)
+        if rows.size == 0:
+            return []
+
+        # Approximate score: max-sim per JD chunk over the probed bullets of each resume
+        rows = rows[np.argsort(self._owner[rows], kind="stable")]
+        owners = self._owner[rows]
+        seg_starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+        sim = jd_emb @ self._vectors[rows].T
+        approx = np.maximum.reduceat(sim, seg_starts, axis=1).mean(axis=0)
+        slots = owners[seg_starts]
+
+        n_cand = min(len(slots), k * (rerank_factor or self.rerank_factor))
+        cand = np.argpartition(-approx, n_cand - 1)[:n_cand]
+
+        # Exact rerank with the regular scoring path
+        hits = []
+        for slot in slots[cand]:
+            a, b = self._ranges[slot]
+            hits.append(SearchHit(self._ids[slot], compute_section_score(jd_emb, self._vectors[a:b])))
+        hits.sort(key=lambda h: -h.score)
+        return hits[:k]
+
+    def brute_force(self, jd_emb: np.ndarray, k: int = 10) -> List[SearchHit]:
+        """Exact top-k over every live resume (the reference path for benchmarks)."""
+        self._flush()
+        ids = [self._ids[s] for s in sorted(self._slots.values())]
+        if not ids or np.asarray(jd_emb).shape[0] == 0:
+            return []
+        res_emb, res_off = stack_embeddings([self.embeddings(i) for i in ids])
+        jd_off = np.array([0, jd_emb.shape[0]])
+        scores = score_many(np.asarray(jd_emb, dtype=np.float32), jd_off, res_emb, res_off).scores[0]
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [SearchHit(ids[i], float(scores[i])) for i in order]
+
+    # ---- persistence ----------------------------------------------------
+
+    def save(self, path: str) -> None:
+        self._flush()
+        meta = {
+            "dim": self.dim, "n_lists": self.n_lists, "nprobe": self.nprobe,
+            "rerank_factor": self.rerank_factor, "ids": self._ids,
+            "live": sorted(self._slots.values()), "ranges": self._ranges,
+        }
+        arrays = {
+            "vectors": self._vectors, "owner": self._owner, "alive": self._alive, "assign": self._assign,
+            "meta": np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+        }
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ResumeIndex":
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            idx = cls(meta["dim"], meta["n_lists"], meta["nprobe"], meta["rerank_factor"])
+            idx._vectors = data["vectors"]
+            idx._owner = data["owner"]
+            idx._alive = data["alive"]
+            idx._assign = data["assign"]
+            idx._centroids = data["centroids"] if "centroids" in data else None
+        idx._ids = meta["ids"]
+        idx._ranges = [tuple(r) for r in meta["ranges"]]
+        idx._slots = {idx._ids[s]: s for s in meta["live"]}
+        idx._n_flushed = len(idx._ids)
+        return idx
+
+def compare_with_brute_force(index: ResumeIndex, queries: Sequence[np.ndarray], k: int = 10,
+                             nprobe: Optional[int] = None, rerank_factor: Optional[int] = None) -> Dict[str, float]:
+    """
+    Recall@k of the ANN path against exact search, plus mean latency of each path in ms.
+    """
+    recalls, ann_ms, exact_ms = [], [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        exact = index.brute_force(q, k)
+        t1 = time.perf_counter()
+        approx = index.search(q, k, nprobe=nprobe, rerank_factor=rerank_factor)
+        t2 = time.perf_counter()
+        exact_ms.append((t1 - t0) * 1000)
+        ann_ms.append((t2 - t1) * 1000)
+        truth = {h.resume_id for h in exact}
+        if truth:
+            recalls.append(len(truth & {h.resume_id for h in approx}) / len(truth))
+    return {
+        "recall_at_k": float(np.mean(recalls)) if recalls else 0.0,
+        "ann_ms": float(np.mean(ann_ms)) if ann_ms else 0.0,
+        "brute_force_ms": float(np.mean(exact_ms)) if exact_ms else 0.0,
+    }
@@ -1,9 +1,11 @@
 # src/scoring.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+from src.instrumentation import instrumented
+from src.quantization import QuantizedMatrix
 
 @dataclass
 class MatchResult:
@@ -11,44 +13,277 @@ class MatchResult:
     section_scores: Dict[str, float]
     jd_to_best_resume: List[Tuple[str, str, float]]  # (jd_chunk, best_resume_chunk, score)
 
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise cosine similarity, (n, d) x (m, d) -> (n, m). Zero rows score 0.
+    float32 inputs stay float32; anything else is computed in float64.
+    Inputs are never copied or normalized in place, so they can be read-only views
+    (mmap'd or shared-memory embeddings); only the (n, m) result is allocated.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    dtype = np.float32 if a.dtype == np.float32 and b.dtype == np.float32 else np.float64
+    a, b = a.astype(dtype, copy=False), b.astype(dtype, copy=False)
+    na = np.linalg.norm(a, axis=1)
+    nb = np.linalg.norm(b, axis=1)
+    na[na == 0] = 1.0
+    nb[nb == 0] = 1.0
+    out = a @ b.T
+    out /= na[:, None]
+    out /= nb[None, :]
+    return out
+
 def _score_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     if a.size == 0 or b.size == 0:
         return np.zeros((a.shape[0], b.shape[0]))
+    if isinstance(a, QuantizedMatrix) or isinstance(b, QuantizedMatrix):
+        return quantized_similarity(a, b)
     return cosine_similarity(a, b)
 
+def _float_codes(m) -> np.ndarray:
+    return m.codes.astype(np.float32) if isinstance(m, QuantizedMatrix) else np.asarray(m, dtype=np.float32)
+
+def quantized_similarity(a, b, block_size: int = 4096) -> np.ndarray:
+    """
+    Cosine similarity where either side may be a QuantizedMatrix (float16 or int8).
+
+    Cosine is scale-invariant, so int8 rows are compared on their raw codes and the
+    per-vector scales drop out. Codes are widened to float32 one block of b at a time
+    to use BLAS; for int8 the products are small integers, so every dot product is
+    exact for dims up to ~1000. Zero rows score 0, as with cosine_similarity.
+    """
+    fa = _float_codes(a)
+    na = np.linalg.norm(fa, axis=1)
+    na[na == 0] = 1.0
+    fa = fa / na[:, None]   # new array: `a` may be the caller's (possibly read-only) float32 matrix
+    out = np.empty((fa.shape[0], b.shape[0]), dtype=np.float32)
+    for j in range(0, b.shape[0], block_size):
+        fb = _float_codes(b.rows(j, j + block_size) if isinstance(b, QuantizedMatrix) else b[j:j + block_size])
+        nb = np.linalg.norm(fb, axis=1)
+        nb[nb == 0] = 1.0
+        out[:, j:j + block_size] = (fa @ fb.T) / nb[None, :]
+    return out
+
+# Weights you can tweak (stored results are invalidated when these change)
+SECTION_WEIGHTS = {
+    "skills": 0.40,
+    "experience": 0.40,
+    "projects": 0.20
+}
+
 def weighted_overall(section_scores: Dict[str, float]) -> float:
-    # Weights you can tweak
-    weights = {
-        "skills": 0.40,
-        "experience": 0.40,
-        "projects": 0.20
-    }
     # If sections missing, redistribute to what exists
-    present = {k: v for k, v in weights.items() if k in section_scores}
+    present = {k: v for k, v in SECTION_WEIGHTS.items() if k in section_scores}
     if not present:
         return float(np.mean(list(section_scores.values()))) if section_scores else 0.0
 
     wsum = sum(present.values())
     return sum(section_scores[k] * (present[k] / wsum) for k in present)
 
+# Parameter names match compute_section_score's, so keyword calls are counted too
+@instrumented("compute_section_score",
+              lambda out, jd_emb, resume_emb, *a, **k: {"pairs": jd_emb.shape[0] * resume_emb.shape[0]})
 def compute_section_score(jd_emb: np.ndarray, resume_emb: np.ndarray) -> float:
-    sim = _score_matrix(jd_emb, resume_emb)
+    return section_score_from_sim(_score_matrix(jd_emb, resume_emb))
+
+def section_score_from_sim(sim: np.ndarray) -> float:
     # For each JD chunk, take best matching resume chunk, then average
     if sim.size == 0:
         return 0.0
     best = sim.max(axis=1)
     return float(best.mean())
 
+def top_k_similar(jd_emb: np.ndarray, resume_emb: np.ndarray, k: int = 1,
+                  tile_size: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k most similar resume rows for every JD row: (indices, scores), both (n_jd, k),
+    best first and ties broken by the lower index (k=1 equals a row-wise argmax).
+
+    The resume side is scored tile_size rows at a time and merged into a running
+    top-k with argpartition, so memory is O(n_jd x (k + tile_size)) however many
+    bullets the resume has. k is capped at the number of resume rows.
+    """
+    n, m = jd_emb.shape[0], resume_emb.shape[0]
+    k = min(k, m)
+    idx = np.full((n, k), -1, dtype=np.int64)
+    vals = np.zeros((n, k), dtype=np.float32)
+    if n == 0 or k <= 0:
+        return idx, vals
+    rows = np.arange(n)
+    for j0 in range(0, m, tile_size):
+        j1 = min(j0 + tile_size, m)
+        tile = resume_emb.rows(j0, j1) if isinstance(resume_emb, QuantizedMatrix) else resume_emb[j0:j1]
+        sim = _score_matrix(jd_emb, tile)
+        if j0 == 0:
+            vals = np.full((n, k), -np.inf, dtype=sim.dtype)
+        if k == 1:
+            j = sim.argmax(axis=1)
+            v = sim[rows, j]
+            better = v > vals[:, 0]   # strict: an earlier tile keeps ties
+            vals[better, 0] = v[better]
+            idx[better, 0] = j[better] + j0
+            continue
+        cand_v = np.concatenate([vals, sim], axis=1)
+        cand_i = np.concatenate([idx, np.broadcast_to(np.arange(j0, j1), sim.shape)], axis=1)
+        kth = np.take_along_axis(cand_v, np.argpartition(-cand_v, k - 1, axis=1)[:, k - 1:k], axis=1)
+        # Everything above the k-th score is in; ties for the last places go to the lowest
+        # indices (candidate columns are in index order). Exactly k columns per row survive.
+        above = cand_v > kth
+        ties = cand_v == kth
+        keep_mask = above | (ties & (np.cumsum(ties, axis=1) <= k - above.sum(axis=1, keepdims=True)))
+        keep = (np.flatnonzero(keep_mask) % cand_v.shape[1]).reshape(n, k)
+        vals = np.take_along_axis(cand_v, keep, axis=1)
+        idx = np.take_along_axis(cand_i, keep, axis=1)
+    if k > 1:
+        order = np.lexsort((idx, -vals))
+        vals = np.take_along_axis(vals, order, axis=1)
+        idx = np.take_along_axis(idx, order, axis=1)
+    return idx, vals
+
+def weakest_first(scores: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """
+    Positions of the `limit` lowest scores, ascending, equal scores in input order;
+    the same as a stable argsort cut at `limit`, without sorting the rest.
+    """
+    scores = np.asarray(scores)
+    if limit is None or limit >= scores.size:
+        return np.argsort(scores, kind="stable")
+    if limit <= 0:
+        return np.zeros(0, dtype=np.intp)
+    kth = scores[np.argpartition(scores, limit - 1)[:limit]].max()
+    sel = np.concatenate([np.flatnonzero(scores < kth), np.flatnonzero(scores == kth)])[:limit]
+    return sel[np.argsort(scores[sel], kind="stable")]
+
+@instrumented("match_jd_to_resume", lambda out, *a, **k: {"jd_chunks": len(out)})
 def match_jd_to_resume(jd_chunks: List[str], jd_emb: np.ndarray,
-                       resume_chunks: List[str], resume_emb: np.ndarray) -> List[Tuple[str, str, float]]:
-    sim = _score_matrix(jd_emb, resume_emb)
-    out = []
-    for i, jd in enumerate(jd_chunks):
-        if sim.shape[1] == 0:
-            out.append((jd, "", 0.0))
+                       resume_chunks: List[str], resume_emb: np.ndarray,
+                       limit: Optional[int] = None, tile_size: int = 4096) -> List[Tuple[str, str, float]]:
+    """
+    Best resume chunk per JD chunk, weakest first; with `limit`, only the `limit`
+    weakest JD chunks (the report shows 12) are selected and ordered.
+    """
+    idx, vals = top_k_similar(jd_emb, resume_emb, k=1, tile_size=tile_size)
+    return _weakest_matches(jd_chunks, resume_chunks, idx, vals, limit)
+
+def top_k_matches(jd_chunks: List[str], jd_emb: np.ndarray, resume_chunks: List[str], resume_emb: np.ndarray,
+                  k: int = 3, limit: Optional[int] = None,
+                  tile_size: int = 4096) -> List[Tuple[str, List[Tuple[str, float]]]]:
+    """
+    Like match_jd_to_resume, but with the k closest resume chunks (best first) per JD chunk.
+    """
+    idx, vals = top_k_similar(jd_emb, resume_emb, k=k, tile_size=tile_size)
+    if not resume_chunks:
+        return [(jd, []) for jd in jd_chunks][:limit]
+    order = weakest_first(vals[:, 0], limit)
+    return [(jd_chunks[i], [(resume_chunks[j], float(v)) for j, v in zip(idx[i], vals[i])]) for i in order]
+
+def best_matches_from_sim(jd_chunks: List[str], resume_chunks: List[str], sim: np.ndarray,
+                          limit: Optional[int] = None) -> List[Tuple[str, str, float]]:
+    """Best resume chunk per JD chunk from a (JD x resume) similarity matrix, weakest first."""
+    if sim.shape[1] == 0:
+        return _weakest_matches(jd_chunks, resume_chunks, None, None, limit)
+    idx = sim.argmax(axis=1)
+    return _weakest_matches(jd_chunks, resume_chunks, idx[:, None], sim[np.arange(len(idx)), idx][:, None], limit)
+
+def _weakest_matches(jd_chunks, resume_chunks, idx, vals, limit) -> List[Tuple[str, str, float]]:
+    if not resume_chunks or idx is None:
+        return [(jd, "", 0.0) for jd in jd_chunks][:limit]
+    # Highest mismatch (lowest score) first to show gaps
+    return [(jd_chunks[i], resume_chunks[int(idx[i, 0])], float(vals[i, 0])) for i in weakest_first(vals[:, 0], limit)]
+
+@dataclass
+class ScoreMatrix:
+    scores: np.ndarray      # (M, N) section score of every JD against every resume
+    best_index: np.ndarray  # (total JD chunks, N) row in resume_emb of the best chunk, -1 if none
+
+def stack_embeddings(embs: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack per-document chunk embeddings into one matrix plus an offsets array of
+    length len(embs) + 1; document i owns rows offsets[i]:offsets[i + 1].
+    """
+    offsets = np.zeros(len(embs) + 1, dtype=np.int64)
+    if embs:
+        offsets[1:] = np.cumsum([e.shape[0] for e in embs])
+    dims = {e.shape[1] for e in embs if e.size}
+    dim = dims.pop() if dims else 0
+    nonempty = [e for e in embs if e.shape[0]]
+    stacked = np.concatenate(nonempty).astype(np.float32, copy=False) if nonempty else np.zeros((0, dim), dtype=np.float32)
+    return stacked, offsets
+
+def _resume_groups(resume_offsets: np.ndarray, block_size: int) -> List[Tuple[int, int]]:
+    # Consecutive runs of whole resumes holding at most block_size chunks (at least one resume each)
+    groups = []
+    n = len(resume_offsets) - 1
+    start = 0
+    while start < n:
+        end = start + 1
+        while end < n and resume_offsets[end + 1] - resume_offsets[start] <= block_size:
+            end += 1
+        groups.append((start, end))
+        start = end
+    return groups
+
+@instrumented("score_many", lambda out, *a, **k: {"pairs": out.scores.size})
+def score_many(jd_emb: np.ndarray, jd_offsets: np.ndarray,
+               resume_emb: np.ndarray, resume_offsets: np.ndarray,
+               block_size: int = 4096) -> ScoreMatrix:
+    """
+    Section scores for M job descriptions x N resumes in one vectorized pass.
+
+    Embeddings are stacked chunk matrices (see stack_embeddings) and must be
+    L2-normalized, as Embedder.embed returns them, so similarity is a plain dot
+    product. Same semantics as compute_section_score for every pair: best resume
+    chunk per JD chunk, averaged over the JD's chunks (0.0 when either side is empty).
+    The similarity matrix is only ever materialized block_size x block_size at a time.
+    """
+    jd_offsets = np.asarray(jd_offsets, dtype=np.int64)
+    resume_offsets = np.asarray(resume_offsets, dtype=np.int64)
+    m = len(jd_offsets) - 1
+    n = len(resume_offsets) - 1
+    total_jd = int(jd_offsets[-1]) if m else 0
+
+    if isinstance(jd_emb, QuantizedMatrix):
+        jd_emb = jd_emb.dequantize()
+    best_val = np.zeros((total_jd, n), dtype=np.float32)
+    best_idx = np.full((total_jd, n), -1, dtype=np.int64)
+
+    for g_start, g_end in _resume_groups(resume_offsets, block_size):
+        c0, c1 = int(resume_offsets[g_start]), int(resume_offsets[g_end])
+        lengths = np.diff(resume_offsets[g_start:g_end + 1])
+        nonempty = np.flatnonzero(lengths > 0)
+        if c1 == c0 or total_jd == 0:
             continue
-        j = int(sim[i].argmax())
-        out.append((jd, resume_chunks[j], float(sim[i, j])))
-    # Sort by highest mismatch (lowest score) first to show gaps
-    out.sort(key=lambda x: x[2])
-    return out
+        # Segment starts (relative to the block) for resumes that have chunks
+        seg_starts = (resume_offsets[g_start:g_end] - c0)[nonempty]
+        cols = np.arange(c0, c1, dtype=np.int64)
+        block = resume_emb.rows(c0, c1).dequantize() if isinstance(resume_emb, QuantizedMatrix) else resume_emb[c0:c1]
+
+        for r0 in range(0, total_jd, block_size):
+            r1 = min(r0 + block_size, total_jd)
+            sim = jd_emb[r0:r1] @ block.T
+            seg_max = np.maximum.reduceat(sim, seg_starts, axis=1)
+            # First column reaching the segment max = argmax within each resume
+            hit = sim == np.repeat(seg_max, lengths[nonempty], axis=1)
+            first = np.minimum.reduceat(np.where(hit, cols, np.iinfo(np.int64).max), seg_starts, axis=1)
+            best_val[r0:r1, g_start + nonempty] = seg_max
+            best_idx[r0:r1, g_start + nonempty] = first
+
+    scores = np.zeros((m, n), dtype=np.float32)
+    jd_lengths = np.diff(jd_offsets)
+    jd_nonempty = np.flatnonzero(jd_lengths > 0)
+    if jd_nonempty.size and n:
+        sums = np.add.reduceat(best_val, jd_offsets[:-1][jd_nonempty], axis=0)
+        scores[jd_nonempty] = sums / jd_lengths[jd_nonempty, None]
+    return ScoreMatrix(scores=scores, best_index=best_idx)
+
+def top_matches(scores: np.ndarray, k: int = 10, axis: int = 1) -> np.ndarray:
+    """
+    Indices of the k highest scores along `axis`, best first.
+    axis=1 gives best resumes per JD, axis=0 best JDs per resume (returned row-wise).
+    """
+    s = scores if axis == 1 else scores.T
+    k = min(k, s.shape[1])
+    if k <= 0:
+        return np.zeros((s.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-s, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(s, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
@@ -0,0 +1,304 @@
+# src/service.py
+"""
+Asyncio HTTP scoring service for programmatic (ATS) integrations.
+
+    python -m src.service --port 8080
+
+Endpoints (JSON in, JSON out):
+    GET  /health
+    POST /analyze        {"resume_text": ..., "jd_text": ...}          -> build_report JSON
+    POST /batch-analyze  {"jd_text": ..., "resumes": [{"id", "text"}]} -> {"results": [...]} best first
+    POST /skills         {"resume_text": ..., "jd_text": ...}          -> skills found / missing
+
+Concurrent requests share the model: every embed call goes through a MicroBatcher
+that coalesces pending calls into one encode of up to `max_batch` texts,
+waiting at most `max_wait_ms` for a batch to fill.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from src.batch import ResumeDoc, score_resumes
+from src.parsing import read_text_input
+from src.result_store import ResultStore, cached_result
+from src.skills import categorize_missing, extract_skills
+
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+class MicroBatcher:
+    """
+    Coalesces concurrent embed requests into shared calls to `embed_fn`.
+    Duplicate texts across the coalesced requests are encoded once.
+    """
+    def __init__(self, embed_fn: Callable[[List[str]], np.ndarray], max_batch: int = 64,
+                 max_wait_ms: float = 5.0):
+        self.embed_fn = embed_fn
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.batches = 0
+        self.requests = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # One model call in flight at a time; new requests queue up behind it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return self.embed_fn([])
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            n = len(batch[0][0])
+            deadline = loop.time() + self.max_wait_s
+            while n < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n += len(item[0])
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        unique = list(dict.fromkeys(t for texts, _ in batch for t in texts))
+        self.batches += 1
+        self.requests += len(batch)
+        try:
+            emb = await asyncio.get_running_loop().run_in_executor(self._executor, self.embed_fn, unique)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        index = {t: i for i, t in enumerate(unique)}
+        for texts, fut in batch:
+            if not fut.done():
+                fut.set_result(emb[[index[t] for t in texts]])
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+class _LoopEmbedder:
+    # Synchronous embed() for pipeline code running in worker threads
+    def __init__(self, batcher: MicroBatcher, loop: asyncio.AbstractEventLoop):
+        self.batcher = batcher
+        self.loop = loop
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return asyncio.run_coroutine_threadsafe(self.batcher.embed(list(texts)), self.loop).result()
+
+class BadRequest(Exception):
+    pass
+
+def _text(payload: Dict[str, Any], key: str) -> str:
+    value = payload.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise BadRequest(f"'{key}' must be a non-empty string")
+    return read_text_input(value)
+
+def _optional_text(payload: Dict[str, Any], key: str) -> str:
+    value = payload.get(key)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise BadRequest(f"'{key}' must be a string")
+    return read_text_input(value)
+
+class ScoringService:
+    def __init__(self, embedder, max_batch: int = 64, max_wait_ms: float = 5.0, workers: int = 8,
+                 store: Optional[ResultStore] = None):
+        self.store = store
+        self.model_name = getattr(embedder, "model_name", "")
+        self.batcher = MicroBatcher(embedder.embed, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analyze")
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("POST", "/analyze"): self._analyze,
+            ("POST", "/batch-analyze"): self._batch_analyze,
+            ("POST", "/skills"): self._skills,
+        }
+
+    # ---- endpoint bodies (run in worker threads) -----------------------
+
+    def _health(self, payload, embedder) -> Dict[str, Any]:
+        return {"status": "ok", "batches": self.batcher.batches, "embed_requests": self.batcher.requests}
+
+    def _analyze(self, payload, embedder) -> Dict[str, Any]:
+        resume, jd = _text(payload, "resume_text"), _text(payload, "jd_text")
+        return cached_result(self.store, resume, jd, embedder, model_name=self.model_name)["report"]
+
+    def _batch_analyze(self, payload, embedder) -> Dict[str, Any]:
+        jd = _text(payload, "jd_text")
+        resumes = payload.get("resumes")
+        if not isinstance(resumes, list) or not resumes:
+            raise BadRequest("'resumes' must be a non-empty list of {id, text}")
+        docs = []
+        for i, r in enumerate(resumes):
+            if not isinstance(r, dict) or not isinstance(r.get("text"), str):
+                raise BadRequest(f"resumes[{i}] must be an object with a 'text' string")
+            docs.append(ResumeDoc(str(r.get("id", i)), read_text_input(r["text"])))
+        batch_size = payload.get("batch_size", 32)
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+            raise BadRequest("'batch_size' must be a positive integer")
+        results = list(score_resumes(jd, docs, embedder, batch_size=batch_size,
+                                     store=self.store, model_name=self.model_name))
+        results.sort(key=lambda rec: -rec["report"]["overall_match_score"])
+        return {"results": [{"rank": i + 1, **rec} for i, rec in enumerate(results)]}
+
+    def _skills(self, payload, embedder) -> Dict[str, Any]:
+        resume = _optional_text(payload, "resume_text")
+        jd = _optional_text(payload, "jd_text")
+        if not resume and not jd:
+            raise BadRequest("provide 'resume_text' and/or 'jd_text'")
+        resume_skills = extract_skills(resume)
+        jd_skills = extract_skills(jd)
+        out: Dict[str, Any] = {"resume_skills": sorted(resume_skills), "jd_skills": sorted(jd_skills)}
+        if resume and jd:
+            out["missing_skills"] = categorize_missing(jd_skills - resume_skills)
+        return out
+
+    # ---- dispatch -------------------------------------------------------
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Route one request; returns (HTTP status, JSON-able body)."""
+        route = self._routes.get((method, path.split("?", 1)[0]))
+        if route is None:
+            return 404, {"error": f"no route for {method} {path}"}
+        try:
+            payload = json.loads(body.decode("utf-8")) if body else {}
+        except ValueError:
+            return 400, {"error": "body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        loop = asyncio.get_running_loop()
+        embedder = _LoopEmbedder(self.batcher, loop)
+        try:
+            return 200, await loop.run_in_executor(self._pool, route, payload, embedder)
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await _write_response(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = line.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _write_response(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _write_response(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, out = await self.handle(method.upper(), path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write_response(writer, status, out, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def close(self) -> None:
+        await self.batcher.close()
+        self._pool.shutdown(wait=False)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, body: Dict[str, Any], keep_alive: bool) -> None:
+    data = json.dumps(body).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + data)
+    await writer.drain()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.embeddings import BACKENDS, DEFAULT_MODEL_NAME, get_embedder
+    from src.embedding_cache import CachedEmbedder, default_cache
+    from src.instrumentation import configure_from_env
+    from src.result_store import default_store
+
+    p = argparse.ArgumentParser(prog="python -m src.service", description="Resume/JD scoring HTTP service.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    p.add_argument("--device", default=None)
+    p.add_argument("--backend", default=None, choices=BACKENDS,
+                   help="Inference backend (default: $RESUME_ANALYZER_EMBED_BACKEND or torch)")
+    p.add_argument("--max-batch", type=int, default=64, help="Max texts per coalesced encode call")
+    p.add_argument("--max-wait-ms", type=float, default=5.0, help="Max time a request waits for a batch to fill")
+    p.add_argument("--workers", type=int, default=8, help="Threads for chunking/scoring work")
+    args = p.parse_args(argv)
+
+    configure_from_env()
+    embedder = CachedEmbedder(get_embedder(args.model, device=args.device, backend=args.backend), default_cache())
+    service = ScoringService(embedder, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, workers=args.workers,
+                             store=default_store())
+
+    async def run():
+        server = await service.start(args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
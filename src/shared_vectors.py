@@ -0,0 +1,227 @@
+# src/shared_vectors.py
+"""
+Embedding matrices that several worker processes can read without copying.
+
+MmapVectorStore is a persistent tier for EmbeddingCache backed by an append-only
+file of float32 rows. Every process maps the file read-only and gets numpy views
+straight into the page cache; one process (the loader) owns writes.
+
+SharedMatrix puts an in-memory matrix (e.g. a ResumeIndex's bullet vectors) into
+multiprocessing.shared_memory; pickling it sends only the block's name, so pool
+workers attach to the same memory instead of receiving a copy.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+MAGIC = b"RAVECS02"
+_HEADER = struct.Struct("<8sIIQQ")  # magic, dim, reserved, committed row count, committed .keys bytes
+HEADER_SIZE = 64                    # rows start here (keeps them 64-byte aligned)
+_PUBLISHED: set = set()             # shared-memory blocks this process created
+
+def _try_lock(path: str):
+    """Exclusive non-blocking lock on `path`; the open file on success, else None."""
+    try:
+        import fcntl
+    except ImportError:  # no flock (Windows): nobody is elected; pass writer=True to the loader
+        return None
+    f = open(path, "a")
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+class MmapVectorStore:
+    """
+    Append-only vector file plus a `.keys` sidecar (one key per line, in row order).
+
+    The header's row count and key-file length are written last, together, so readers
+    never see a row whose key or data is incomplete, and a writer that crashed midway
+    leaves nothing behind: rows and key lines past the committed ones are overwritten
+    (the key file is truncated back when a writer opens it). Readers pick up rows
+    appended later on their next miss. With writer=None the first process to open the
+    file becomes the writer (an flock on `<path>.lock`, where available); the others
+    open it read-only and put_many() is a no-op.
+    """
+    def __init__(self, path: str, writer: Optional[bool] = None):
+        self.path = path
+        self._keys_path = path + ".keys"
+        self._lock = threading.Lock()
+        self._writer_lock = None
+        if writer is None:
+            self._writer_lock = _try_lock(path + ".lock")
+            writer = self._writer_lock is not None
+        self.writer = writer
+        if writer and not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, 0, 0, 0, 0).ljust(HEADER_SIZE, b"\0"))
+            open(self._keys_path, "wb").close()
+
+        self.dim = 0
+        self._count = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._rows: Dict[str, int] = {}
+        self._keys_offset = 0
+        with self._lock:
+            if writer:
+                # Drop key lines a crashed writer appended but never committed
+                with open(self._keys_path, "ab") as kf:
+                    kf.truncate(self._committed()[2])
+            self._refresh()
+
+    def _committed(self) -> Tuple[int, int, int]:
+        """(dim, row count, key-file bytes) from the header."""
+        if self._mm is not None:
+            magic, dim, _, count, key_bytes = _HEADER.unpack_from(self._mm, 0)
+        else:
+            try:
+                with open(self.path, "rb") as f:
+                    head = f.read(_HEADER.size)
+            except FileNotFoundError:
+                return 0, 0, 0
+            if len(head) < _HEADER.size:
+                return 0, 0, 0
+            magic, dim, _, count, key_bytes = _HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a vector store file")
+        return dim, count, key_bytes
+
+    def _refresh(self) -> None:
+        """Map rows committed since the last look (caller holds the lock)."""
+        dim, count, key_bytes = self._committed()
+        if count == self._count:
+            return
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.dim = dim
+        self._matrix = np.frombuffer(self._mm, dtype=np.float32, count=count * dim,
+                                     offset=HEADER_SIZE).reshape(count, dim)
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            new = f.read(key_bytes - self._keys_offset).split(b"\n")[:-1]
+        if len(new) != count - self._count:
+            raise ValueError(f"{self._keys_path} does not match {self.path}")
+        for key in new:
+            self._rows[key.decode("utf-8")] = len(self._rows)
+        self._keys_offset = key_bytes
+        self._count = count
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Zero-copy (read-only) row views for the keys present in the file."""
+        with self._lock:
+            if any(k not in self._rows for k in keys):
+                self._refresh()
+            return {k: self._matrix[self._rows[k]] for k in keys if k in self._rows}
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items or not self.writer:
+            return
+        with self._lock:
+            self._refresh()
+            new = {k: v for k, v in items.items() if k not in self._rows}
+            if not new:
+                return
+            data = np.stack([np.asarray(v, dtype=np.float32).ravel() for v in new.values()])
+            dim = self.dim or data.shape[1]
+            if data.shape[1] != dim:
+                raise ValueError(f"vectors have dim {data.shape[1]}, store has {dim}")
+            count = self._count + data.shape[0]
+            keys = b"".join(k.encode("utf-8") + b"\n" for k in new)
+            with open(self.path, "r+b") as f:
+                f.seek(HEADER_SIZE + self._count * dim * 4)
+                f.write(np.ascontiguousarray(data).tobytes())
+                with open(self._keys_path, "r+b") as kf:
+                    kf.seek(self._keys_offset)   # over anything uncommitted
+                    kf.write(keys)
+                    kf.truncate()
+                f.flush()
+                # Commit: readers trust only the first `count` rows and their key lines
+                f.seek(0)
+                f.write(_HEADER.pack(MAGIC, dim, 0, count, self._keys_offset + len(keys)))
+            self._refresh()
+
+    def matrix(self) -> np.ndarray:
+        """Every committed row, as one read-only (n, dim) view."""
+        with self._lock:
+            self._refresh()
+            return self._matrix
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._count
+
+    def close(self) -> None:
+        # Views handed out keep the mapping alive; just drop our references
+        with self._lock:
+            self._mm = None
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            if self._writer_lock is not None:
+                self._writer_lock.close()
+                self._writer_lock = None
+
+class SharedMatrix:
+    """
+    A numpy array in a named shared-memory block.
+
+    publish() copies an array in once and owns the block (call unlink() when done);
+    unpickling or attach() maps the same block read-only in another process.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str, owner: bool):
+        self._shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        if not owner:
+            self.array.flags.writeable = False
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def publish(cls, array: np.ndarray, name: Optional[str] = None) -> "SharedMatrix":
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1), name=name)
+        _PUBLISHED.add(shm.name)
+        out = cls(shm, array.shape, array.dtype.str, owner=True)
+        out.array[...] = array
+        return out
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, ...], dtype: str) -> "SharedMatrix":
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _PUBLISHED:
+            try:
+                # Attaching processes must not unlink the block when they exit
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls(shm, shape, dtype, owner=False)
+
+    def __reduce__(self):
+        return (SharedMatrix.attach, (self.name, self.shape, self.dtype))
+
+    def close(self) -> None:
+        self.array = None
+        try:
+            self._shm.close()
+        except BufferError:  # views still in use; the mapping goes away with them
+            pass
+
+    def unlink(self) -> None:
+        """Free the block (owner only); attached processes keep their mapping until they close."""
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+            _PUBLISHED.discard(self.name)
@@ -0,0 +1,99 @@
+# src/skill_matcher.py
+from __future__ import annotations
+import bisect
+import re
+from itertools import accumulate
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+_WORD = re.compile(r"\w")
+
+def skill_key(skill: str) -> str:
+    return re.sub(r"\s+", " ", skill.strip().lower())
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    One regex for a whole word list, shaped like a trie so the engine walks
+    shared prefixes once instead of trying every alternative in turn.
+    Longer words are tried first at each node.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            body = (body if len(alts) > 1 else "(?:" + body + ")") + "?"
+        return body
+
+    return build(trie)
+
+class SkillMatcher:
+    """
+    Finds every skill of a taxonomy in one regex pass.
+
+    Skills match case-insensitively as whole tokens: the characters around a match
+    must not be word characters, which (unlike a plain \\b) also works for skills
+    that start or end with punctuation such as "c++" or ".net".
+    Text is expected to be lowercased with single spaces (see skills.normalize).
+    """
+    def __init__(self, skills: Iterable[str]):
+        self.originals: Dict[str, List[str]] = {}
+        for s in skills:
+            key = skill_key(s)
+            if key:
+                self.originals.setdefault(key, [])
+                if s not in self.originals[key]:
+                    self.originals[key].append(s)
+        keys = sorted(self.originals)
+        # Shorter skills that are prefixes of a longer one ("rest" / "rest api")
+        self._prefixes: Dict[str, List[str]] = {
+            k: [k[:i] for i in range(1, len(k)) if k[:i] in self.originals] for k in keys
+        }
+        body = _trie_pattern(keys) if keys else r"(?!)"
+        # Zero-width match at every token start so overlapping skills are all seen
+        self._pattern = re.compile(r"(?<!\w)(?=(" + body + r")(?!\w))")
+
+    def _iter_hits(self, text: str) -> Iterable[Tuple[str, int]]:
+        for m in self._pattern.finditer(text):
+            key, pos = m.group(1), m.start()
+            yield key, pos
+            for p in self._prefixes[key]:
+                end = pos + len(p)
+                if end >= len(text) or not _WORD.match(text[end]):
+                    yield p, pos
+
+    def find(self, text: str) -> Set[str]:
+        """Normalized skill keys present in text."""
+        return {key for key, _ in self._iter_hits(text)}
+
+    def find_lines(self, lines: List[str]) -> Dict[str, List[int]]:
+        """
+        {skill_key: [line indices, ascending, no repeats]} for a list of lines.
+        Lines are normalized here, so callers can pass the original text lines.
+        """
+        normalized = [skill_key(ln) for ln in lines]
+        joined = "\n".join(normalized)
+        starts = [0] + list(accumulate(len(ln) + 1 for ln in normalized))
+        out: Dict[str, List[int]] = {}
+        for key, pos in self._iter_hits(joined):
+            line = bisect.bisect_right(starts, pos) - 1
+            hits = out.setdefault(key, [])
+            if not hits or hits[-1] != line:
+                hits.append(line)
+        return out
+
+@lru_cache(maxsize=32)
+def _cached_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+def get_matcher(skills: Iterable[str]) -> SkillMatcher:
+    """Compiled matcher for a skill list, built once per distinct list."""
+    return _cached_matcher(tuple(skills))
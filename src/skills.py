@@ -1,7 +1,11 @@
 # src/skills.py
 from __future__ import annotations
 import re
-from typing import List, Set, Dict
+from typing import List, Optional, Set, Dict
+
+from src.instrumentation import instrumented
+from src.skill_matcher import get_matcher
+from src.taxonomy import CORE, TOOLS, Taxonomy, get_taxonomy
 
 DEFAULT_SKILLS = [
     # Core CS / SWE
@@ -21,23 +25,32 @@ DEFAULT_SKILLS = [
 def normalize(text: str) -> str:
     return re.sub(r"\s+", " ", text.lower())
 
-def extract_skills(text: str, skills_list: List[str] = DEFAULT_SKILLS) -> Set[str]:
-    t = normalize(text)
+@instrumented("extract_skills", lambda out, *a, **k: {"skills": len(out)})
+def extract_skills(text: str, skills_list: Optional[List[str]] = None,
+                   taxonomy: Optional[Taxonomy] = None) -> Set[str]:
+    """
+    Skills found in text. By default uses the active taxonomy, so aliases
+    (k8s, postgres, ...) are reported under their canonical names.
+    An explicit skills_list is matched literally instead.
+    """
+    if skills_list is None:
+        return (taxonomy or get_taxonomy()).extract(normalize(text))
+    matcher = get_matcher(skills_list)
     found = set()
-    for s in skills_list:
-        pattern = r"\b" + re.escape(s.lower()) + r"\b"
-        if re.search(pattern, t):
-            found.add(s)
+    for key in matcher.find(normalize(text)):
+        found.update(matcher.originals[key])
     return found
 
-def categorize_missing(missing: Set[str]) -> Dict[str, List[str]]:
+def categorize_missing(missing: Set[str], taxonomy: Optional[Taxonomy] = None) -> Dict[str, List[str]]:
+    tax = taxonomy or get_taxonomy()
     core = []
     tools = []
     nice = []
     for s in sorted(missing):
-        if s in {"python","sql","git","linux","data structures","algorithms","systems design"}:
+        cat = tax.category(s)
+        if cat == CORE:
             core.append(s)
-        elif s in {"docker","kubernetes","ci/cd","github actions","aws","azure","gcp","openstack","postgresql","mysql","mongodb","redis"}:
+        elif cat == TOOLS:
             tools.append(s)
         else:
             nice.append(s)
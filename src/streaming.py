@@ -0,0 +1,258 @@
+# src/streaming.py
+"""
+Line-by-line text normalization and chunking for very large inputs.
+
+Generator equivalents of the whole-string helpers, built to match them exactly:
+
+    "\\n".join(iter_clean_lines(text))            == parsing.clean_text(text)
+    dict(iter_sections(lines))                   == chunking.split_into_sections(text)
+    list(iter_bullets(lines))                    == chunking.bulletize(text)
+    list(iter_jd_chunks(lines))                  == chunking.chunk_job_description(text)
+    stream_resume_chunks(text)                   == pipeline.resume_section_chunks(clean_text(text))
+
+Sources may be a string or any iterable of string pieces (an open file, PDF pages),
+so a 200-page CV never has to be held as several full copies. Memory is bounded by the
+largest bullet/paragraph being assembled, except where noted.
+"""
+from __future__ import annotations
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.chunking import RESUME_SECTION_HEADERS, _normalize, bulletize
+
+Source = Union[str, Iterable[str]]
+
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+_SPACES = re.compile(r" {2,}")
+_BULLET_MARKERS = "•-*"
+_BLOCK = 1 << 16
+
+def iter_raw_lines(source: Source) -> Iterator[str]:
+    """Split on \\r\\n, \\r and \\n (exactly what clean_text treats as line breaks)."""
+    if isinstance(source, str):
+        # Fixed-size blocks keep the per-block line lists small for huge strings
+        pieces: Iterable[str] = (source[i:i + _BLOCK] for i in range(0, len(source), _BLOCK))
+    else:
+        pieces = source
+    buf = ""
+    for piece in pieces:
+        buf += piece
+        if "\r" not in buf:
+            lines = buf.split("\n")
+            buf = lines.pop()
+            yield from lines
+            continue
+        start = 0
+        for m in _NEWLINE.finditer(buf):
+            if m.group() == "\r" and m.end() == len(buf):
+                break  # may be the first half of a \r\n split across pieces
+            yield buf[start:m.start()]
+            start = m.end()
+        buf = buf[start:]
+    start = 0
+    for m in _NEWLINE.finditer(buf):
+        yield buf[start:m.start()]
+        start = m.end()
+    yield buf[start:]
+
+def iter_clean_lines(source: Optional[Source]) -> Iterator[str]:
+    """
+    Normalized lines, joined with "\\n" identical to clean_text(): NBSP/tabs become
+    spaces, lines are stripped and their space runs collapsed, a run of empty raw
+    lines counts as one blank line, and blank lines at either end are dropped.
+    """
+    if source is None:
+        return
+    blanks = 0
+    started = False
+    in_empty_run = False
+    for raw in iter_raw_lines(source):
+        if raw == "":
+            # clean_text collapses 3+ newlines before stripping, so only truly empty
+            # raw lines merge; whitespace-only lines each stay a blank line
+            if not in_empty_run:
+                blanks += 1
+                in_empty_run = True
+            continue
+        in_empty_run = False
+        line = raw.replace("\xa0", " ").replace("\t", " ").strip()
+        if "  " in line:
+            line = _SPACES.sub(" ", line)
+        if not line:
+            blanks += 1
+            continue
+        if started:
+            for _ in range(blanks):
+                yield ""
+        started = True
+        blanks = 0
+        yield line
+
+def iter_sections(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    (header, body) pairs in document order; a repeated header is yielded again and,
+    as in split_into_sections, the later body wins when collected into a dict.
+    Without any header the whole text is yielded as ("full", text), which needs the
+    text buffered until the end.
+    """
+    header: Optional[str] = None
+    body: List[str] = []
+    preamble: Optional[List[str]] = []   # lines before the first header (kept for "full")
+    for line in lines:
+        if preamble is not None:
+            preamble.append(line)
+        for sub in line.splitlines() or [""]:  # split_into_sections uses str.splitlines()
+            n = _normalize(sub)
+            if n in RESUME_SECTION_HEADERS:
+                if header is not None:
+                    yield header, "\n".join(body).strip()
+                header, body, preamble = n, [], None
+            elif header is not None:
+                body.append(sub.strip())
+    if header is not None:
+        yield header, "\n".join(body).strip()
+    else:
+        yield "full", "\n".join(preamble).strip()
+
+class BulletSplitter:
+    """
+    Push-based bulletize(): feed() lines one at a time and collect finished chunks.
+
+    Mirrors re.split(r"\\n\\s*[•\\-\\*]\\s+", "\\n" + text): a bullet marker at the
+    start of a line, followed by whitespace, begins a new chunk. A marker alone on a
+    line swallows the following line break, so the next line cannot start a bullet.
+    With at most one chunk the text falls back to bulletize's sentence split.
+    """
+    def __init__(self):
+        self._chunk: List[str] = []
+        self._pending: List[str] = []     # blank lines and an undecided lone marker
+        self._lone_marker = False
+        self._held: List[str] = []        # first chunk, kept until a second one proves bullets exist
+        self._raw: Optional[List[str]] = []  # whole text, kept only while a fallback is possible
+        self._streaming = False
+
+    def _close_chunk(self) -> List[str]:
+        chunk = "\n".join(self._chunk).strip()
+        self._chunk = []
+        if not chunk:
+            return []
+        if self._streaming:
+            return [chunk]
+        self._held.append(chunk)
+        return []
+
+    def _maybe_stream(self) -> List[str]:
+        # Two non-empty chunks mean no sentence fallback: release what was held
+        if not self._streaming and self._held and "\n".join(self._chunk).strip():
+            self._streaming = True
+            self._raw = None
+            out, self._held = self._held, []
+            return out
+        return []
+
+    def feed(self, line: str) -> List[str]:
+        if self._raw is not None:
+            self._raw.append(line)
+        s = line.strip()
+        if not s:
+            self._pending.append(line)
+            return []
+        out: List[str] = []
+        if self._lone_marker:
+            # The bare marker before this line was a separator after all; its
+            # whitespace ate this line's break, so this line starts the chunk as-is
+            self._lone_marker = False
+            self._pending = []
+            out += self._close_chunk()
+            self._chunk = [line.lstrip()]
+        elif s[0] in _BULLET_MARKERS and len(s) == 1:
+            # Only a separator if more text follows; decided by the next non-blank line
+            self._lone_marker = True
+            self._pending.append(line)
+        elif s[0] in _BULLET_MARKERS and s[1].isspace():
+            self._pending = []
+            out += self._close_chunk()
+            self._chunk = [line.lstrip()[1:].lstrip()]
+        else:
+            self._chunk += self._pending
+            self._pending = []
+            self._chunk.append(line)
+        return out + self._maybe_stream()
+
+    def close(self) -> List[str]:
+        if self._lone_marker:
+            # A marker at the very end has no whitespace after it (bulletize strips the text)
+            self._chunk += self._pending
+        out = self._close_chunk()
+        if self._streaming:
+            return out
+        # At most one chunk: bulletize splits the whole text into sentences instead
+        return bulletize("\n".join(self._raw))
+
+def iter_bullets(lines: Iterable[str]) -> Iterator[str]:
+    splitter = BulletSplitter()
+    for line in lines:
+        yield from splitter.feed(line)
+    yield from splitter.close()
+
+def iter_jd_chunks(lines: Iterable[str]) -> Iterator[str]:
+    """Streaming chunk_job_description(): short lines merge into the previous paragraph."""
+    buffer = ""
+    for ln in lines:
+        for sub in ln.splitlines():  # chunk_job_description uses str.splitlines()
+            sub = sub.strip()
+            if not sub:
+                continue
+            if len(sub) < 35 and buffer:
+                buffer += " " + sub
+                continue
+            if buffer:
+                yield from (c for c in bulletize(buffer) if len(c) >= 25)
+            buffer = sub
+    if buffer:
+        yield from (c for c in bulletize(buffer) if len(c) >= 25)
+
+def stream_resume_chunks(source: Optional[Source]) -> Dict[str, List[str]]:
+    """
+    resume_section_chunks() of the cleaned source in one pass: every cleaned line
+    feeds the full-resume splitter and the splitter of the section it belongs to.
+    """
+    from src.pipeline import SECTION_HEADERS
+
+    full = BulletSplitter()
+    full_chunks: List[str] = []
+    section_chunks: Dict[str, List[str]] = {}
+    has_text: Dict[str, bool] = {}
+    current: Optional[Tuple[str, BulletSplitter]] = None
+
+    def finish():
+        if current is not None:
+            section_chunks[current[0]] += current[1].close()
+
+    for line in iter_clean_lines(source):
+        full_chunks += full.feed(line)
+        for sub in line.splitlines() or [""]:
+            n = _normalize(sub)
+            if n in RESUME_SECTION_HEADERS:
+                finish()
+                section_chunks[n] = []   # a repeated header replaces the earlier body
+                has_text[n] = False
+                current = (n, BulletSplitter())
+            elif current is not None:
+                sub = sub.strip()
+                has_text[current[0]] = has_text[current[0]] or bool(sub)
+                section_chunks[current[0]] += current[1].feed(sub)
+    finish()
+    full_chunks += full.close()
+
+    out: Dict[str, List[str]] = {}
+    for name, headers in SECTION_HEADERS.items():
+        chunks: List[str] = []
+        for h in headers:
+            # As in resume_section_chunks: the first of the headers with a non-empty body
+            if has_text.get(h):
+                chunks = section_chunks[h]
+                break
+        out[name] = chunks or full_chunks
+    out["full"] = full_chunks
+    return out
@@ -0,0 +1,284 @@
+# src/taxonomy.py
+"""
+Skill taxonomy: canonical skills, their aliases and categories.
+
+Large taxonomies are authored as JSON/CSV and compiled once into a compact
+binary file that is memory-mapped read-only at startup, so worker processes
+share the same pages instead of each re-parsing a big JSON document:
+
+    python -m src.taxonomy compile skills.json skills.bin
+
+Point RESUME_ANALYZER_TAXONOMY at the .bin file to make it the active taxonomy.
+"""
+from __future__ import annotations
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from src.skill_matcher import SkillMatcher, skill_key
+
+TAXONOMY_PATH_ENV = "RESUME_ANALYZER_TAXONOMY"
+MAGIC = b"RATAXv1\n"
+
+# Categories that categorize_missing reports separately; everything else is nice-to-have
+CORE = "core"
+TOOLS = "tools"
+
+# (name, category, aliases)
+DEFAULT_RECORDS = [
+    # Core CS / SWE
+    ("python", CORE, []), ("java", "languages", []), ("c++", "languages", ["cpp"]),
+    ("javascript", "languages", ["js"]), ("typescript", "languages", []),
+    ("sql", CORE, []), ("linux", CORE, []), ("git", CORE, []),
+    ("data structures", CORE, []), ("algorithms", CORE, []), ("systems design", CORE, ["system design"]),
+    ("docker", TOOLS, []), ("podman", "tools_other", []), ("kubernetes", TOOLS, ["k8s"]),
+    ("ci/cd", TOOLS, ["cicd", "ci-cd"]), ("github actions", TOOLS, []),
+    ("rest", "backend", ["restful"]), ("api", "backend", ["apis"]), ("microservices", "backend", []),
+    ("distributed systems", "backend", []),
+    # Data/ML
+    ("pytorch", "ml", []), ("tensorflow", "ml", []), ("scikit-learn", "ml", ["sklearn", "scikit learn"]),
+    ("numpy", "ml", []), ("pandas", "ml", []),
+    ("machine learning", "ml", []), ("deep learning", "ml", []),
+    ("nlp", "ml", ["natural language processing"]), ("computer vision", "ml", []),
+    ("transformers", "ml", []), ("hugging face", "ml", ["huggingface"]), ("fine-tuning", "ml", ["fine tuning", "finetuning"]),
+    # Cloud
+    ("aws", TOOLS, ["amazon web services"]), ("gcp", TOOLS, ["google cloud", "google cloud platform"]),
+    ("azure", TOOLS, ["microsoft azure"]), ("openstack", TOOLS, []),
+    # Databases
+    ("postgresql", TOOLS, ["postgres"]), ("mysql", TOOLS, []), ("mongodb", TOOLS, ["mongo"]), ("redis", TOOLS, []),
+]
+
+Record = Dict[str, Union[str, List[str]]]
+
+def _normalize_records(records: Iterable) -> List[Record]:
+    out = []
+    for r in records:
+        if isinstance(r, dict):
+            aliases = r.get("aliases") or []
+            if isinstance(aliases, str):
+                aliases = [a for a in aliases.split(";") if a.strip()]
+            out.append({"name": r["name"], "category": r.get("category") or "other", "aliases": list(aliases)})
+        else:
+            name, category, aliases = r
+            out.append({"name": name, "category": category, "aliases": list(aliases)})
+    return out
+
+def load_source(path: str) -> List[Record]:
+    """
+    Read an authoring file: JSON (a list of records or {"skills": [...]}) or CSV
+    with columns name, category, aliases (aliases separated by ';').
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return _normalize_records(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["skills"]
+    return _normalize_records(data)
+
+def compile_records(records: Iterable) -> bytes:
+    """
+    Serialize records into the binary layout:
+      MAGIC | u32 header length | JSON header (padded to 4 bytes)
+      | u32 term offsets [n_terms + 1] | u32 term -> skill id [n_terms]
+      | u32 skill -> category id [n_skills] | UTF-8 term blob
+    Terms are the canonical names (ids 0..n_skills-1) followed by all aliases.
+    """
+    recs = _normalize_records(records)
+    seen: Dict[str, int] = {}
+    names: List[str] = []
+    categories: List[str] = []
+    skill_cat: List[int] = []
+    for r in recs:
+        key = skill_key(r["name"])
+        if not key or key in seen:
+            continue
+        seen[key] = len(names)
+        names.append(r["name"])
+        if r["category"] not in categories:
+            categories.append(r["category"])
+        skill_cat.append(categories.index(r["category"]))
+
+    terms = list(names)
+    term_skill = list(range(len(names)))
+    for r in recs:
+        sid = seen.get(skill_key(r["name"]))
+        for a in r["aliases"]:
+            key = skill_key(a)
+            if sid is None or not key or key in seen:
+                continue
+            seen[key] = sid
+            terms.append(a)
+            term_skill.append(sid)
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for t in terms:
+        blob += t.encode("utf-8")
+        offsets.append(len(blob))
+
+    body = offsets.tobytes() + array("I", term_skill).tobytes() + array("I", skill_cat).tobytes() + bytes(blob)
+    header = {
+        "version": hashlib.sha1(body).hexdigest()[:16],
+        "n_skills": len(names),
+        "n_terms": len(terms),
+        "categories": categories,
+        "byteorder": sys.byteorder,
+    }
+    hbytes = json.dumps(header).encode("utf-8")
+    hbytes += b" " * (-(len(MAGIC) + 4 + len(hbytes)) % 4)
+    return MAGIC + struct.pack("<I", len(hbytes)) + hbytes + body
+
+def compile_taxonomy(src_path: str, dst_path: str) -> None:
+    data = compile_records(load_source(src_path))
+    tmp = dst_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, dst_path)
+
+class Taxonomy:
+    """
+    Read-only view over a compiled taxonomy buffer (bytes or a shared mmap).
+    Strings are decoded lazily; lookup tables and the matcher are built on first use.
+    """
+    def __init__(self, buf, path: Optional[str] = None):
+        self.path = path
+        self._buf = buf
+        mv = memoryview(buf)
+        if bytes(mv[:len(MAGIC)]) != MAGIC:
+            raise ValueError("not a compiled taxonomy file")
+        (hlen,) = struct.unpack_from("<I", buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(mv[start:start + hlen]).decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("taxonomy was compiled on a machine with different byte order")
+        self.version: str = header["version"]
+        self.categories: List[str] = header["categories"]
+        self.n_skills: int = header["n_skills"]
+        self.n_terms: int = header["n_terms"]
+
+        pos = start + hlen
+        u32 = mv[pos:pos + 4 * (2 * self.n_terms + 1 + self.n_skills)].cast("I")
+        self._offsets = u32[:self.n_terms + 1]
+        self._term_skill = u32[self.n_terms + 1:2 * self.n_terms + 1]
+        self._skill_cat = u32[2 * self.n_terms + 1:]
+        self._blob = mv[pos + 4 * len(u32):]
+
+        self._lock = threading.Lock()
+        self._terms: Optional[List[str]] = None
+        self._by_key: Optional[Dict[str, int]] = None
+        self._aliases: Optional[Dict[int, List[int]]] = None
+        self._matcher: Optional[SkillMatcher] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> "Taxonomy":
+        return cls(compile_records(records))
+
+    @classmethod
+    def load(cls, path: str) -> "Taxonomy":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, path=path)
+
+    def __reduce__(self):
+        # Worker processes re-map the file rather than receiving a pickled copy
+        if self.path is not None:
+            return (Taxonomy.load, (self.path,))
+        return (Taxonomy, (bytes(self._buf),))
+
+    def __len__(self) -> int:
+        return self.n_skills
+
+    def terms(self) -> List[str]:
+        if self._terms is None:
+            with self._lock:
+                if self._terms is None:
+                    o = self._offsets
+                    self._terms = [bytes(self._blob[o[i]:o[i + 1]]).decode("utf-8") for i in range(self.n_terms)]
+        return self._terms
+
+    @property
+    def skills(self) -> List[str]:
+        return self.terms()[:self.n_skills]
+
+    def _index(self) -> Dict[str, int]:
+        if self._by_key is None:
+            terms = self.terms()
+            aliases: Dict[int, List[int]] = {}
+            for i in range(self.n_skills, self.n_terms):
+                aliases.setdefault(self._term_skill[i], []).append(i)
+            self._aliases = aliases
+            self._by_key = {skill_key(t): self._term_skill[i] for i, t in enumerate(terms)}
+        return self._by_key
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical skill name for a skill or alias, None if unknown."""
+        sid = self._index().get(skill_key(term))
+        return None if sid is None else self.terms()[sid]
+
+    def category(self, skill: str) -> Optional[str]:
+        sid = self._index().get(skill_key(skill))
+        return None if sid is None else self.categories[self._skill_cat[sid]]
+
+    def terms_for(self, skill: str) -> List[str]:
+        """The canonical name plus every alias of a skill (just [skill] if unknown)."""
+        sid = self._index().get(skill_key(skill))
+        if sid is None:
+            return [skill]
+        terms = self.terms()
+        return [terms[sid]] + [terms[i] for i in self._aliases.get(sid, [])]
+
+    def matcher(self) -> SkillMatcher:
+        if self._matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    self._matcher = SkillMatcher(self.terms())
+        return self._matcher
+
+    def extract(self, normalized_text: str) -> Set[str]:
+        """Canonical names of every skill (or alias) found in lowercased, single-spaced text."""
+        index = self._index()
+        terms = self.terms()
+        return {terms[index[k]] for k in self.matcher().find(normalized_text)}
+
+_ACTIVE: Optional[Taxonomy] = None
+_ACTIVE_LOCK = threading.Lock()
+
+def get_taxonomy() -> Taxonomy:
+    """Active taxonomy: the compiled file in RESUME_ANALYZER_TAXONOMY, else the built-in one."""
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        if _ACTIVE is None:
+            path = os.environ.get(TAXONOMY_PATH_ENV)
+            _ACTIVE = Taxonomy.load(path) if path else Taxonomy.from_records(DEFAULT_RECORDS)
+        return _ACTIVE
+
+def set_taxonomy(taxonomy: Optional[Taxonomy]) -> None:
+    """Replace the active taxonomy (None resets to the default on next use)."""
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        _ACTIVE = taxonomy
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    p = argparse.ArgumentParser(prog="python -m src.taxonomy")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("compile", help="Compile a JSON/CSV taxonomy into the binary format")
+    c.add_argument("src")
+    c.add_argument("dst")
+    args = p.parse_args(argv)
+    compile_taxonomy(args.src, args.dst)
+    tax = Taxonomy.load(args.dst)
+    print(f"Wrote {args.dst}: {tax.n_skills} skills, {tax.n_terms - tax.n_skills} aliases, version {tax.version}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Stub embedder and resume/JD fixtures shared by several test modules."""
+import numpy as np
+
+class KeywordEmbedder:
+    """Bag-of-keywords vectors so 'more overlap' means 'higher score'."""
+    VOCAB = ["python", "docker", "kubernetes", "aws", "sql", "react", "design", "sales"]
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(len(texts))
+        out = np.zeros((len(texts), len(self.VOCAB) + 1), dtype=np.float32)
+        for i, t in enumerate(texts):
+            low = t.lower()
+            for j, w in enumerate(self.VOCAB):
+                out[i, j] = float(w in low)
+            out[i, -1] = 0.1
+        return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+JD = """
+Backend engineer with Python and SQL experience building services on AWS.
+Experience deploying with Docker and Kubernetes is required for this role.
+"""
+
+STRONG = """
+Experience
+- Built Python services backed by SQL databases and deployed them on AWS
+- Deployed containers with Docker and Kubernetes for production workloads
+"""
+
+WEAK = """
+Experience
+- Led enterprise sales for a regional team and exceeded quota every quarter
+- Coordinated graphic design vendors for marketing campaigns each season
+"""
+
+# Clustered unit vectors: resume bullets around 10 topics, and JD queries near one topic
+def unit_corpus(n_resumes=200, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(10, dim))
+    out = {}
+    for i in range(n_resumes):
+        t = topics[i % 10]
+        x = t + 0.3 * rng.normal(size=(int(rng.integers(3, 8)), dim))
+        out[f"r{i}"] = (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+    return out, topics
+
+def corpus_query(topics, topic, dim=16, seed=1):
+    rng = np.random.default_rng(seed)
+    x = topics[topic] + 0.3 * rng.normal(size=(4, dim))
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
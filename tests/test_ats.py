@@ -10,3 +10,51 @@ def test_ats_detects_pipes_as_tables():
     resume = "Name | Email | Phone\nJohn | john@email.com | 123-456-7890\n"
     out = ats_checks(resume)
     assert any("tables" in w.lower() or "columns" in w.lower() for w in out["warnings"])
+
+GOOD = """Jane Doe
+jane@example.com | +1 555 123 4567
+Experience
+- Built data pipelines in Python at Acme, 2019 - 2023
+- Reduced query latency by 40% with new indexes
+Education
+B.S. Computer Science, State University, 2014 - 2018
+Skills
+Python, SQL, Airflow, Docker, Kubernetes, AWS
+"""
+
+def test_scan_returns_structured_findings_and_metrics():
+    from src.ats import scan
+
+    report = scan(GOOD)
+    assert [f.rule for f in report.findings] == ["table_pipes"]
+    assert report.findings[0].severity == "warning" and report.findings[0].value == 1
+    m = report.metrics
+    assert m["has_email"] and m["has_phone"] and m["has_year"]
+    assert m["sections"] == ["education", "experience", "skills"]
+    assert m["lines"] == 9 and m["median_line_length"] > 0
+
+    d = scan("John Doe\nSoftware Engineer\n").to_dict()
+    rules = {f["rule"] for f in d["findings"]}
+    assert {"no_email", "no_phone", "no_years", "no_bullets", "missing_sections"} <= rules
+
+def test_new_rules_flag_missing_headers_and_paragraph_lines():
+    from src.ats import scan
+
+    text = "jane@example.com 555-123-4567 2020\n" + "\n".join(["word " * 40] * 3)
+    by_rule = {f.rule: f for f in scan(text).findings}
+    assert by_rule["missing_sections"].value == 3
+    assert by_rule["long_lines"].severity == "tip" and by_rule["long_lines"].value == 0.75
+
+def test_ats_checks_keeps_warning_and_tip_shape():
+    out = ats_checks("John Doe\nSoftware Engineer\n")
+    assert out["warnings"][1:4] == ["No email detected.", "No phone number detected.",
+                                   "No years detected (e.g., 2024). Recruiters often expect dates for roles/projects."]
+    assert "Consider using bullets for experience/project impact statements." in out["tips"]
+
+def test_scan_many_preserves_order_in_process_and_in_pool():
+    from src.ats import scan, scan_many
+
+    texts = [GOOD, "", "John Doe\n", GOOD.replace("|", "/")]
+    expected = [scan(t).to_dict() for t in texts]
+    assert [r.to_dict() for r in scan_many(texts)] == expected
+    assert [r.to_dict() for r in scan_many(texts, max_workers=2, chunksize=1)] == expected
@@ -0,0 +1,51 @@
+import io
+import json
+
+from src.batch import ResumeDoc, iter_resumes, rank_resumes, score_resumes
+from tests.helpers import JD, STRONG, WEAK, KeywordEmbedder
+
+def test_score_resumes_embeds_jd_once_and_batches_resumes():
+    e = KeywordEmbedder()
+    docs = [ResumeDoc(str(i), STRONG if i % 2 else WEAK) for i in range(5)]
+    recs = list(score_resumes(JD, docs, e, batch_size=2))
+    assert [r["id"] for r in recs] == ["0", "1", "2", "3", "4"]
+    # 1 JD call + ceil(5 / 2) resume batches
+    assert len(e.calls) == 1 + 3
+    assert "overall_match_score" in recs[0]["report"]
+
+def test_rank_resumes_orders_by_score_and_reports_failures():
+    docs = [
+        ResumeDoc("weak", WEAK),
+        ResumeDoc("broken", "", error="ValueError: bad pdf"),
+        ResumeDoc("strong", STRONG),
+    ]
+    out = io.StringIO()
+    n = rank_resumes(JD, docs, KeywordEmbedder(), out)
+    lines = [json.loads(ln) for ln in out.getvalue().splitlines()]
+
+    assert n == 2
+    assert [r.get("rank") for r in lines] == [1, 2, None]
+    assert lines[0]["id"] == "strong"
+    assert lines[2] == {"id": "broken", "error": "ValueError: bad pdf"}
+
+def test_iter_resumes_reads_directory_and_jsonl(tmp_path):
+    (tmp_path / "a.txt").write_text(STRONG)
+    (tmp_path / "notes.csv").write_text("ignored")
+    assert [d.doc_id for d in iter_resumes(str(tmp_path))] == ["a.txt"]
+
+    jsonl = tmp_path / "resumes.jsonl"
+    jsonl.write_text(
+        json.dumps({"id": "x", "text": WEAK}) + "\n"
+        + json.dumps({"id": "y", "path": "a.txt"}) + "\n"
+        + json.dumps({"id": "z"}) + "\n"
+    )
+    docs = list(iter_resumes(str(jsonl)))
+    assert [d.doc_id for d in docs] == ["x", "y", "z"]
+    assert "Kubernetes" in docs[1].text
+    assert docs[2].error is not None
+
+def test_score_resumes_can_attach_ats_findings():
+    recs = list(score_resumes(JD, [ResumeDoc("s", STRONG)], KeywordEmbedder(), ats=True))
+    rules = [f["rule"] for f in recs[0]["ats"]["findings"]]
+    assert "no_email" in rules
+    assert "report" in recs[0]
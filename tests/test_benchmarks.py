@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare
+from benchmarks.corpus import generate_corpus
+from benchmarks.run import STAGES, run_benchmark
+from benchmarks.stub import StubEmbedder
+
+def test_corpus_is_deterministic():
+    assert generate_corpus(3, 2, seed=7) == generate_corpus(3, 2, seed=7)
+    resumes, jds = generate_corpus(3, 2, seed=7)
+    assert len(resumes) == 3 and len(jds) == 2
+    assert "Experience" in resumes[0]
+
+def test_stub_embedder_is_normalized_and_similarity_aware():
+    e = StubEmbedder(dim=64)
+    out = e.embed(["built python services", "built python services fast", "sold enterprise furniture"])
+    assert out.shape == (3, 64) and out.dtype == np.float32
+    assert np.allclose(np.linalg.norm(out, axis=1), 1.0)
+    assert out[0] @ out[1] > out[0] @ out[2]
+
+def test_run_benchmark_reports_every_stage():
+    results = run_benchmark(n_resumes=4, n_jds=2, repeat=1)
+    assert list(results["stages"]) == STAGES
+    assert results["stages"]["scoring"]["items"] == 8
+    json.dumps(results)
+
+def test_compare_flags_only_real_slowdowns():
+    base = {"stages": {"embed": {"seconds": 1.0, "per_item_ms": 1.0}, "ats": {"seconds": 1.0, "per_item_ms": 1.0}}}
+    cur = {"stages": {"embed": {"seconds": 2.0, "per_item_ms": 2.0}, "ats": {"seconds": 1.1, "per_item_ms": 1.1}}}
+    regs = compare(cur, base, tolerance=0.25)
+    assert [r["stage"] for r in regs] == ["embed"]
+
+def test_cli_exits_nonzero_on_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    out = tmp_path / "results.json"
+    assert main(["--resumes", "3", "--jds", "1", "--repeat", "1", "--out", str(baseline)]) == 0
+
+    data = json.loads(baseline.read_text())
+    for st in data["stages"].values():
+        if not st.get("skipped"):
+            st["per_item_ms"] /= 100.0
+            st["seconds"] = 1.0
+    baseline.write_text(json.dumps(data))
+    assert main(["--resumes", "3", "--jds", "1", "--repeat", "1", "--out", str(out),
+                 "--baseline", str(baseline)]) == 1
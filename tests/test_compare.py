@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from src.compare import JobPosting, compare_jds, parse_jd_collection, read_jd_file
+from src.pipeline import analyze
+from tests.helpers import JD, STRONG, KeywordEmbedder
+
+SALES_JD = """
+Enterprise sales lead to grow regional accounts and exceed quota every quarter.
+Work with design vendors on campaigns and report pipeline to leadership.
+"""
+
+FRONTEND_JD = """
+Frontend engineer building React interfaces with a strong eye for design.
+Ship accessible components and collaborate with product every sprint.
+"""
+
+def test_parse_jd_collection_splits_pasted_text_and_reads_jsonl():
+    pasted = f"{JD}\n---\n{SALES_JD}\n=====\n\n{FRONTEND_JD}"
+    postings = parse_jd_collection(pasted)
+    assert [p.jd_id for p in postings] == ["1", "2", "3"]
+    assert postings[1].title.startswith("Enterprise sales lead")
+
+    jsonl = "\n".join(json.dumps(r) for r in [
+        {"id": "be", "title": "Backend", "text": JD},
+        {"text": SALES_JD},
+        {"id": "empty", "text": "  "},
+    ])
+    postings = parse_jd_collection(jsonl)
+    assert [(p.jd_id, p.title) for p in postings][0] == ("be", "Backend")
+    assert [p.jd_id for p in postings] == ["be", "2"]
+
+def test_parse_jd_collection_names_the_malformed_jsonl_line():
+    jsonl = json.dumps({"id": "be", "text": JD}) + '\n{"id": "oops", "text": "unterminated\n'
+    with pytest.raises(ValueError, match="record 2"):
+        parse_jd_collection(jsonl)
+    with pytest.raises(ValueError, match="record 1"):
+        read_jd_file("saved.jsonl", b"{1: 2}\n")
+    with pytest.raises(ValueError, match="record 1: 'text' must be a string"):
+        parse_jd_collection('{"text": 5}')
+    with pytest.raises(ValueError, match="record 2: 'text' must be a string"):
+        parse_jd_collection(json.dumps({"text": JD}) + '\n{"text": ["a"]}')
+    with pytest.raises(ValueError, match="record 1: 'title' must be a string"):
+        parse_jd_collection(json.dumps({"text": JD, "title": 7}))
+
+def test_read_jd_file_names_postings_after_the_file():
+    assert [p.jd_id for p in read_jd_file("backend.txt", JD.encode())] == ["backend"]
+    many = read_jd_file("saved.txt", f"{JD}\n---\n{SALES_JD}".encode())
+    assert [p.jd_id for p in many] == ["saved:1", "saved:2"]
+
+def test_compare_jds_ranks_and_matches_single_analysis():
+    postings = [JobPosting("sales", "Sales", SALES_JD), JobPosting("be", "Backend", JD),
+                JobPosting("fe", "Frontend", FRONTEND_JD)]
+    e = KeywordEmbedder()
+    results = compare_jds(STRONG, postings, e, max_workers=2)
+    # Resume and every posting go through one embed call
+    assert len(e.calls) == 1
+    assert results[0].posting.jd_id == "be"
+    assert [r.overall_100 for r in results] == sorted((r.overall_100 for r in results), reverse=True)
+
+    for r in results:
+        single = analyze(STRONG, r.posting.text, KeywordEmbedder())
+        assert r.analysis.overall_100 == single.overall_100
+        assert r.analysis.section_scores == single.section_scores
+        assert r.analysis.jd_to_best == single.jd_to_best[:len(r.analysis.jd_to_best)]
+
+def test_compare_jds_rows_and_reports():
+    results = compare_jds(STRONG, [JobPosting("be", "Backend", JD), JobPosting("sales", "Sales", SALES_JD)],
+                          KeywordEmbedder(), max_workers=0)
+    row = results[0].row()
+    assert set(row) == {"id", "title", "overall", "skills", "experience", "projects", "missing_skills"}
+    assert row["overall"] == results[0].overall_100
+    report = results[1].report()
+    assert report["id"] == "sales" and "weakest_jd_items" in report
+    assert compare_jds(STRONG, [], KeywordEmbedder()) == []
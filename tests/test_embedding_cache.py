@@ -0,0 +1,66 @@
+import numpy as np
+
+from src.embedding_cache import CachedEmbedder, EmbeddingCache, SqliteVectorStore, chunk_key
+
+class CountingEmbedder:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        if not texts:
+            return np.zeros((0, 4), dtype=np.float32)
+        return np.array([[len(t), 1, 0, 0] for t in texts], dtype=np.float32)
+
+def test_chunk_key_normalizes_whitespace_and_scopes_by_model():
+    assert chunk_key("m", "Built  API\n in Python ") == chunk_key("m", "Built API in Python")
+    assert chunk_key("m", "Built API") != chunk_key("other", "Built API")
+
+def test_cached_embedder_only_encodes_misses():
+    inner = CountingEmbedder()
+    emb = CachedEmbedder(inner, EmbeddingCache())
+
+    first = emb.embed(["aa", "bbb", "aa"])
+    assert inner.calls == [["aa", "bbb"]]
+    assert first.shape == (3, 4)
+    assert first.dtype == np.float32
+    assert np.array_equal(first[0], first[2])
+
+    second = emb.embed(["bbb", "cccc"])
+    assert inner.calls[-1] == ["cccc"]
+    assert second[0, 0] == 3.0 and second[1, 0] == 4.0
+
+    stats = emb.cache.stats
+    assert stats.misses == 3
+    assert stats.hits == 1
+
+def test_persistent_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    inner = CountingEmbedder()
+    CachedEmbedder(inner, EmbeddingCache(store=SqliteVectorStore(path))).embed(["hello world"])
+
+    # Fresh in-memory tier, same file on disk
+    restarted = CachedEmbedder(inner, EmbeddingCache(store=SqliteVectorStore(path)))
+    out = restarted.embed(["hello world"])
+    assert len(inner.calls) == 1
+    assert out[0, 0] == 11.0
+    assert restarted.cache.stats.disk_hits == 1
+
+def test_memory_tier_is_lru_bounded():
+    cache = EmbeddingCache(max_items=2)
+    v = np.zeros(4, dtype=np.float32)
+    cache.put_many({"a": v, "b": v})
+    cache.get_many(["a"])
+    cache.put_many({"c": v})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+def test_cached_embedder_keeps_backends_apart():
+    class E:
+        model_name = "m"
+        def __init__(self, backend):
+            self.backend = backend
+
+    assert CachedEmbedder(E("torch")).model_name == "m"
+    assert CachedEmbedder(E("onnx")).model_name == "m@onnx"
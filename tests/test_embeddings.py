@@ -12,7 +12,9 @@ def test_embedder_empty_texts_returns_0x384_float32(monkeypatch):
     class FakeST:
         def __init__(self, model_name):
             self.model_name = model_name
-        def encode(self, texts, normalize_embeddings=True):
+        def get_sentence_embedding_dimension(self):
+            return 384
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
             raise AssertionError("encode should not be called when texts is empty")
 
     monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
@@ -24,6 +26,26 @@ def test_embedder_empty_texts_returns_0x384_float32(monkeypatch):
     assert out.shape == (0, 384)
     assert out.dtype == np.float32
 
+def test_empty_embedding_width_follows_the_model(monkeypatch):
+    import src.embeddings as emb_mod
+    import src.onnx_backend as onnx_mod
+
+    class WideST:
+        def __init__(self, model_name):
+            pass
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            return np.ones((len(texts), 768))
+
+    class FakeOnnx:
+        dim = 512
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", WideST)
+    monkeypatch.setattr(onnx_mod, "load_onnx_encoder", lambda name, quantized=False: FakeOnnx())
+    e = emb_mod.Embedder("wide-model")
+    assert e.embed([]).shape == (0, 768)
+    assert np.concatenate([e.embed([]), e.embed(["x"])]).shape == (1, 768)
+    assert emb_mod.Embedder("m", backend="onnx").embed([]).shape == (0, 512)
+
 def test_embedder_calls_encode_with_normalize_true(monkeypatch):
     import src.embeddings as emb_mod
 
@@ -33,7 +55,7 @@ def test_embedder_calls_encode_with_normalize_true(monkeypatch):
         def __init__(self, model_name):
             calls["init"] = model_name
 
-        def encode(self, texts, normalize_embeddings=True):
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
             calls["encode"] = {"texts": texts, "normalize_embeddings": normalize_embeddings}
             # Return something array-like with shape (n, 384)
             n = len(texts)
@@ -63,7 +85,7 @@ def test_embedder_accepts_any_list_of_strings(monkeypatch):
     class FakeST:
         def __init__(self, model_name):
             pass
-        def encode(self, texts, normalize_embeddings=True):
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
             # Just return embeddings for each input
             return np.arange(len(texts) * 384).reshape(len(texts), 384)
 
@@ -73,3 +95,153 @@ def test_embedder_accepts_any_list_of_strings(monkeypatch):
     out = e.embed(["a"])
     assert out.shape == (1, 384)
     assert out.dtype == np.float32
+
+def test_registry_loads_each_model_once_and_evicts_lru(monkeypatch):
+    import src.embeddings as emb_mod
+
+    loads = []
+
+    class FakeST:
+        def __init__(self, model_name):
+            loads.append(model_name)
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            return np.ones((len(texts), 384))
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
+
+    reg = emb_mod.EmbedderRegistry(max_models=2)
+    a1 = reg.get("a")
+    a2 = reg.get("a")
+    assert a1 is a2
+    assert loads == ["a"]
+
+    reg.get("b")
+    reg.get("a")  # touch "a" so "b" is least recently used
+    reg.get("c")
+    assert [k[0] for k in reg.loaded()] == ["a", "c"]
+
+    reg.get("b")
+    assert loads == ["a", "b", "c", "b"]
+
+def test_registry_concurrent_get_loads_once(monkeypatch):
+    import threading
+    import time
+    import src.embeddings as emb_mod
+
+    loads = []
+
+    class FakeST:
+        def __init__(self, model_name):
+            time.sleep(0.05)
+            loads.append(model_name)
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
+
+    reg = emb_mod.EmbedderRegistry()
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(reg.get("m"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loads == ["m"]
+    assert all(e is got[0] for e in got)
+
+def test_backend_selected_from_env_and_part_of_registry_key(monkeypatch):
+    import src.embeddings as emb_mod
+    import src.onnx_backend as onnx_mod
+
+    class FakeST:
+        def __init__(self, model_name):
+            pass
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            return np.zeros((len(texts), 384))
+
+    class FakeOnnx:
+        def __init__(self, model_name, quantized):
+            self.quantized = quantized
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            return np.ones((len(texts), 384))
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
+    monkeypatch.setattr(onnx_mod, "load_onnx_encoder", lambda name, quantized=False: FakeOnnx(name, quantized))
+
+    reg = emb_mod.EmbedderRegistry(max_models=3)
+    assert reg.get("m").backend == "torch"
+    monkeypatch.setenv(emb_mod.BACKEND_ENV, "onnx-int8")
+    e = reg.get("m")
+    assert e.backend == "onnx-int8" and e.model.quantized
+    assert float(e.embed(["x"])[0, 0]) == 1.0
+    assert reg.loaded() == [("m", None, "torch"), ("m", None, "onnx-int8")]
+
+    with pytest.raises(ValueError):
+        emb_mod.Embedder("m", backend="tensorrt")
+    with pytest.raises(ValueError):
+        emb_mod.Embedder("m", device="cuda", backend="onnx")
+
+def test_plan_batches_groups_by_length_under_budget():
+    import src.embeddings as emb_mod
+
+    lengths = [100, 5, 6, 90, 7, 400]
+    batches = emb_mod.plan_batches(lengths, token_budget=200)
+    assert sorted(i for b in batches for i in b) == list(range(6))
+    assert batches[0] == [1, 2, 4]
+    for b in batches:
+        assert len(b) == 1 or len(b) * max(lengths[i] for i in b) <= 200
+    assert [5] in batches  # over-budget text gets its own batch
+
+def test_embed_buckets_by_tokens_and_restores_order(monkeypatch):
+    import src.embeddings as emb_mod
+
+    calls = []
+
+    class FakeTokenizer:
+        def __call__(self, texts, truncation=True, max_length=None):
+            return {"input_ids": [[0] * min(len(t.split()) + 2, max_length) for t in texts]}
+
+    class FakeST:
+        max_seq_length = 64
+        tokenizer = FakeTokenizer()
+
+        def __init__(self, model_name):
+            pass
+
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            calls.append(list(texts))
+            # First component identifies the text, so order can be checked
+            out = np.zeros((len(texts), 384))
+            out[:, 0] = [int(t.split()[0]) for t in texts]
+            return out
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
+    e = emb_mod.Embedder("m")
+    e.token_budget = 40
+    texts = [f"{i} " + "word " * (1 if i % 2 else 30) for i in range(10)]
+    out = e.embed(texts)
+
+    assert out[:, 0].tolist() == list(range(10))
+    assert len(calls) > 1
+    for batch in calls:
+        lengths = {len(t.split()) for t in batch}
+        assert len(lengths) == 1  # short and long chunks are never padded together
+    assert e.stats.texts == 10 and e.stats.batches == len(calls)
+    assert e.stats.padding_efficiency == 1.0
+
+def test_single_planned_batch_is_one_forward_pass(monkeypatch):
+    import src.embeddings as emb_mod
+
+    sizes = []
+
+    class FakeST:
+        def __init__(self, model_name):
+            pass
+
+        def encode(self, texts, normalize_embeddings=True, batch_size=32):
+            sizes.append(batch_size)
+            return np.zeros((len(texts), 384))
+
+    monkeypatch.setattr(emb_mod, "SentenceTransformer", FakeST)
+    e = emb_mod.Embedder("m")
+    e.embed([f"text {i}" for i in range(100)])
+    assert sizes == [100] and e.stats.batches == 1
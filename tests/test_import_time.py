@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("numpy", "torch", "sentence_transformers", "sklearn", "scipy", "fitz", "transformers")
+
+def _importtime(statement):
+    """Run `statement` in a fresh interpreter; {module: cumulative_us} from -X importtime."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    out = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        out[name.strip()] = int(cumulative)
+    return out
+
+def _top_level(modules):
+    return {m.split(".")[0] for m in modules}
+
+def test_lightweight_paths_import_no_heavy_dependencies_and_fast():
+    times = _importtime("import src.ats, src.skills, src.evidence")
+    assert not _top_level(times) & set(HEAVY)
+    # Generous budget for slow CI; locally this is ~30 ms
+    assert times["src.ats"] + times["src.skills"] + times["src.evidence"] < 300_000
+
+def test_model_and_pdf_libraries_load_on_first_use_only():
+    times = _importtime("import src.scoring, src.parsing, src.embeddings, src.pipeline, src.incremental")
+    loaded = _top_level(times)
+    assert "numpy" in loaded
+    assert not loaded & {"torch", "sentence_transformers", "sklearn", "fitz", "transformers"}
+
+def test_batch_and_service_load_scipy_only_for_prefiltering():
+    loaded = _top_level(_importtime("import src.batch, src.service"))
+    assert "scipy" not in loaded
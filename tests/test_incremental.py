@@ -0,0 +1,76 @@
+from benchmarks.stub import StubEmbedder
+from src.incremental import AnalysisSession
+from src.pipeline import analyze
+
+RESUME = """
+Skills
+Python, SQL, Docker
+Experience
+- Built REST APIs in Python and deployed them with Docker on AWS
+- Led migration of batch jobs to Kubernetes, reducing cost by 30%
+Projects
+- Trained a PyTorch model for resume ranking with 92% accuracy
+"""
+
+JD = """
+We need a backend engineer with strong Python experience building REST APIs.
+Experience with Docker and Kubernetes in production environments is required.
+Familiarity with Terraform is a plus.
+"""
+
+class CountingEmbedder(StubEmbedder):
+    def __init__(self):
+        super().__init__(dim=64)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+def _assert_same(result, fresh):
+    a = result.analysis
+    assert a.jd_chunks == fresh.jd_chunks
+    assert a.resume_chunks == fresh.resume_chunks
+    assert a.overall_100 == fresh.overall_100
+    for k, v in fresh.section_scores.items():
+        assert abs(a.section_scores[k] - v) < 1e-9
+    assert [(j, r) for j, r, _ in a.jd_to_best] == [(j, r) for j, r, _ in fresh.jd_to_best]
+
+def test_session_matches_fresh_analysis():
+    session = AnalysisSession(CountingEmbedder())
+    result = session.run(RESUME, JD)
+    _assert_same(result, analyze(RESUME, JD, StubEmbedder(dim=64)))
+    assert "kubernetes" in result.jd_skills
+    assert result.report["overall_match_score"] == result.analysis.overall_100
+    assert session.stats.computed_pairs == session.stats.total_pairs
+
+def test_editing_one_bullet_only_embeds_and_scores_that_bullet():
+    e = CountingEmbedder()
+    session = AnalysisSession(e)
+    session.run(RESUME, JD)
+
+    edited = RESUME.replace("reducing cost by 30%", "reducing cost by 45%")
+    result = session.run(edited, JD)
+    _assert_same(result, analyze(edited, JD, StubEmbedder(dim=64)))
+    # The edited bullet, as chunked for its section and for the full resume
+    assert e.calls[-1] and all("45%" in c for c in e.calls[-1])
+    n_jd = len(result.analysis.jd_chunks)
+    assert session.stats.computed_pairs == n_jd * len(e.calls[-1])
+    assert "ats" in session.stats.recomputed
+    assert "jd_skills" not in session.stats.recomputed
+
+    # Unchanged input: nothing embedded, nothing recomputed
+    calls = len(e.calls)
+    session.run(edited, JD)
+    assert len(e.calls) == calls
+    assert session.stats.computed_pairs == 0 and session.stats.recomputed == []
+
+def test_changing_the_jd_reuses_resume_columns():
+    e = CountingEmbedder()
+    session = AnalysisSession(e)
+    session.run(RESUME, JD)
+    jd2 = JD + "\nYou will mentor junior engineers and own on-call rotations for critical services."
+    result = session.run(RESUME, jd2)
+    _assert_same(result, analyze(RESUME, jd2, StubEmbedder(dim=64)))
+    assert session.stats.computed_pairs < session.stats.total_pairs
+    assert "resume_skills" not in session.stats.recomputed
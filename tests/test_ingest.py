@@ -0,0 +1,115 @@
+import fitz
+
+from src.batch import iter_resumes
+from src.ingest import IngestLimits, extract_pdf_file, ingest_pdfs
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for txt in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), txt)
+    doc.save(str(path))
+    doc.close()
+
+def test_extract_pdf_file_cleans_and_enforces_page_limit(tmp_path):
+    pdf = tmp_path / "cv.pdf"
+    _write_pdf(pdf, ["Page  one", "Page two", "Page three"])
+
+    res = extract_pdf_file(str(pdf), IngestLimits(max_pages=2))
+    assert res.ok
+    assert res.pages == 2
+    assert res.truncated
+    assert "Page one" in res.text and "three" not in res.text
+
+def test_extract_pdf_file_reports_failures(tmp_path):
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"not a pdf at all")
+    assert not extract_pdf_file(str(bad)).ok
+
+    big = tmp_path / "big.pdf"
+    _write_pdf(big, ["x"])
+    res = extract_pdf_file(str(big), IngestLimits(max_bytes=10))
+    assert res.error and "limit" in res.error
+
+def test_ingest_pdfs_pool_keeps_going_after_failures(tmp_path):
+    paths = []
+    for i in range(5):
+        p = tmp_path / f"r{i}.pdf"
+        _write_pdf(p, [f"Resume number {i}"])
+        paths.append(str(p))
+    bad = tmp_path / "broken.pdf"
+    bad.write_bytes(b"%PDF-garbage")
+    paths.append(str(bad))
+
+    results = {r.path: r for r in ingest_pdfs(paths, max_workers=2)}
+    assert set(results) == set(paths)
+    assert not results[str(bad)].ok
+    assert all(results[p].ok for p in paths[:5])
+    assert "Resume number 3" in results[paths[3]].text
+
+def test_iter_resumes_routes_directory_pdfs_through_ingest(tmp_path):
+    _write_pdf(tmp_path / "a.pdf", ["Python engineer"])
+    (tmp_path / "b.txt").write_text("Docker engineer")
+    docs = {d.doc_id: d for d in iter_resumes(str(tmp_path), workers=0)}
+    assert docs["a.pdf"].text == "Python engineer"
+    assert docs["b.txt"].text == "Docker engineer"
+
+def test_extract_pdf_file_times_out_on_slow_document(tmp_path, monkeypatch):
+    import time
+    import src.ingest as ingest_mod
+
+    def slow_pages(data, max_pages=None):
+        yield "first page"
+        time.sleep(5)
+        yield "never"
+
+    monkeypatch.setattr(ingest_mod, "iter_pdf_pages", slow_pages)
+    pdf = tmp_path / "slow.pdf"
+    pdf.write_bytes(b"%PDF")
+
+    start = time.monotonic()
+    res = extract_pdf_file(str(pdf), IngestLimits(timeout_s=0.2))
+    assert time.monotonic() - start < 2
+    assert res.error and "timed out" in res.error
+
+def test_ingest_pdfs_kills_a_worker_stuck_past_its_deadline(tmp_path, monkeypatch):
+    import signal
+    import time
+    import src.ingest as ingest_mod
+
+    real = ingest_mod.iter_pdf_pages
+
+    def stuck_pages(data, max_pages=None):
+        if b"STUCK" in data:
+            # Like a page stuck in C code: the worker's own SIGALRM never fires
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+            time.sleep(60)
+        yield from real(data, max_pages=max_pages)
+
+    monkeypatch.setattr(ingest_mod, "iter_pdf_pages", stuck_pages)   # inherited by forked workers
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"r{i}.pdf"
+        _write_pdf(p, [f"Resume number {i}"])
+        paths.append(str(p))
+    stuck = tmp_path / "stuck.pdf"
+    stuck.write_bytes(b"%PDF STUCK")
+    paths.insert(1, str(stuck))
+
+    start = time.monotonic()
+    results = {r.path: r for r in ingest_pdfs(paths, max_workers=2, limits=IngestLimits(timeout_s=0.3))}
+    assert time.monotonic() - start < 15
+    assert set(results) == set(paths)
+    assert "timed out" in results[str(stuck)].error
+    assert all(results[p].ok for p in paths if p != str(stuck))
+
+def test_jsonl_pdf_records_go_through_ingest_limits(tmp_path):
+    _write_pdf(tmp_path / "a.pdf", ["Page one", "Page two"])
+    (tmp_path / "b.txt").write_text("Docker engineer")
+    src = tmp_path / "resumes.jsonl"
+    src.write_text('{"id": "a", "path": "a.pdf"}\n{"id": "b", "path": "b.txt"}\n')
+    docs = {d.doc_id: d for d in iter_resumes(str(src), workers=0, limits=IngestLimits(max_pages=1))}
+    assert docs["a"].text == "Page one"
+    assert docs["b"].text == "Docker engineer"
+    docs = {d.doc_id: d for d in iter_resumes(str(src), workers=0, limits=IngestLimits(max_bytes=10))}
+    assert "limit" in docs["a"].error
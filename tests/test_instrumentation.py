@@ -0,0 +1,70 @@
+import io
+import json
+
+import numpy as np
+
+from src import instrumentation as inst
+from src.chunking import bulletize, chunk_job_description
+from src.parsing import clean_text
+from src.pipeline import analyze
+from src.scoring import compute_section_score
+
+from benchmarks.stub import StubEmbedder
+
+def test_disabled_stage_is_a_shared_falsy_noop():
+    assert not inst.enabled()
+    st = inst.stage("x", n=1)
+    assert st is inst.stage("y")
+    assert not st
+    with st as s:
+        s.add(n=2)
+
+def test_capture_records_stage_timings_and_counts():
+    with inst.capture() as sink:
+        bulletize("- Built API in Python\n- Deployed with Docker")
+        clean_text("a  b")
+    assert not inst.enabled()
+    names = [r.stage for r in sink.records]
+    assert names == ["bulletize", "clean_text"]
+    assert sink.records[0].counts == {"chunks": 2}
+    assert sink.records[0].wall_ms >= 0.0
+
+def test_enabling_metrics_does_not_change_behaviour():
+    jd, res = np.eye(2, 4, dtype=np.float32), np.eye(3, 4, dtype=np.float32)
+    with inst.capture() as sink:
+        score = compute_section_score(jd_emb=jd, resume_emb=res)
+
+        @inst.instrumented("broken", lambda out, *a, **k: {"n": len(out)})
+        def broken():
+            return None
+        assert broken() is None
+    assert score == compute_section_score(jd, res)
+    assert sink.records[0].counts == {"pairs": 6}
+    assert sink.records[1].stage == "broken" and sink.records[1].counts == {}
+
+def test_pipeline_stages_report_through_one_sink():
+    resume = "Experience\n- Built REST APIs in Python and deployed them with Docker\n"
+    jd = "We need strong Python experience building REST APIs with Docker in production."
+    with inst.capture() as sink:
+        analyze(resume, jd, StubEmbedder())
+    stages = {row["stage"]: row for row in sink.summary()}
+    assert {"analyze", "chunk_job_description", "embed_groups", "compute_section_score"} <= set(stages)
+    assert stages["compute_section_score"]["calls"] == 3
+
+def test_json_and_prometheus_sinks(tmp_path):
+    buf = io.StringIO()
+    prom = tmp_path / "metrics.prom"
+    json_sink = inst.JsonLogSink(buf)
+    prom_sink = inst.PrometheusTextSink(str(prom), interval_s=0)
+    inst.add_sink(json_sink)
+    inst.add_sink(prom_sink)
+    try:
+        chunk_job_description("Build and operate distributed systems in Python for our platform.")
+    finally:
+        inst.clear_sinks()
+
+    rec = json.loads(buf.getvalue().splitlines()[-1])
+    assert rec["stage"] == "chunk_job_description"
+    text = prom.read_text()
+    assert 'resume_analyzer_stage_calls_total{stage="chunk_job_description"} 1' in text
+    assert 'resume_analyzer_stage_items_total{stage="chunk_job_description",kind="chunks"} 1' in text
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.ats import scan
+from src.layout import DocumentLayout, page_text_lines
+
+def _line(x0, y0, x1, text, font="Helvetica", size=10.0):
+    return {"bbox": (x0, y0, x1, y0 + 12), "spans": [{"text": text, "font": font, "size": size}]}
+
+def _page(*lines, images=0, width=600):
+    blocks = [{"type": 0, "lines": [ln]} for ln in lines]
+    blocks += [{"type": 1, "bbox": (0, 0, 10, 10)} for _ in range(images)]
+    return {"width": width, "height": 800, "blocks": blocks}
+
+def test_two_columns_are_read_left_then_right_below_a_spanning_header():
+    lines = [_line(36, 40, 560, "Jane Doe jane@example.com +1 555 123 4567 github.com/jane")]
+    for i in range(4):
+        # PDF stream order interleaves the columns row by row
+        lines.append(_line(36, 80 + 14 * i, 250, f"left {i}"))
+        lines.append(_line(320, 80 + 14 * i, 540, f"right {i}", font="Courier"))
+    layout = DocumentLayout()
+    out = page_text_lines(_page(*lines, images=1), layout)
+    assert out == ["Jane Doe jane@example.com +1 555 123 4567 github.com/jane",
+                   "left 0", "left 1", "left 2", "left 3", "right 0", "right 1", "right 2", "right 3"]
+    assert (layout.pages, layout.columns, layout.multi_column_pages, layout.images) == (1, 2, 1, 1)
+    assert layout.fonts["Courier"] == len("right 0") * 4
+
+def test_right_aligned_dates_do_not_make_a_column_and_order_is_kept():
+    lines = []
+    y = 80
+    for i in range(4):
+        lines.append(_line(36, y, 300, f"Engineer at Company {i}"))
+        lines.append(_line(480, y, 560, "2019 - 2023", size=7.5))
+        lines.append(_line(36, y + 14, 400, "- Built services"))
+        lines.append(_line(36, y + 28, 400, "- Ran migrations"))
+        y += 50
+    layout = DocumentLayout()
+    out = page_text_lines(_page(*lines), layout)
+    assert out == [ln["spans"][0]["text"] for ln in lines]
+    assert layout.columns == 1 and layout.tables == 0
+    assert layout.min_font_size == 7.5
+
+def test_aligned_multi_cell_rows_count_as_one_table():
+    cells = [_line(36 + 150 * c, 100 + 14 * r, 100 + 150 * c, f"cell {r}{c}") for r in range(3) for c in range(3)]
+    layout = DocumentLayout()
+    page_text_lines(_page(*cells), layout)
+    assert layout.tables == 1
+
+def test_ats_uses_measured_layout_instead_of_text_guesses():
+    text = "Name | Email\njane@example.com 555-123-4567 2020\n- a\n- b\n- c\nExperience\nEducation\nSkills\n"
+    guessed = {f.rule for f in scan(text).findings}
+    assert "table_pipes" in guessed
+
+    layout = DocumentLayout(pages=1, columns=2, tables=1, images=2,
+                            fonts={"A": 1, "B": 1, "C": 1, "D": 1}, min_font_size=6.0)
+    measured = {f.rule: f for f in scan(text, layout).findings}
+    assert "table_pipes" not in measured and "short_lines" not in measured
+    assert measured["multi_column"].value == 2
+    assert {"tables", "images", "many_fonts", "small_font"} <= set(measured)
+    d = scan(text, layout).to_dict()
+    assert json.loads(json.dumps(d)) == d
+
+def test_extract_text_from_pdf_layout_mode_reorders_columns():
+    fitz = pytest.importorskip("fitz")
+    from src.parsing import extract_text_from_pdf
+
+    doc = fitz.open()
+    page = doc.new_page()
+    for i in range(4):
+        page.insert_text((36, 80 + 14 * i), f"Left column line {i}", fontsize=9)
+        page.insert_text((320, 80 + 14 * i), f"Right column line {i}", fontsize=9)
+    pdf = doc.tobytes()
+
+    plain = extract_text_from_pdf(pdf)
+    assert plain.splitlines()[:2] == ["Left column line 0", "Right column line 0"]
+    layout = DocumentLayout()
+    text = extract_text_from_pdf(pdf, layout=layout)
+    assert text.splitlines() == [f"Left column line {i}" for i in range(4)] + [f"Right column line {i}" for i in range(4)]
+    assert layout.columns == 2 and layout.pages == 1
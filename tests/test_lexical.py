@@ -0,0 +1,104 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.lexical import lexical_report
+from benchmarks.stub import StubEmbedder
+from src import batch
+from src.batch import prefilter_resumes
+from src.chunking import chunk_job_description
+from src.lexical import LexicalIndex, SectionIndex, recall_vs_dense, screen, section_scores, tokenize
+from src.pipeline import resume_section_chunks
+from tests.helpers import JD, STRONG, WEAK, KeywordEmbedder
+
+def test_tokenize_keeps_tech_spellings():
+    assert tokenize("Built APIs in C++ and C# with Node.js, for the team.") == \
+        ["built", "apis", "c++", "c#", "node.js", "team"]
+
+def _bm25(query, bullet, bullets, k1=1.2, b=0.75):
+    docs = [tokenize(x) for x in bullets]
+    avg = np.mean([len(d) for d in docs])
+    doc = tokenize(bullet)
+    out = 0.0
+    for t in set(tokenize(query)):
+        df = sum(t in d for d in docs)
+        tf = doc.count(t)
+        if tf:
+            idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5))
+            out += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg))
+    return out
+
+def test_scores_are_mean_of_best_bullet_bm25():
+    resumes = {
+        "a": ["Built python services on aws", "Wrote sql reports"],
+        "b": ["Led sales teams", "python python scripting"],
+        "c": [],
+    }
+    index = LexicalIndex()
+    for rid, bullets in resumes.items():
+        index.add(rid, bullets)
+    jd = ["python and aws services", "sql reporting", "kubernetes"]
+    every = [x for bullets in resumes.values() for x in bullets]
+    expected = [np.mean([max([_bm25(q, x, every) for x in bullets], default=0.0) for q in jd])
+                for bullets in resumes.values()]
+    np.testing.assert_allclose(index.scores(jd), expected, rtol=1e-5)
+    assert [rid for rid, _ in index.top_n(jd, 2)] == ["a", "b"]
+
+def test_top_n_breaks_ties_by_insertion_order():
+    index = LexicalIndex()
+    for rid in ["x", "y", "z"]:
+        index.add(rid, ["python developer"])
+    assert [rid for rid, _ in index.top_n(["python"], 2)] == ["x", "y"]
+    assert index.top_n([], 2)[0][1] == 0.0
+
+def test_screen_embeds_only_the_lexical_top_n():
+    resumes = {f"weak{i}": WEAK for i in range(5)}
+    resumes["strong"] = STRONG
+    e = KeywordEmbedder()
+    hits = screen(JD, resumes, e, top_n=2)
+    assert len(hits) == 2 and hits[0].resume_id == "strong"
+    assert hits[0].lexical == 1.0
+    assert len(e.calls) == 1 and e.calls[0] < 20
+
+def test_recall_vs_dense_on_synthetic_corpus():
+    resumes, jds = generate_corpus(60, 1, seed=3)
+    docs = {str(i): r for i, r in enumerate(resumes)}
+    full = recall_vs_dense(jds[0], docs, StubEmbedder(dim=64), top_n=60, k=5)
+    assert full["recall_at_k"] == 1.0 and full["embedded_share"] == 1.0
+    part = recall_vs_dense(jds[0], docs, StubEmbedder(dim=64), top_n=20, k=5)
+    assert part["embedded_share"] == 20 / 60
+    assert 0.0 <= part["hybrid_recall_at_k"] <= 1.0
+
+def test_lexical_report_on_synthetic_corpus():
+    report = lexical_report(n_resumes=20, n_jds=1, top_ns=[5, 20], k=3)
+    assert report["top_20"]["recall_at_k"] == 1.0
+    assert report["top_5"]["embedded_share"] == 0.25
+
+def test_prefilter_resumes_rereads_only_survivors_and_keeps_failures(tmp_path, monkeypatch):
+    source = tmp_path / "resumes.jsonl"
+    records = [{"id": "w1", "text": WEAK}, {"id": "s", "text": STRONG}, {"id": "bad"}, {"id": "w2", "text": WEAK}]
+    source.write_text("\n".join(json.dumps(r) for r in records))
+    seen = []
+    real = batch.read_text_input
+    monkeypatch.setattr(batch, "read_text_input", lambda text: seen.append(text) or real(text))
+    out = prefilter_resumes(JD, str(source), 2)
+    assert len(seen) == 3
+    assert [d.doc_id for d in out] == ["w1", "s", "bad"]
+    assert len(seen) == 5   # second pass reads the two survivors only
+
+def test_section_index_matches_section_scores():
+    chunks = {rid: resume_section_chunks(text) for rid, text in [("w", WEAK), ("s", STRONG)]}
+    jd = chunk_job_description(JD)
+    index = SectionIndex(jd)
+    for rid, sections in chunks.items():
+        index.add(rid, sections)
+    np.testing.assert_allclose(index.scores(), section_scores(jd, chunks))
+    assert index.ids == ["w", "s"] and index.scores()[1] > index.scores()[0]
+
+def test_prefilter_resumes_names_scipy_when_lexical_is_unavailable(monkeypatch):
+    monkeypatch.setitem(sys.modules, "src.lexical", None)
+    with pytest.raises(ImportError, match="needs scipy"):
+        prefilter_resumes(JD, "unused.jsonl", 1)
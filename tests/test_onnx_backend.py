@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from src.onnx_backend import OnnxEncoder, export_onnx, load_onnx_encoder
+
+TEXTS = [
+    "built data pipelines with python",
+    "led team",
+    "sql and aws docker services for the team of data",
+]
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    # A small random BERT in sentence-transformers layout; nothing is downloaded
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizer
+
+    root = tmp_path_factory.mktemp("tiny")
+    words = "python java sql built led team data pipelines services aws docker the a and with for of to".split()
+    (root / "vocab.txt").write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words) + "\n")
+    BertTokenizer(str(root / "vocab.txt")).save_pretrained(str(root))
+    config = BertConfig(vocab_size=5 + len(words), hidden_size=32, num_hidden_layers=2,
+                        num_attention_heads=2, intermediate_size=64)
+    BertModel(config).save_pretrained(str(root))
+    st_model = SentenceTransformer(modules=[
+        models.Transformer(str(root), max_seq_length=64), models.Pooling(32, "mean"), models.Normalize(),
+    ])
+    st_model.save(str(root / "st"))
+    return str(root / "st"), st_model
+
+def test_onnx_matches_torch_within_tolerance(tiny_model, tmp_path):
+    path, st_model = tiny_model
+    export_onnx(path, str(tmp_path), quantize=True)
+    ref = st_model.encode(TEXTS, normalize_embeddings=True)
+
+    fp32 = OnnxEncoder(str(tmp_path)).encode(TEXTS)
+    assert fp32.shape == (3, 32) and fp32.dtype == np.float32
+    assert np.abs(fp32 - ref).max() < 1e-4
+
+    int8 = OnnxEncoder(str(tmp_path), quantized=True, threads=1).encode(TEXTS)
+    assert np.abs(int8 - ref).max() < 0.05
+    assert np.allclose(np.linalg.norm(int8, axis=1), 1.0, atol=1e-5)
+
+def test_load_exports_on_first_use(tiny_model, tmp_path):
+    path, _ = tiny_model
+    enc = load_onnx_encoder(path, quantized=True, model_dir=str(tmp_path / "cache"))
+    assert (tmp_path / "cache" / "model_int8.onnx").exists()
+    # Batches smaller than the input still fill every row
+    enc.batch_size = 2
+    assert np.allclose(np.linalg.norm(enc.encode(TEXTS), axis=1), 1.0, atol=1e-5)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from src.pipeline import analyze, embed_groups, resume_section_chunks
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), 8), dtype=np.float32)
+        for i, t in enumerate(texts):
+            out[i, hash(t) % 8] = 1.0
+        return out
+
+RESUME = """
+Experience
+- Built REST APIs in Python and deployed them with Docker on AWS
+- Led migration of batch jobs to Kubernetes, reducing cost by 30%
+Projects
+- Trained a PyTorch model for resume ranking with 92% accuracy
+"""
+
+JD = """
+We need a backend engineer with strong Python experience building REST APIs.
+Experience with Docker and Kubernetes in production environments is required.
+"""
+
+def test_resume_section_chunks_falls_back_to_full():
+    chunks = resume_section_chunks(RESUME)
+    assert len(chunks["experience"]) == 2
+    assert len(chunks["projects"]) == 1
+    # No skills header -> full resume bullets
+    assert chunks["skills"] == chunks["full"]
+
+def test_embed_groups_dedups_into_one_call():
+    e = CountingEmbedder()
+    groups = {"a": ["x", "y"], "b": ["y", "z"], "c": [], "d": ["x", "y"]}
+    embs = embed_groups(e, groups)
+    assert e.calls == [["x", "y", "z"]]
+    assert embs["c"].shape == (0, 8)
+    assert np.array_equal(embs["a"], embs["d"])
+    assert np.array_equal(embs["a"][1], embs["b"][0])
+
+def test_analyze_uses_single_embed_call():
+    e = CountingEmbedder()
+    result = analyze(RESUME, JD, e)
+    assert len(e.calls) == 1
+    assert set(result.section_scores) == {"skills", "experience", "projects"}
+    assert 0.0 <= result.overall_100 <= 100.0
+    assert len(result.jd_to_best) == len(result.jd_chunks)
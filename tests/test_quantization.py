@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from benchmarks.quantization import quantization_report
+from src.quantization import quantize
+from src.scoring import compute_section_score, match_jd_to_resume, quantized_similarity, score_many
+
+def _unit(rng, n, d=384):
+    x = rng.standard_normal((n, d)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+def test_quantize_shapes_and_sizes():
+    emb = _unit(np.random.default_rng(0), 10)
+    q8 = quantize(emb, "int8")
+    q16 = quantize(emb, "float16")
+    assert q8.codes.dtype == np.int8 and q8.scales.shape == (10,)
+    assert q16.codes.dtype == np.float16 and q16.scales is None
+    assert q8.nbytes < q16.nbytes < emb.nbytes
+    assert np.abs(q8.dequantize() - emb).max() < 0.01
+    assert len(q8.rows(2, 5)) == 3
+
+def test_quantize_handles_zero_rows_and_bad_dtype():
+    q = quantize(np.zeros((2, 4)), "int8")
+    assert not q.dequantize().any()
+    with pytest.raises(ValueError):
+        quantize(np.zeros((2, 4)), "int4")
+
+def test_quantized_scores_track_float32():
+    rng = np.random.default_rng(1)
+    jd, res = _unit(rng, 5), _unit(rng, 40)
+    ref = compute_section_score(jd, res)
+    for dtype in ("float16", "int8"):
+        q = quantize(res, dtype)
+        assert abs(compute_section_score(jd, q) - ref) < 1e-2
+        assert abs(compute_section_score(quantize(jd, dtype), q) - ref) < 1e-2
+
+def test_quantized_similarity_leaves_float32_input_untouched():
+    rng = np.random.default_rng(3)
+    jd = 3.0 * _unit(rng, 4)
+    jd.flags.writeable = False
+    before = jd.copy()
+    sim = quantized_similarity(jd, quantize(_unit(rng, 20), "int8"))
+    assert sim.shape == (4, 20)
+    np.testing.assert_array_equal(jd, before)
+
+def test_quantized_best_matches_and_score_many():
+    rng = np.random.default_rng(2)
+    res = _unit(rng, 30)
+    jd = res[[3, 17]] + 0.01 * rng.standard_normal((2, 384)).astype(np.float32)
+    chunks = [f"r{i}" for i in range(30)]
+    out = match_jd_to_resume(["a", "b"], jd, chunks, quantize(res, "int8"))
+    assert {m[0]: m[1] for m in out} == {"a": "r3", "b": "r17"}
+
+    q = quantize(res, "int8")
+    offsets = np.array([0, 10, 30])
+    exact = score_many(jd, np.array([0, 2]), res, offsets)
+    approx = score_many(jd, np.array([0, 2]), q, offsets)
+    assert np.abs(exact.scores - approx.scores).max() < 1e-2
+
+def test_quantization_report_on_synthetic_corpus():
+    report = quantization_report(n_resumes=6, n_jds=2, top_k=3)
+    assert report["int8"]["bytes"] < report["float16"]["bytes"] < report["float32"]["bytes"]
+    assert report["int8"]["max_section_error"] < 0.02
+    assert report["float16"]["best_match_agreement"] > 0.9
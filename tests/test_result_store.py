@@ -0,0 +1,66 @@
+import src.result_store as rs
+from src.batch import ResumeDoc, score_resumes
+from src.result_store import ResultStore, cached_result, config_fingerprint
+from src.taxonomy import Taxonomy, set_taxonomy
+from tests.helpers import JD, STRONG, WEAK, KeywordEmbedder
+
+def test_cached_result_runs_pipeline_once_per_pair(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    e = KeywordEmbedder()
+    first = cached_result(store, STRONG, JD, e, model_name="m")
+    calls = len(e.calls)
+    second = cached_result(store, STRONG, JD, e, model_name="m")
+    assert len(e.calls) == calls
+    assert second == first
+    assert set(first) == {"report", "suggestions", "ats"}
+    assert (store.stats.hits, store.stats.misses) == (1, 1)
+
+    cached_result(store, STRONG, JD, e, model_name="other-model")
+    assert len(e.calls) > calls
+    assert len(store) == 2
+
+def test_fingerprint_tracks_weights_and_taxonomy(monkeypatch):
+    base = config_fingerprint()
+    monkeypatch.setitem(rs.SECTION_WEIGHTS, "skills", 0.9)
+    assert config_fingerprint() != base
+    monkeypatch.undo()
+    assert config_fingerprint() == base
+
+    try:
+        set_taxonomy(Taxonomy.from_records([{"name": "cobol", "category": "Languages"}]))
+        assert config_fingerprint() != base
+    finally:
+        set_taxonomy(None)
+
+def test_stale_entries_are_purged_on_open(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    store.put("r", "j", "m", {"report": {}})
+    store.close()
+
+    monkeypatch.setattr(rs, "PIPELINE_VERSION", "next")
+    reopened = ResultStore(path)
+    assert len(reopened) == 0
+    assert reopened.get("r", "j", "m") is None
+
+def test_store_evicts_least_recently_read(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"), max_bytes=250)
+    blob = {"report": "x" * 100}
+    store.put("a", "j", "m", blob)
+    store.put("b", "j", "m", blob)
+    assert store.get("a", "j", "m") == blob   # "b" is now the oldest read
+    store.put("c", "j", "m", blob)
+    assert store.get("b", "j", "m") is None
+    assert store.get("a", "j", "m") == blob
+    assert store.stats.evictions == 1
+
+def test_score_resumes_skips_embedding_for_stored_pairs(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    docs = [ResumeDoc("strong", STRONG), ResumeDoc("weak", WEAK)]
+    first = list(score_resumes(JD, docs, KeywordEmbedder(), store=store, model_name="m"))
+
+    e = KeywordEmbedder()
+    again = list(score_resumes(JD, docs, e, store=store, model_name="m"))
+    assert again == first
+    # Only the JD is embedded; both resumes come from the store
+    assert len(e.calls) == 1
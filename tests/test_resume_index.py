@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.resume_index import ResumeIndex, compare_with_brute_force
+from src.scoring import compute_section_score
+from tests.helpers import unit_corpus as _corpus, corpus_query as _query
+
+def test_search_scores_match_exact_scoring():
+    corpus, topics = _corpus()
+    idx = ResumeIndex(dim=16, n_lists=8, nprobe=8)
+    for rid, emb in corpus.items():
+        idx.add(rid, emb)
+    idx.train()
+
+    q = _query(topics, 3)
+    hits = idx.search(q, k=5)
+    assert len(hits) == 5
+    for h in hits:
+        assert abs(h.score - compute_section_score(q, corpus[h.resume_id])) < 1e-5
+    # Probing every list is exhaustive on candidates, so it agrees with brute force
+    assert [h.resume_id for h in hits] == [h.resume_id for h in idx.brute_force(q, k=5)]
+
+def test_recall_is_high_with_few_probes():
+    corpus, topics = _corpus()
+    idx = ResumeIndex(dim=16, n_lists=16, nprobe=3)
+    for rid, emb in corpus.items():
+        idx.add(rid, emb)
+    idx.train()
+    report = compare_with_brute_force(idx, [_query(topics, t, seed=t) for t in range(10)], k=5)
+    assert report["recall_at_k"] >= 0.8
+    assert report["ann_ms"] >= 0.0 and report["brute_force_ms"] >= 0.0
+
+def test_incremental_add_delete_and_persistence(tmp_path):
+    corpus, topics = _corpus(50)
+    idx = ResumeIndex(dim=16, n_lists=4, nprobe=4)
+    for rid, emb in list(corpus.items())[:40]:
+        idx.add(rid, emb)
+    idx.train()
+    for rid, emb in list(corpus.items())[40:]:
+        idx.add(rid, emb)   # assigned to existing centroids
+    assert len(idx) == 50
+
+    q = _query(topics, 2)
+    top = idx.search(q, k=1)[0].resume_id
+    assert idx.delete(top)
+    assert top not in {h.resume_id for h in idx.search(q, k=50)}
+
+    path = str(tmp_path / "index.npz")
+    idx.save(path)
+    loaded = ResumeIndex.load(path)
+    assert len(loaded) == 49
+    assert [h.resume_id for h in loaded.search(q, k=5)] == [h.resume_id for h in idx.search(q, k=5)]
+
+    loaded.compact()
+    assert len(loaded) == 49
+    assert [h.resume_id for h in loaded.search(q, k=5)] == [h.resume_id for h in idx.search(q, k=5)]
+
+def test_many_adds_then_search_and_compact():
+    corpus, topics = _corpus(2000)
+    idx = ResumeIndex(dim=16, n_lists=16, nprobe=16)
+    for rid, emb in corpus.items():
+        idx.add(rid, emb)
+    idx.train()
+    for i in range(0, 2000, 3):
+        idx.delete(f"r{i}")
+    q = _query(topics, 4)
+    before = idx.search(q, k=10)
+    assert [h.resume_id for h in before] == [h.resume_id for h in idx.brute_force(q, k=10)]
+
+    idx.compact()
+    assert len(idx) == 2000 - 667
+    assert idx._vectors.shape[0] == sum(corpus[rid].shape[0] for rid in idx._slots)
+    assert [(h.resume_id, round(h.score, 5)) for h in idx.search(q, k=10)] == \
+        [(h.resume_id, round(h.score, 5)) for h in before]
+    np.testing.assert_array_equal(idx.embeddings("r1"), corpus["r1"])
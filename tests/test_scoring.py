@@ -23,3 +23,81 @@ def test_match_jd_to_resume_returns_sorted_low_to_high():
     assert len(out) == 2
     # Should be sorted by score ascending
     assert out[0][2] <= out[1][2]
+
+def _unit(rng, n, d=16):
+    x = rng.normal(size=(n, d)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+def test_score_many_matches_pairwise_section_scores():
+    from src.scoring import score_many, stack_embeddings
+
+    rng = np.random.default_rng(0)
+    jds = [_unit(rng, n) for n in (3, 0, 5)]
+    resumes = [_unit(rng, n) for n in (4, 1, 0, 7, 2)]
+    jd_emb, jd_off = stack_embeddings(jds)
+    res_emb, res_off = stack_embeddings(resumes)
+
+    # Small blocks force resume grouping and row tiling
+    out = score_many(jd_emb, jd_off, res_emb, res_off, block_size=4)
+    assert out.scores.shape == (3, 5)
+    for i, jd in enumerate(jds):
+        for j, r in enumerate(resumes):
+            assert abs(out.scores[i, j] - compute_section_score(jd, r)) < 1e-5
+
+    # Best-match indices point at the argmax chunk of each resume
+    for row in range(jd_emb.shape[0]):
+        for j, r in enumerate(resumes):
+            idx = out.best_index[row, j]
+            if r.shape[0] == 0:
+                assert idx == -1
+            else:
+                local = int((jd_emb[row] @ r.T).argmax())
+                assert idx == res_off[j] + local
+
+def test_top_matches_orders_best_first():
+    from src.scoring import top_matches
+
+    scores = np.array([[0.1, 0.9, 0.5], [0.7, 0.2, 0.3]], dtype=np.float32)
+    assert top_matches(scores, k=2).tolist() == [[1, 2], [0, 2]]
+    assert top_matches(scores, k=1, axis=0).tolist() == [[1], [0], [0]]
+
+def _reference_matches(jd_chunks, resume_chunks, sim):
+    out = []
+    for i, jd in enumerate(jd_chunks):
+        j = int(sim[i].argmax())
+        out.append((jd, resume_chunks[j], float(sim[i, j])))
+    out.sort(key=lambda x: x[2])
+    return out
+
+def test_match_jd_to_resume_limit_and_tiles_match_full_sort():
+    rng = np.random.default_rng(1)
+    jd, res = _unit(rng, 9), _unit(rng, 40)
+    jd_chunks = [f"jd{i}" for i in range(9)]
+    resume_chunks = [f"r{j}" for j in range(40)]
+    full = _reference_matches(jd_chunks, resume_chunks, jd @ res.T)
+    for limit, tile in ((None, 4096), (0, 7), (1, 7), (4, 7), (20, 7)):
+        out = match_jd_to_resume(jd_chunks, jd, resume_chunks, res, limit=limit, tile_size=tile)
+        assert [(j, r) for j, r, _ in out] == [(j, r) for j, r, _ in full[:limit]]
+        assert np.allclose([s for *_, s in out], [s for *_, s in full[:limit]], atol=1e-6)
+
+def test_weakest_first_keeps_input_order_for_ties():
+    from src.scoring import weakest_first
+
+    scores = np.array([0.5, 0.2, 0.5, 0.1, 0.5, 0.9])
+    assert weakest_first(scores, 3).tolist() == [3, 1, 0]
+    assert weakest_first(scores, 4).tolist() == [3, 1, 0, 2]
+    assert weakest_first(scores).tolist() == [3, 1, 0, 2, 4, 5]
+
+def test_top_k_similar_is_tiled_and_prefers_lower_index_on_ties():
+    from src.scoring import top_k_matches, top_k_similar
+
+    jd = np.array([[1, 0], [0, 1]], dtype=np.float32)
+    res = np.array([[0, 1], [1, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+    for tile in (1, 2, 4096):
+        idx, vals = top_k_similar(jd, res, k=3, tile_size=tile)
+        assert idx.tolist() == [[1, 2, 3], [0, 4, 3]]
+        assert np.allclose(vals[:, 2], np.sqrt(0.5))
+
+    out = top_k_matches(["a", "b"], jd, ["r0", "r1", "r2", "r3", "r4"], res, k=2, limit=1)
+    assert out == [("a", [("r1", 1.0), ("r2", 1.0)])]
+    assert top_k_matches(["a"], jd[:1], [], np.zeros((0, 2), dtype=np.float32)) == [("a", [])]
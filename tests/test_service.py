@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+from benchmarks.stub import StubEmbedder
+from src.service import MicroBatcher, ScoringService
+
+RESUME = """
+Jane Doe
+Experience
+- Built REST APIs in Python and deployed them with Docker on AWS
+- Led migration of batch jobs to Kubernetes, reducing cost by 30%
+"""
+
+JD = """
+We need a backend engineer with strong Python experience building REST APIs.
+Experience with Docker and Kubernetes in production environments is required.
+"""
+
+class CountingStub(StubEmbedder):
+    def __init__(self):
+        super().__init__(dim=32)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(len(texts))
+        return super().embed(texts)
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+def _with_server(embedder, fn, **kwargs):
+    async def run():
+        service = ScoringService(embedder, **kwargs)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await fn(port, service)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+    return asyncio.run(run())
+
+def test_analyze_returns_report_json():
+    async def fn(port, service):
+        return await _request(port, "POST", "/analyze", {"resume_text": RESUME, "jd_text": JD})
+    status, body = _with_server(CountingStub(), fn)
+    assert status == 200
+    assert {"overall_match_score", "section_scores_0_1", "weakest_jd_items", "missing_skills"} <= set(body)
+
+def test_concurrent_requests_are_micro_batched():
+    stub = CountingStub()
+
+    async def fn(port, service):
+        reqs = [_request(port, "POST", "/analyze", {"resume_text": RESUME + f"\n- Extra bullet number {i} with Python",
+                                                    "jd_text": JD}) for i in range(8)]
+        results = await asyncio.gather(*reqs)
+        return results, service.batcher
+
+    results, batcher = _with_server(stub, fn, max_wait_ms=100, max_batch=1000)
+    assert all(status == 200 for status, _ in results)
+    assert batcher.requests == 8
+    assert batcher.batches < 8
+    assert len(stub.calls) == batcher.batches
+
+def test_batch_analyze_and_skills_endpoints():
+    async def fn(port, service):
+        batch = await _request(port, "POST", "/batch-analyze", {
+            "jd_text": JD,
+            "resumes": [{"id": "weak", "text": "Experience\n- Sold furniture to retail customers across the region"},
+                        {"id": "strong", "text": RESUME}],
+        })
+        skills = await _request(port, "POST", "/skills", {"resume_text": RESUME, "jd_text": JD + " Redis"})
+        return batch, skills
+
+    (s1, batch), (s2, skills) = _with_server(CountingStub(), fn)
+    assert s1 == 200 and [r["id"] for r in batch["results"]] == ["strong", "weak"]
+    assert batch["results"][0]["rank"] == 1
+    assert s2 == 200 and "python" in skills["resume_skills"]
+    assert skills["missing_skills"]["tools"] == ["redis"]
+
+def test_errors_are_reported_as_json():
+    async def fn(port, service):
+        return (
+            await _request(port, "POST", "/analyze", {"resume_text": "x"}),
+            await _request(port, "GET", "/nope"),
+            await _request(port, "GET", "/health"),
+        )
+    (s1, b1), (s2, _), (s3, b3) = _with_server(CountingStub(), fn)
+    assert s1 == 400 and "jd_text" in b1["error"]
+    assert s2 == 404
+    assert s3 == 200 and b3["status"] == "ok"
+
+def test_skills_rejects_non_string_text():
+    async def fn(port, service):
+        return (await _request(port, "POST", "/skills", {"resume_text": 5}),
+                await _request(port, "POST", "/skills", {"resume_text": RESUME, "jd_text": ["a"]}),
+                await _request(port, "POST", "/skills", {"resume_text": RESUME, "jd_text": None}))
+    (s1, b1), (s2, b2), (s3, b3) = _with_server(CountingStub(), fn)
+    assert s1 == 400 and b1["error"] == "'resume_text' must be a string"
+    assert s2 == 400 and "jd_text" in b2["error"]
+    assert s3 == 200 and "python" in b3["resume_skills"]
+
+def test_bad_content_length_and_batch_size_are_rejected():
+    async def raw(port, length):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /analyze HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        head, _, body = data.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def fn(port, service):
+        bad_batch = {"jd_text": JD, "resumes": [{"text": RESUME}], "batch_size": "lots"}
+        return (await raw(port, "abc"), await raw(port, "-5"),
+                await _request(port, "POST", "/batch-analyze", bad_batch),
+                await _request(port, "POST", "/batch-analyze", {**bad_batch, "batch_size": 0}))
+    results = _with_server(CountingStub(), fn)
+    assert results[0] == (400, {"error": "invalid Content-Length"})
+    assert results[1] == (400, {"error": "invalid Content-Length"})
+    assert results[2][0] == 400 and "batch_size" in results[2][1]["error"]
+    assert results[3][0] == 400
+
+def test_micro_batcher_dedups_and_preserves_order():
+    stub = CountingStub()
+
+    async def run():
+        b = MicroBatcher(stub.embed, max_batch=100, max_wait_ms=50)
+        out = await asyncio.gather(b.embed(["a b", "c d"]), b.embed(["c d", "e f"]))
+        await b.close()
+        return out
+
+    first, second = asyncio.run(run())
+    assert stub.calls == [3]
+    assert (first[1] == second[0]).all()
@@ -0,0 +1,126 @@
+import pickle
+import sys
+
+import numpy as np
+
+from src.embedding_cache import EmbeddingCache
+from src.resume_index import ResumeIndex
+from src.scoring import compute_section_score
+from src.shared_vectors import MmapVectorStore, SharedMatrix
+from tests.helpers import corpus_query as _query, unit_corpus as _corpus
+
+def _vecs(n, dim=4, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+def test_mmap_store_round_trip_and_reader_sees_later_rows(tmp_path):
+    path = str(tmp_path / "cache.vec")
+    writer = MmapVectorStore(path, writer=True)
+    v = _vecs(3)
+    writer.put_many({"a": v[0], "b": v[1]})
+    reader = MmapVectorStore(path, writer=False)
+    got = reader.get_many(["a", "b", "c"])
+    assert set(got) == {"a", "b"}
+    np.testing.assert_array_equal(got["b"], v[1])
+
+    writer.put_many({"c": v[2], "a": v[0]})   # "a" is already stored
+    assert len(writer) == 3
+    np.testing.assert_array_equal(reader.get_many(["c"])["c"], v[2])
+    assert len(reader) == 3
+
+def test_mmap_rows_are_read_only_views(tmp_path):
+    store = MmapVectorStore(str(tmp_path / "cache.vec"), writer=True)
+    store.put_many({"a": _vecs(1)[0], "b": _vecs(1, seed=1)[0]})
+    row = store.get_many(["b"])["b"]
+    assert not row.flags.writeable
+    assert np.shares_memory(row, store.matrix())
+
+def test_second_store_on_a_file_is_read_only(tmp_path):
+    path = str(tmp_path / "cache.vec")
+    first = MmapVectorStore(path)
+    second = MmapVectorStore(path)
+    assert first.writer and not second.writer
+    second.put_many({"a": _vecs(1)[0]})
+    assert len(first) == 0
+    first.close()
+
+def test_uncommitted_keys_from_a_crashed_writer_are_dropped(tmp_path):
+    path = str(tmp_path / "cache.vec")
+    v = _vecs(3)
+    writer = MmapVectorStore(path, writer=True)
+    writer.put_many({"a": v[0]})
+    writer.close()
+    with open(path + ".keys", "ab") as kf:   # crashed between key append and commit
+        kf.write(b"orphan\n")
+
+    reader = MmapVectorStore(path, writer=False)
+    assert set(reader.get_many(["a", "orphan"])) == {"a"}
+    MmapVectorStore(path, writer=True).put_many({"b": v[1]})
+    got = reader.get_many(["orphan", "b"])
+    assert set(got) == {"b"}
+    np.testing.assert_array_equal(got["b"], v[1])
+
+    # A running writer also writes over an orphan left behind it
+    with open(path + ".keys", "ab") as kf:
+        kf.write(b"orphan\n")
+    live = MmapVectorStore(path, writer=False)
+    live.writer = True
+    live.put_many({"c": v[2]})
+    np.testing.assert_array_equal(reader.get_many(["c"])["c"], v[2])
+    assert "orphan" not in reader.get_many(["orphan"])
+
+def test_no_flock_means_read_only(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "fcntl", None)
+    assert not MmapVectorStore(str(tmp_path / "cache.vec")).writer
+
+def test_embedding_cache_serves_hits_from_mmap_store(tmp_path):
+    path = str(tmp_path / "cache.vec")
+    EmbeddingCache(store=MmapVectorStore(path, writer=True)).put_many({"k": _vecs(1)[0]})
+    cache = EmbeddingCache(store=MmapVectorStore(path, writer=False))
+    np.testing.assert_array_equal(cache.get_many(["k"])["k"], _vecs(1)[0])
+
+def test_scoring_on_views_matches_copies(tmp_path):
+    store = MmapVectorStore(str(tmp_path / "cache.vec"), writer=True)
+    v = _vecs(10, dim=8)
+    store.put_many({f"k{i}": row for i, row in enumerate(v)})
+    jd, resume = store.matrix()[:4], store.matrix()[4:]
+    assert compute_section_score(jd, resume) == compute_section_score(jd.copy(), resume.copy())
+
+def test_shared_matrix_pickles_as_a_handle():
+    a = _vecs(50, dim=8)
+    shared = SharedMatrix.publish(a)
+    try:
+        blob = pickle.dumps(shared)
+        assert len(blob) < a.nbytes
+        other = pickle.loads(blob)
+        np.testing.assert_array_equal(other.array, a)
+        assert not other.array.flags.writeable
+        shared.array[0, 0] = 42.0
+        assert other.array[0, 0] == 42.0
+        other.close()
+    finally:
+        shared.unlink()
+
+def test_shared_index_pickles_without_vectors_and_searches_the_same():
+    corpus, topics = _corpus()
+    idx = ResumeIndex(dim=16, n_lists=8, nprobe=8)
+    for rid, emb in corpus.items():
+        idx.add(rid, emb)
+    idx.train()
+    q = _query(topics, 2)
+    expected = idx.search(q, k=5)
+    plain = len(pickle.dumps(idx))
+
+    idx.share()
+    try:
+        blob = pickle.dumps(idx)
+        assert len(blob) < plain - idx._vectors.nbytes // 2
+        worker = pickle.loads(blob)
+        assert worker.search(q, k=5) == expected
+        worker.close()
+
+        # Adding after share() goes back to a private matrix
+        idx.add("extra", corpus["r0"])
+        assert idx.search(q, k=5) == expected
+        assert idx._shared is None
+    finally:
+        idx.close()
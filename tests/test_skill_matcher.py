@@ -0,0 +1,45 @@
+import random
+import re
+
+from src.evidence import find_skill_evidence
+from src.skill_matcher import SkillMatcher, get_matcher
+from src.skills import DEFAULT_SKILLS, extract_skills, normalize
+
+def _naive(text, skills):
+    t = normalize(text)
+    return {s for s in skills if re.search(r"\b" + re.escape(s.lower()) + r"\b", t)}
+
+def test_matches_per_skill_regex_for_word_skills():
+    rng = random.Random(0)
+    skills = [s for s in DEFAULT_SKILLS if s[0].isalnum() and s[-1].isalnum()]
+    vocab = skills + ["and", "the", "pythonic", "gitlab", "restful", "apis", "systems", "design", ",", "."]
+    for _ in range(200):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 30)))
+        assert extract_skills(text, skills) == _naive(text, skills)
+
+def test_overlapping_and_punctuated_skills():
+    m = SkillMatcher(["rest", "rest api", "api", "distributed systems", "systems design", "c++", "ci/cd", "c"])
+    found = m.find(normalize("Designed a REST API for distributed systems design in C++, with CI/CD."))
+    # "c" also matches inside "c++", exactly as r"\bc\b" would
+    assert found == {"rest", "rest api", "api", "distributed systems", "systems design", "c++", "ci/cd", "c"}
+    assert m.find("restful apis and cpp") == set()
+
+def test_extract_skills_keeps_original_spelling():
+    assert extract_skills("Python and GitHub Actions", ["Python", "GitHub Actions", "Go"]) == {"Python", "GitHub Actions"}
+
+def test_find_lines_and_evidence_share_one_pass():
+    lines = ["Python, Docker", "Built  GitHub Actions CI/CD", "docker compose", "Docker swarm"]
+    assert get_matcher(["docker", "github actions"]).find_lines(lines) == {
+        "docker": [0, 2, 3],
+        "github actions": [1],
+    }
+    ev = find_skill_evidence("\n".join(lines), ["Docker", "CI/CD", "Kubernetes"], max_hits_per_skill=2)
+    assert ev == {"Docker": ["Python, Docker", "docker compose"], "CI/CD": ["Built  GitHub Actions CI/CD"]}
+
+def test_matcher_is_cached_per_taxonomy():
+    assert get_matcher(("a", "b")) is get_matcher(["a", "b"])
+
+def test_large_taxonomy():
+    skills = [f"skill{i}" for i in range(5000)] + ["python"]
+    text = "python skill42 skill4999 skill50000\n" * 50
+    assert extract_skills(text, skills) == {"python", "skill42", "skill4999"}
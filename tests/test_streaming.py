@@ -0,0 +1,69 @@
+import random
+
+from src.chunking import bulletize, chunk_job_description, split_into_sections
+from src.parsing import clean_text
+from src.pipeline import resume_section_chunks
+from src.streaming import (
+    iter_bullets, iter_clean_lines, iter_jd_chunks, iter_raw_lines, iter_sections, stream_resume_chunks,
+)
+
+RESUME = """
+Jane Doe\xa0\xa0 jane@example.com\r\n\r\n\r\n
+Technical Skills
+Python,\tSQL,  Docker
+Experience
+- Built REST APIs in Python and deployed them with Docker on AWS
+  • Led migration of batch jobs to Kubernetes, reducing cost by 30%
+-
+continued line after a bare marker
+Projects
+Trained a PyTorch model for resume ranking. It reached 92% accuracy on held-out data!
+"""
+
+JD = """
+About the role
+We need a backend engineer with strong Python experience building REST APIs.
+- Docker
+- Kubernetes in production environments is required for this team.
+"""
+
+def test_raw_lines_handle_crlf_split_across_pieces():
+    assert list(iter_raw_lines(["a\r", "\nb\r", "c\n"])) == ["a", "b", "c", ""]
+    assert list(iter_raw_lines("a\r\n\rb")) == ["a", "", "b"]
+
+def test_clean_lines_match_clean_text():
+    assert "\n".join(iter_clean_lines(RESUME)) == clean_text(RESUME)
+    assert "\n".join(iter_clean_lines(iter(RESUME.splitlines(keepends=True)))) == clean_text(RESUME)
+    assert list(iter_clean_lines(None)) == [] and list(iter_clean_lines("  \n\n ")) == []
+
+def test_sections_bullets_and_jd_chunks_match():
+    text = clean_text(RESUME)
+    lines = text.split("\n")
+    assert dict(iter_sections(lines)) == split_into_sections(text)
+    assert dict(iter_sections(["no headers here", "at all"])) == {"full": "no headers here\nat all"}
+    assert list(iter_bullets(lines)) == bulletize(text)
+    assert list(iter_jd_chunks(JD.split("\n"))) == chunk_job_description(JD)
+
+def test_stream_resume_chunks_matches_pipeline():
+    assert stream_resume_chunks(RESUME) == resume_section_chunks(clean_text(RESUME))
+
+def test_randomized_parity():
+    atoms = ["\n", "\r\n", "\r", " ", "\t", "\xa0", "- ", "-", "• ", "*", "Experience", "Skills",
+             "projects", "Built a thing.", "Led the team to 30% growth!", "short", "\x0c", "x" * 40]
+    rnd = random.Random(0)
+    for _ in range(2000):
+        t = "".join(rnd.choice(atoms) for _ in range(rnd.randint(0, 25)))
+        pieces = [t[i:i + 3] for i in range(0, len(t), 3)]
+        c = clean_text(t)
+        assert "\n".join(iter_clean_lines(pieces)) == c
+        lines = c.split("\n")
+        assert dict(iter_sections(lines)) == split_into_sections(c)
+        assert list(iter_bullets(t.split("\n"))) == bulletize(t)
+        assert list(iter_jd_chunks(lines)) == chunk_job_description(c)
+        assert stream_resume_chunks(pieces) == resume_section_chunks(c)
+
+def test_string_sources_are_read_in_blocks(monkeypatch):
+    import src.streaming as streaming_mod
+
+    monkeypatch.setattr(streaming_mod, "_BLOCK", 5)
+    assert "\n".join(iter_clean_lines(RESUME)) == clean_text(RESUME)
@@ -0,0 +1,53 @@
+import json
+import pickle
+
+from src.evidence import find_skill_evidence
+from src.skills import categorize_missing, extract_skills
+from src.taxonomy import Taxonomy, compile_taxonomy, get_taxonomy, set_taxonomy
+
+def test_default_taxonomy_maps_aliases_to_canonical_names():
+    found = extract_skills("Ran k8s clusters backed by Postgres and sklearn models")
+    assert {"kubernetes", "postgresql", "scikit-learn"} <= found
+    assert "k8s" not in found
+
+def test_categorize_missing_reads_taxonomy_categories():
+    grouped = categorize_missing({"python", "data structures", "kubernetes", "aws", "pytorch", "communication"})
+    assert grouped["core"] == ["data structures", "python"]
+    assert grouped["tools"] == ["aws", "kubernetes"]
+    assert grouped["nice_to_have"] == ["communication", "pytorch"]
+
+def test_evidence_counts_alias_lines():
+    resume = "Deployed services on K8s\nWrote Kubernetes operators\nPython scripts"
+    ev = find_skill_evidence(resume, ["kubernetes", "python"])
+    assert ev["kubernetes"] == ["Deployed services on K8s", "Wrote Kubernetes operators"]
+
+def test_compile_and_mmap_roundtrip(tmp_path):
+    src = tmp_path / "skills.json"
+    src.write_text(json.dumps({"skills": [
+        {"name": "Golang", "category": "core", "aliases": ["go lang", "golang"]},
+        {"name": "Terraform", "category": "tools", "aliases": "tf;terraform cloud"},
+        {"name": "Figma"},
+    ]}))
+    out = tmp_path / "skills.bin"
+    compile_taxonomy(str(src), str(out))
+
+    tax = Taxonomy.load(str(out))
+    assert tax.skills == ["Golang", "Terraform", "Figma"]
+    assert tax.canonical("TF") == "Terraform"
+    assert tax.category("go lang") == "core"
+    assert tax.terms_for("terraform") == ["Terraform", "tf", "terraform cloud"]
+    assert extract_skills("Wrote Go lang services with TF", taxonomy=tax) == {"Golang", "Terraform"}
+
+    # Pickling re-maps the file (what worker processes receive)
+    clone = pickle.loads(pickle.dumps(tax))
+    assert clone.path == str(out) and clone.version == tax.version
+
+def test_active_taxonomy_can_be_swapped():
+    custom = Taxonomy.from_records([("rust", "core", ["rustlang"])])
+    try:
+        set_taxonomy(custom)
+        assert extract_skills("Rustlang and Python") == {"rust"}
+        assert categorize_missing({"rust"})["core"] == ["rust"]
+    finally:
+        set_taxonomy(None)
+    assert "python" in get_taxonomy().skills